@@ -0,0 +1,3 @@
+"""
+Benchmarks for JALS - Journey Amplified Language Systems
+"""
@@ -0,0 +1,113 @@
+"""
+Benchmark do custo de importação a frio.
+
+Cada cenário é executado num interpretador novo; o tempo reportado desconta
+o custo de iniciar um interpretador vazio. Também lista quais dependências
+pesadas acabaram carregadas.
+
+Uso (a partir da raiz do repositório)::
+
+    python -m benchmarks.bench_startup --repeat 10
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+
+HEAVY_MODULES = ['numpy', 'scipy', 'cv2', 'src.layers.layer1', 'src.layers.layer4']
+
+SCENARIOS = {
+    'bare_interpreter': "pass",
+    'import_src': "import src",
+    'amplification_engine': "from src import AmplificationEngine",
+    'core_ideogram': "from src.core import CoreIdeogram",
+    'layer1': "from src.layers import Layer1",
+    'all_components': "from src import *",
+}
+
+_PROBE = (
+    "import sys, json\n"
+    "{statement}\n"
+    "print(json.dumps([m for m in {heavy!r} if m in sys.modules]))\n"
+)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _run_once(statement: str) -> Tuple[float, List[str]]:
+    """Executa um cenário num interpretador novo e retorna (segundos, módulos pesados)."""
+    code = _PROBE.format(statement=statement, heavy=HEAVY_MODULES)
+    start = time.perf_counter()
+    output = subprocess.run(
+        [sys.executable, '-c', code], cwd=ROOT, check=True,
+        stdout=subprocess.PIPE, universal_newlines=True
+    ).stdout
+    return time.perf_counter() - start, json.loads(output)
+
+
+def run_startup_benchmark(repeat: int = 10,
+                          scenarios: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Mede o custo de importação a frio de cada cenário.
+
+    Args:
+        repeat: Execuções por cenário
+        scenarios: Nomes dos cenários (todos se None)
+
+    Returns:
+        Resultados em formato serializável
+    """
+    names = scenarios or list(SCENARIOS)
+    timings = {}
+    loaded = {}
+
+    for name in ['bare_interpreter'] + [n for n in names if n != 'bare_interpreter']:
+        samples = []
+        for _ in range(repeat):
+            elapsed, modules = _run_once(SCENARIOS[name])
+            samples.append(elapsed)
+        timings[name] = float(np.median(samples))
+        loaded[name] = modules
+
+    baseline = timings['bare_interpreter']
+    return {
+        'repeat': repeat,
+        'python': sys.version.split()[0],
+        'results': [
+            {
+                'scenario': name,
+                'statement': SCENARIOS[name],
+                'median_s': timings[name],
+                'import_cost_s': max(timings[name] - baseline, 0.0),
+                'heavy_modules_loaded': loaded[name]
+            }
+            for name in timings
+        ]
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="JALS cold-import benchmark")
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--scenarios', nargs='*', choices=list(SCENARIOS))
+    parser.add_argument('--output', help="write results JSON to this path (default: stdout)")
+    args = parser.parse_args(argv)
+
+    results = run_startup_benchmark(args.repeat, args.scenarios)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+        sys.stdout.write('\n')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
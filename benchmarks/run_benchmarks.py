@@ -0,0 +1,405 @@
+"""
+Suíte de benchmarks do JALS.
+
+Mede tempo e pico de memória de cada etapa das quatro camadas, da
+Amplification Engine e do Core Ideogram sobre manuscritos sintéticos de
+tamanhos crescentes, grava os resultados em JSON e sinaliza regressões em
+relação a uma linha de base armazenada.
+
+Uso (a partir da raiz do repositório)::
+
+    python -m benchmarks.run_benchmarks --output results.json
+    python -m benchmarks.run_benchmarks --save-baseline
+    python -m benchmarks.run_benchmarks --sizes 10x32,100x64 --fail-on-regression
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Dict, Any, List, Callable, Optional, Tuple
+
+import numpy as np
+
+from .synthetic import generate_manuscript
+
+DEFAULT_SIZES = [(10, 32), (100, 64), (500, 128)]
+# Registros no histórico das engines dos benchmarks de estado
+ENGINE_HISTORY_LENGTH = 2000
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), 'baseline.json')
+
+
+def _layer1_stages(manuscript: Dict[str, Any]) -> Tuple[Any, Dict[str, Any], Dict[str, Any]]:
+    """Executa a Layer 1 e retorna (layer1, features, encoded)."""
+    from src.layers import Layer1
+
+    layer1 = Layer1()
+    processed = layer1.preprocess(manuscript)
+    features = layer1.extract_features(processed)
+    return layer1, features, layer1.encode(features)
+
+
+def _setup_layer1_preprocess(manuscript, workdir):
+    from src.layers import Layer1
+
+    layer1 = Layer1()
+    return lambda: layer1.preprocess(manuscript)
+
+
+def _setup_layer1_preprocess_simplified(manuscript, workdir):
+    from src.layers import Layer1
+
+    layer1 = Layer1()
+    layer1.config['simplify_tolerance'] = 0.25
+    return lambda: layer1.preprocess(manuscript)
+
+
+def _setup_layer1_extract(manuscript, workdir):
+    from src.layers import Layer1
+
+    layer1 = Layer1()
+    processed = layer1.preprocess(manuscript)
+    return lambda: layer1.extract_features(processed)
+
+
+def _setup_layer1_encode(manuscript, workdir):
+    layer1, features, _ = _layer1_stages(manuscript)
+    return lambda: layer1.encode(features)
+
+
+def _setup_layer2_abstract(manuscript, workdir):
+    from src.layers import Layer2
+
+    _, _, encoded = _layer1_stages(manuscript)
+    layer2 = Layer2()
+    return lambda: layer2.abstract(encoded)
+
+
+def _setup_layer3_integrate(manuscript, workdir):
+    from src.layers import Layer2, Layer3
+
+    _, _, encoded = _layer1_stages(manuscript)
+    layer2_data = Layer2().abstract(encoded)
+    layer3 = Layer3()
+    return lambda: layer3.integrate(layer2_data)
+
+
+def _setup_layer4_deploy(manuscript, workdir):
+    from src.layers import Layer2, Layer3, Layer4
+
+    _, _, encoded = _layer1_stages(manuscript)
+    layer3_data = Layer3().integrate(Layer2().abstract(encoded))
+    layer4 = Layer4()
+    return lambda: layer4.deploy(layer3_data)
+
+
+def _setup_engine_multi_layer(manuscript, workdir):
+    from src.core import AmplificationEngine
+    from src.core.amplification_engine import (
+        Layer1ToLayer2Transformer, Layer2ToLayer3Transformer
+    )
+
+    engine = AmplificationEngine()
+    engine.register_transformer('layer1_to_layer2', Layer1ToLayer2Transformer())
+    engine.register_transformer('layer2_to_layer3', Layer2ToLayer3Transformer())
+    sequence = ['layer1', 'layer2', 'layer3']
+    return lambda: engine.multi_layer_amplify(manuscript, sequence)
+
+
+def _prepared_engine(manuscript):
+    from src.core import AmplificationEngine
+    from src.core.amplification_engine import (
+        Layer1ToLayer2Transformer, Layer2ToLayer3Transformer
+    )
+
+    # Retenção 'summary': o estado salvo é dominado pelo histórico, não pela
+    # última saída
+    engine = AmplificationEngine({'state_retention': 'summary'})
+    engine.register_transformer('layer1_to_layer2', Layer1ToLayer2Transformer())
+    engine.register_transformer('layer2_to_layer3', Layer2ToLayer3Transformer())
+    for _ in range(50):
+        engine.multi_layer_amplify(manuscript, ['layer1', 'layer2', 'layer3'])
+    # Histórico de uma engine de longa duração, repetindo os registros medidos
+    recorded = list(engine.history)
+    engine.history = [dict(recorded[i % len(recorded)]) for i in range(ENGINE_HISTORY_LENGTH)]
+    return engine
+
+
+def _setup_engine_save(file_format):
+    def setup(manuscript, workdir):
+        engine = _prepared_engine(manuscript)
+        path = os.path.join(workdir, f'engine.{file_format}')
+        return lambda: engine.save_state(path, format=file_format)
+    return setup
+
+
+def _setup_engine_load(file_format):
+    def setup(manuscript, workdir):
+        from src.core import AmplificationEngine
+
+        path = os.path.join(workdir, f'engine.{file_format}')
+        _prepared_engine(manuscript).save_state(path, format=file_format)
+        engine = AmplificationEngine()
+        return lambda: engine.load_state(path)
+    return setup
+
+
+def _prepared_ideogram(manuscript):
+    from src.core import CoreIdeogram
+
+    ideogram = CoreIdeogram()
+    ideogram.load_manuscript(manuscript, format='raw')
+    ideogram.generate_symbolic_representation(ideogram.extract_features())
+    ideogram.to_computational_representation()
+    return ideogram
+
+
+def _setup_ideogram_update(manuscript, workdir):
+    ideogram = _prepared_ideogram(manuscript)
+    stroke = dict(manuscript['strokes'][len(manuscript['strokes']) // 2])
+    return lambda: ideogram.update_strokes(changed=[stroke])
+
+
+def _setup_ideogram_save(file_format):
+    def setup(manuscript, workdir):
+        ideogram = _prepared_ideogram(manuscript)
+        path = os.path.join(workdir, f'ideogram.{file_format}')
+        return lambda: ideogram.save(path, format=file_format)
+    return setup
+
+
+def _setup_ideogram_load(file_format):
+    def setup(manuscript, workdir):
+        from src.core import CoreIdeogram
+
+        path = os.path.join(workdir, f'ideogram.{file_format}')
+        _prepared_ideogram(manuscript).save(path, format=file_format)
+        ideogram = CoreIdeogram()
+        return lambda: ideogram.load_manuscript(path, format=file_format)
+    return setup
+
+
+BENCHMARKS: Dict[str, Callable[[Dict[str, Any], str], Callable[[], Any]]] = {
+    'layer1.preprocess': _setup_layer1_preprocess,
+    'layer1.preprocess_simplified': _setup_layer1_preprocess_simplified,
+    'layer1.extract_features': _setup_layer1_extract,
+    'layer1.encode': _setup_layer1_encode,
+    'layer2.abstract': _setup_layer2_abstract,
+    'layer3.integrate': _setup_layer3_integrate,
+    'layer4.deploy': _setup_layer4_deploy,
+    'engine.multi_layer_amplify': _setup_engine_multi_layer,
+    'engine.save_state_binary': _setup_engine_save('binary'),
+    'engine.load_state_binary': _setup_engine_load('binary'),
+    'engine.save_state_json': _setup_engine_save('json'),
+    'engine.load_state_json': _setup_engine_load('json'),
+    'ideogram.update_strokes': _setup_ideogram_update,
+    'ideogram.save_json': _setup_ideogram_save('json'),
+    'ideogram.load_json': _setup_ideogram_load('json'),
+    'ideogram.save_pickle': _setup_ideogram_save('pickle'),
+    'ideogram.load_pickle': _setup_ideogram_load('pickle'),
+}
+
+
+def measure(func: Callable[[], Any], repeat: int = 5) -> Dict[str, float]:
+    """
+    Mede o tempo (várias repetições) e o pico de memória de uma chamada.
+
+    A memória é medida numa execução separada, pois o tracemalloc distorce
+    os tempos.
+
+    Args:
+        func: Função sem argumentos a ser medida
+        repeat: Número de repetições cronometradas
+
+    Returns:
+        Estatísticas de tempo (segundos) e pico de memória (bytes)
+    """
+    func()  # Aquecimento
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        func()
+        peak_memory = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'median_s': float(np.median(timings)),
+        'min_s': float(np.min(timings)),
+        'max_s': float(np.max(timings)),
+        'peak_memory_bytes': int(peak_memory)
+    }
+
+
+def run_suite(sizes: List[Tuple[int, int]] = DEFAULT_SIZES,
+              benchmarks: Optional[List[str]] = None,
+              repeat: int = 5,
+              pressure: bool = True,
+              timestamps: bool = True,
+              seed: int = 0) -> Dict[str, Any]:
+    """
+    Executa os benchmarks selecionados sobre a varredura de tamanhos.
+
+    Args:
+        sizes: Pares (número de traços, pontos por traço)
+        benchmarks: Nomes dos benchmarks (todos se None)
+        repeat: Repetições cronometradas por caso
+        pressure: Se os manuscritos incluem pressão
+        timestamps: Se os manuscritos incluem timestamps
+        seed: Semente do gerador sintético
+
+    Returns:
+        Resultados em formato serializável
+    """
+    names = benchmarks or list(BENCHMARKS)
+    unknown = set(names) - set(BENCHMARKS)
+    if unknown:
+        raise ValueError(f"Unknown benchmarks: {sorted(unknown)}")
+
+    results = []
+    for num_strokes, points_per_stroke in sizes:
+        manuscript = generate_manuscript(
+            num_strokes, points_per_stroke,
+            pressure=pressure, timestamps=timestamps, seed=seed
+        )
+        for name in names:
+            # Arquivos de estado gravados pelos benchmarks de E/S são removidos ao final de cada caso
+            with tempfile.TemporaryDirectory(prefix='jals-bench-') as workdir:
+                stats = measure(BENCHMARKS[name](manuscript, workdir), repeat=repeat)
+            results.append({
+                'benchmark': name,
+                'num_strokes': num_strokes,
+                'points_per_stroke': points_per_stroke,
+                **stats
+            })
+
+    return {
+        'metadata': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'repeat': repeat,
+            'seed': seed
+        },
+        'results': results
+    }
+
+
+def compare_to_baseline(results: Dict[str, Any], baseline: Dict[str, Any],
+                        tolerance: float = 0.25) -> List[Dict[str, Any]]:
+    """
+    Compara resultados com uma linha de base e lista as regressões.
+
+    Args:
+        results: Resultados atuais (saída de ``run_suite``)
+        baseline: Resultados de referência
+        tolerance: Aumento relativo tolerado da mediana de tempo e do pico de memória
+
+    Returns:
+        Lista de regressões encontradas
+    """
+    def key(entry):
+        return (entry['benchmark'], entry['num_strokes'], entry['points_per_stroke'])
+
+    reference = {key(entry): entry for entry in baseline.get('results', [])}
+    regressions = []
+
+    for entry in results['results']:
+        previous = reference.get(key(entry))
+        if previous is None:
+            continue
+        for metric in ('median_s', 'peak_memory_bytes'):
+            if previous[metric] > 0 and entry[metric] > previous[metric] * (1 + tolerance):
+                regressions.append({
+                    'benchmark': entry['benchmark'],
+                    'num_strokes': entry['num_strokes'],
+                    'points_per_stroke': entry['points_per_stroke'],
+                    'metric': metric,
+                    'baseline': previous[metric],
+                    'current': entry[metric],
+                    'ratio': entry[metric] / previous[metric]
+                })
+
+    return regressions
+
+
+def _parse_sizes(text: str) -> List[Tuple[int, int]]:
+    """Converte '10x32,100x64' em [(10, 32), (100, 64)]."""
+    sizes = []
+    for item in text.split(','):
+        strokes, points = item.lower().split('x')
+        sizes.append((int(strokes), int(points)))
+    return sizes
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="JALS benchmark suite")
+    parser.add_argument('--sizes', type=_parse_sizes,
+                        default=DEFAULT_SIZES, help="strokes x points, e.g. 10x32,100x64")
+    parser.add_argument('--benchmarks', nargs='*', help="subset of benchmarks to run")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--no-pressure', action='store_true')
+    parser.add_argument('--no-timestamps', action='store_true')
+    parser.add_argument('--output', help="write results JSON to this path (default: stdout)")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--save-baseline', action='store_true',
+                        help="store these results as the new baseline")
+    parser.add_argument('--tolerance', type=float, default=0.25)
+    parser.add_argument('--fail-on-regression', action='store_true')
+    args = parser.parse_args(argv)
+
+    results = run_suite(
+        sizes=args.sizes, benchmarks=args.benchmarks, repeat=args.repeat,
+        pressure=not args.no_pressure, timestamps=not args.no_timestamps, seed=args.seed
+    )
+
+    regressions = []
+    baseline_missing = False
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=2)
+    elif os.path.exists(args.baseline):
+        with open(args.baseline, 'r') as f:
+            regressions = compare_to_baseline(results, json.load(f), args.tolerance)
+    else:
+        baseline_missing = True
+    results['regressions'] = regressions
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+        sys.stdout.write('\n')
+
+    for regression in regressions:
+        sys.stderr.write(
+            "REGRESSION {benchmark} [{num_strokes}x{points_per_stroke}] {metric}: "
+            "{baseline:.6g} -> {current:.6g} ({ratio:.2f}x)\n".format(**regression)
+        )
+
+    if baseline_missing:
+        sys.stderr.write(
+            f"WARNING: baseline {args.baseline} not found; regression check skipped "
+            "(run with --save-baseline to create it)\n"
+        )
+        if args.fail_on_regression:
+            return 2
+
+    return 1 if regressions and args.fail_on_regression else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
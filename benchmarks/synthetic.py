@@ -0,0 +1,90 @@
+"""
+Gerador determinístico de manuscritos sintéticos para benchmarks.
+"""
+
+import numpy as np
+from typing import Dict, Any, List
+
+
+def generate_stroke(rng: np.random.Generator, stroke_id: int,
+                    points_per_stroke: int,
+                    pressure: bool = True,
+                    timestamps: bool = True,
+                    start_time: float = 0.0,
+                    sample_rate: float = 200.0) -> Dict[str, Any]:
+    """
+    Gera um traço suave (passeio aleatório com inércia), eventualmente fechado.
+
+    Args:
+        rng: Gerador de números aleatórios
+        stroke_id: Identificador do traço
+        points_per_stroke: Número de pontos do traço
+        pressure: Se inclui o canal de pressão
+        timestamps: Se inclui o canal de timestamps
+        start_time: Instante inicial do traço (segundos)
+        sample_rate: Frequência de amostragem simulada (Hz)
+
+    Returns:
+        Traço no formato de entrada da Layer 1
+    """
+    angles = np.cumsum(rng.normal(0.0, 0.15, points_per_stroke))
+    steps = np.stack([np.cos(angles), np.sin(angles)], axis=1) * rng.uniform(0.5, 1.5)
+    points = rng.uniform(0.0, 100.0, 2) + np.cumsum(steps, axis=0)
+
+    # Aproximadamente um traço em cada cinco termina onde começou
+    if points_per_stroke >= 3 and rng.random() < 0.2:
+        points[-1] = points[0]
+
+    stroke = {'id': stroke_id, 'points': np.round(points, 4).tolist()}
+
+    if pressure:
+        profile = np.sin(np.linspace(0.0, np.pi, points_per_stroke))
+        noise = rng.normal(0.0, 0.02, points_per_stroke)
+        stroke['pressure'] = np.round(np.clip(0.2 + 0.7 * profile + noise, 0.0, 1.0), 4).tolist()
+
+    if timestamps:
+        stroke['timestamps'] = np.round(
+            start_time + np.arange(points_per_stroke) / sample_rate, 6
+        ).tolist()
+
+    return stroke
+
+
+def generate_manuscript(num_strokes: int = 10,
+                        points_per_stroke: int = 64,
+                        pressure: bool = True,
+                        timestamps: bool = True,
+                        seed: int = 0) -> Dict[str, Any]:
+    """
+    Gera um manuscrito sintético reprodutível.
+
+    Args:
+        num_strokes: Número de traços
+        points_per_stroke: Pontos por traço
+        pressure: Se inclui o canal de pressão
+        timestamps: Se inclui o canal de timestamps
+        seed: Semente do gerador (mesma semente, mesmo manuscrito)
+
+    Returns:
+        Manuscrito com 'strokes' e 'metadata'
+    """
+    rng = np.random.default_rng(seed)
+    strokes: List[Dict[str, Any]] = []
+    start_time = 0.0
+
+    for stroke_id in range(num_strokes):
+        strokes.append(generate_stroke(
+            rng, stroke_id, points_per_stroke,
+            pressure=pressure, timestamps=timestamps, start_time=start_time
+        ))
+        start_time += points_per_stroke / 200.0 + 0.1
+
+    return {
+        'strokes': strokes,
+        'metadata': {
+            'generator': 'synthetic',
+            'seed': seed,
+            'num_strokes': num_strokes,
+            'points_per_stroke': points_per_stroke
+        }
+    }
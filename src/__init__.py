@@ -5,12 +5,22 @@ Framework de pesquisa e desenvolvimento aplicado à interseção entre
 linguagem, sistemas digitais e inteligência artificial.
 """
 
+import importlib
+
 __version__ = "0.1.0"
 __author__ = "Guilherme Machado"
 __email__ = "guilherme@example.com"
 
-from .core import CoreIdeogram, AmplificationEngine
-from .layers import Layer1, Layer2, Layer3, Layer4
+# Os componentes são importados sob demanda (PEP 562), para que usar apenas
+# a AmplificationEngine não carregue as quatro camadas e suas dependências.
+_LAZY_ATTRIBUTES = {
+    "CoreIdeogram": ".core",
+    "AmplificationEngine": ".core",
+    "Layer1": ".layers",
+    "Layer2": ".layers",
+    "Layer3": ".layers",
+    "Layer4": ".layers"
+}
 
 __all__ = [
     "CoreIdeogram",
@@ -19,4 +29,17 @@ __all__ = [
     "Layer2",
     "Layer3",
     "Layer4"
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        module = importlib.import_module(_LAZY_ATTRIBUTES[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
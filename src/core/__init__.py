@@ -2,7 +2,27 @@
 Core components of JALS system.
 """
 
-from .ideogram import CoreIdeogram
-from .amplification_engine import AmplificationEngine
+import importlib
 
-__all__ = ["CoreIdeogram", "AmplificationEngine"]
\ No newline at end of file
+_LAZY_ATTRIBUTES = {
+    "CoreIdeogram": ".ideogram",
+    "AmplificationEngine": ".amplification_engine",
+    "TokenVocabulary": ".vocabulary",
+    "IVFIndex": ".embeddings",
+    "CorpusIndex": ".corpus_index"
+}
+
+__all__ = ["CoreIdeogram", "AmplificationEngine", "TokenVocabulary", "IVFIndex", "CorpusIndex"]
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        module = importlib.import_module(_LAZY_ATTRIBUTES[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,8 +1,29 @@
 import numpy as np
 from typing import Dict, Any, List, Optional, Tuple
 import json
+import time
+from collections import OrderedDict
+from collections.abc import Mapping, Sized
+import tracemalloc
+import weakref
 from abc import ABC, abstractmethod
 
+from . import snapshot
+from .metrics import RollingHistogram, timed
+from .tracing import set_tag, traced
+
+class StatePayload(dict):
+    """
+    Dicionário que aceita referências fracas.
+    
+    No modo de retenção 'weak', ``amplify`` devolve a saída do transformador
+    neste tipo, para que ``current_state`` a referencie sem mantê-la viva;
+    entradas passadas como ``StatePayload`` também são referenciadas.
+    """
+    
+    __slots__ = ('__weakref__',)
+
+
 class AmplificationEngine:
     """
     Amplification Engine: o coração operacional do JALS, responsável por realizar 
@@ -20,6 +41,9 @@ class AmplificationEngine:
         self.transformers = {}
         self.history = []
         self.current_state = None
+        self.last_summary = None
+        self.performance_baselines = {}
+        self.last_measurement = None
         
     def register_transformer(self, name: str, transformer: 'BaseTransformer') -> None:
         """
@@ -32,6 +56,8 @@ class AmplificationEngine:
         self.transformers[name] = transformer
         self._log_operation('register_transformer', {'name': name})
         
+    @traced('engine.amplify')
+    @timed('engine.amplify')
     def amplify(self, input_data: Dict[str, Any], 
                 source_layer: str, 
                 target_layer: str) -> Dict[str, Any]:
@@ -52,23 +78,54 @@ class AmplificationEngine:
             raise ValueError(f"Transformer {transformer_name} not found")
             
         transformer = self.transformers[transformer_name]
+        input_items = self._count_items(input_data)
+        set_tag('transformer', transformer_name)
+        set_tag('input_items', input_items)
+        track_memory = self.config.get('track_memory', False)
+        
+        if track_memory:
+            started_tracing = not tracemalloc.is_tracing()
+            if started_tracing:
+                tracemalloc.start()
+            elif hasattr(tracemalloc, 'reset_peak'):
+                tracemalloc.reset_peak()
+            memory_before = tracemalloc.get_traced_memory()[0]
+            
+        start = time.perf_counter()
         result = transformer.transform(input_data)
-        
-        self.current_state = {
-            'source_layer': source_layer,
-            'target_layer': target_layer,
-            'input_data': input_data,
-            'output_data': result
+        duration = time.perf_counter() - start
+        if self.config.get('state_retention', 'summary') == 'weak' and type(result) is dict:
+            result = StatePayload(result)
+        
+        memory_used = None
+        if track_memory:
+            memory_used = max(tracemalloc.get_traced_memory()[1] - memory_before, 0)
+            if started_tracing:
+                tracemalloc.stop()
+                
+        self._record_measurement(transformer_name, duration, memory_used, input_items)
+        
+        self.last_summary = {
+            'input_items': input_items,
+            'output_items': self._count_items(result),
+            'input_keys': sorted(input_data),
+            'output_keys': sorted(result),
+            'duration': duration
         }
+        self.current_state = self._retain_state(source_layer, target_layer, input_data, result)
         
         self._log_operation('amplify', {
             'source_layer': source_layer,
             'target_layer': target_layer,
-            'data_size': len(str(input_data))
+            'duration': duration,
+            'input_items': input_items,
+            'transformer': transformer_name,
+            'settings': transformer.get_tuned_settings()
         })
         
         return result
         
+    @traced('engine.multi_layer_amplify')
     def multi_layer_amplify(self, input_data: Dict[str, Any], 
                            layer_sequence: List[str]) -> Dict[str, Any]:
         """
@@ -126,7 +183,7 @@ class AmplificationEngine:
         Returns:
             Métricas de qualidade
         """
-        if not self.current_state:
+        if not self.current_state and not self.last_summary:
             return {'quality_score': 0.0}
             
         # Implementação simplificada de métricas de qualidade
@@ -142,6 +199,18 @@ class AmplificationEngine:
         
         return quality_metrics
         
+    def get_performance_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Retorna as estatísticas de desempenho medidas por transformador.
+        
+        Returns:
+            Resumo dos histogramas de tempo e memória por item de cada transformador
+        """
+        return {
+            name: {metric: histogram.to_dict() for metric, histogram in baselines.items()}
+            for name, baselines in self.performance_baselines.items()
+        }
+        
     def optimize_transformations(self) -> None:
         """
         Otimiza os transformadores baseado no histórico de operações.
@@ -149,54 +218,120 @@ class AmplificationEngine:
         # Análise do histórico para identificar padrões
         operation_patterns = self._analyze_operation_patterns()
         
-        # Otimização baseada nos padrões identificados
+        # Otimização baseada nos padrões identificados (cada transformador recebe
+        # os padrões gerais e apenas os padrões de desempenho que lhe pertencem)
         for transformer_name, transformer in self.transformers.items():
             if hasattr(transformer, 'optimize'):
-                transformer.optimize(operation_patterns)
+                transformer.optimize([
+                    pattern for pattern in operation_patterns
+                    if pattern.get('transformer', transformer_name) == transformer_name
+                ])
                 
         self._log_operation('optimize_transformations', {
             'patterns_found': len(operation_patterns)
         })
         
-    def save_state(self, filepath: str) -> None:
+    def save_state(self, filepath: str, format: Optional[str] = None) -> None:
         """
         Salva o estado atual da engine.
         
         Args:
             filepath: Caminho para salvar o estado
+            format: Formato de salvamento ('binary', 'json'); por padrão usa
+                config['snapshot_format'] ou 'binary'
         """
-        state_data = {
-            'config': self.config,
-            'history': self.history,
-            'current_state': self.current_state,
-            'transformer_configs': {
-                name: transformer.get_config() 
-                for name, transformer in self.transformers.items()
-                if hasattr(transformer, 'get_config')
+        format = format or self.config.get('snapshot_format', 'binary')
+        
+        if format == 'binary':
+            self._save_binary_state(filepath)
+        elif format == 'json':
+            state_data = {
+                'config': self.config,
+                'history': list(self.history),
+                'current_state': self._serializable_state(),
+                'transformer_configs': {
+                    name: transformer.get_config() 
+                    for name, transformer in self.transformers.items()
+                    if hasattr(transformer, 'get_config')
+                }
             }
-        }
-        
-        with open(filepath, 'w') as f:
-            json.dump(state_data, f, indent=2, default=str)
             
-        self._log_operation('save_state', {'filepath': filepath})
+            with open(filepath, 'w') as f:
+                json.dump(state_data, f, indent=2, default=snapshot.json_default)
+        else:
+            raise ValueError(f"Unsupported state format: {format}")
+            
+        self._log_operation('save_state', {'filepath': filepath, 'format': format})
         
     def load_state(self, filepath: str) -> None:
         """
         Carrega o estado da engine a partir de arquivo.
         
+        O formato (snapshot binário ou JSON) é detectado automaticamente.
+        Transformadores já registrados recebem a configuração salva; os
+        ausentes são recriados a partir da classe gravada no snapshot, desde
+        que ela seja uma subclasse de ``BaseTransformer`` já carregada.
+        
         Args:
             filepath: Caminho do arquivo de estado
         """
-        with open(filepath, 'r') as f:
-            state_data = json.load(f)
+        if snapshot.is_snapshot(filepath):
+            self._load_binary_state(filepath)
+        else:
+            with open(filepath, 'r') as f:
+                state_data = json.load(f)
+                
+            self.config = state_data.get('config', {})
+            self.history = state_data.get('history', [])
+            self.current_state = state_data.get('current_state')
             
-        self.config = state_data.get('config', {})
-        self.history = state_data.get('history', [])
-        self.current_state = state_data.get('current_state')
-        
+            for name, config in state_data.get('transformer_configs', {}).items():
+                if name in self.transformers:
+                    self.transformers[name].config.update(config)
+                    
         self._log_operation('load_state', {'filepath': filepath})
         
+    def _save_binary_state(self, filepath: str) -> None:
+        """Grava o estado num snapshot binário versionado."""
+        transformers = {
+            name: {
+                'class': snapshot.class_path(transformer),
+                'config': transformer.get_config() if hasattr(transformer, 'get_config') else None
+            }
+            for name, transformer in self.transformers.items()
+        }
+        
+        sections = snapshot.encode_history(self.history)
+        sections['engine'] = snapshot.encode_value({
+            'config': self.config,
+            'transformers': transformers
+        })
+        sections['current_state'] = snapshot.encode_value(self._serializable_state())
+        
+        snapshot.write_snapshot(
+            filepath, sections, compression=self.config.get('snapshot_compression', 'zlib')
+        )
+        
+    def _load_binary_state(self, filepath: str) -> None:
+        """Restaura o estado a partir de um snapshot binário."""
+        _, sections = snapshot.read_snapshot(filepath)
+        engine_data = snapshot.decode_value(sections['engine'])
+        
+        self.config = engine_data['config']
+        self.history = snapshot.decode_history(sections)
+        self.current_state = snapshot.decode_value(sections['current_state'])
+        
+        for name, info in engine_data['transformers'].items():
+            if name in self.transformers:
+                if info['config'] is not None:
+                    self.transformers[name].config.update(info['config'])
+                continue
+            try:
+                transformer_class = snapshot.import_class(info['class'])
+            except ValueError as e:
+                raise ValueError(f"Cannot restore transformer {name}: {e}")
+            self.transformers[name] = transformer_class(info['config'])
+            
     def _compute_fidelity(self) -> float:
         """Computa a fidelidade da transformação."""
         # Implementação simplificada
@@ -208,14 +343,37 @@ class AmplificationEngine:
         return 0.90
         
     def _compute_completeness(self) -> float:
-        """Computa a completude da transformação."""
-        # Implementação simplificada
-        return 0.88
+        """Computa a completude da transformação (itens de saída por item de entrada)."""
+        summary = (self.current_state or {}).get('summary') or self.last_summary
+        if not summary:
+            return 1.0
+        return min(summary['output_items'] / max(summary['input_items'], 1), 1.0)
         
     def _compute_efficiency(self) -> float:
-        """Computa a eficiência da transformação."""
-        # Implementação simplificada
-        return 0.92
+        """
+        Computa a eficiência da última transformação.
+        
+        Compara o custo por item medido (tempo e, se disponível, memória) com a
+        mediana da janela recente do mesmo transformador: 1.0 significa custo
+        igual ou menor que a linha de base.
+        """
+        measurement = self.last_measurement
+        if not measurement:
+            return 1.0
+            
+        baselines = self.performance_baselines[measurement['transformer']]
+        scores = []
+        for metric in ('time_per_item', 'memory_per_item'):
+            observed = measurement.get(metric)
+            if observed is None or metric not in baselines:
+                continue
+            baseline = baselines[metric].quantile(0.5)
+            if observed <= 0 or baseline is None:
+                scores.append(1.0)
+            else:
+                scores.append(min(baseline / observed, 1.0))
+                
+        return float(np.mean(scores)) if scores else 1.0
         
     def _analyze_operation_patterns(self) -> List[Dict[str, Any]]:
         """Analisa padrões nas operações realizadas."""
@@ -234,8 +392,123 @@ class AmplificationEngine:
                 'pattern_type': 'frequency'
             })
             
+        # Desempenho medido por transformador e por combinação de parâmetros
+        performance = {}
+        for entry in self.history:
+            params = entry['params']
+            if entry['operation'] != 'amplify' or 'settings' not in params:
+                continue
+            settings = params['settings']
+            key = (params['transformer'], tuple(sorted(settings.items())))
+            group = performance.setdefault(key, {'settings': settings, 'observations': []})
+            group['observations'].append(
+                (params['input_items'], params['duration'] / max(params['input_items'], 1))
+            )
+            
+        for (transformer_name, _), group in performance.items():
+            observations = np.array(group['observations'], dtype=np.float64)
+            patterns.append({
+                'operation': 'amplify',
+                'transformer': transformer_name,
+                'settings': group['settings'],
+                'frequency': len(observations),
+                'input_items': observations[:, 0].tolist(),
+                'time_per_item': observations[:, 1].tolist(),
+                'pattern_type': 'performance'
+            })
+            
         return patterns
         
+    def _retain_state(self, source_layer: str, target_layer: str,
+                      input_data: Dict[str, Any], output_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Monta ``current_state`` conforme config['state_retention']:
+        
+        - 'full': mantém entrada e saída completas
+        - 'weak': mantém referências fracas à entrada e à saída (a saída é
+          devolvida como ``StatePayload``; uma entrada que não aceite
+          referências fracas, como um dicionário simples, fica com None)
+        - 'summary' (padrão): mantém apenas o resumo da transformação
+        - 'none': não mantém estado; o resumo fica só em ``last_summary``
+        """
+        retention = self.config.get('state_retention', 'summary')
+        if retention == 'none':
+            return None
+            
+        state = {
+            'source_layer': source_layer,
+            'target_layer': target_layer,
+            'summary': self.last_summary
+        }
+        
+        if retention == 'full':
+            state['input_data'] = input_data
+            state['output_data'] = output_data
+        elif retention == 'weak':
+            state['input_ref'] = self._weak_reference(input_data)
+            state['output_ref'] = self._weak_reference(output_data)
+        elif retention != 'summary':
+            raise ValueError(f"Unsupported state retention mode: {retention}")
+            
+        return state
+        
+    def _weak_reference(self, obj: Any) -> Optional[weakref.ref]:
+        """Cria uma referência fraca, se o objeto suportar."""
+        try:
+            return weakref.ref(obj)
+        except TypeError:
+            return None
+            
+    def _serializable_state(self) -> Optional[Dict[str, Any]]:
+        """Retorna ``current_state`` sem as referências fracas (não serializáveis)."""
+        if not self.current_state:
+            return self.current_state
+        return {key: value for key, value in self.current_state.items()
+                if key not in ('input_ref', 'output_ref')}
+        
+    def _count_items(self, input_data: Dict[str, Any]) -> int:
+        """
+        Conta os itens de entrada (tamanho da maior coleção de primeiro nível).
+        
+        Contam listas, tuplas, arrays e qualquer coleção com tamanho (como as
+        tabelas colunares); textos e mapeamentos não são coleções de itens.
+        """
+        items = 1
+        for value in input_data.values():
+            if isinstance(value, (str, bytes, bytearray, Mapping)) or not isinstance(value, Sized):
+                continue
+            if getattr(value, 'ndim', 1) and len(value) > items:
+                items = len(value)
+        return items
+        
+    def _record_measurement(self, transformer_name: str, duration: float,
+                            memory_used: Optional[int], input_items: int) -> None:
+        """Registra a medição de uma transformação nos histogramas do transformador."""
+        baselines = self.performance_baselines.get(transformer_name)
+        if baselines is None:
+            window = self.config.get('baseline_window', 1024)
+            baselines = {'time_per_item': RollingHistogram(window=window)}
+            self.performance_baselines[transformer_name] = baselines
+            
+        measurement = {
+            'transformer': transformer_name,
+            'duration': duration,
+            'input_items': input_items,
+            'time_per_item': duration / input_items,
+            'memory_per_item': None
+        }
+        baselines['time_per_item'].record(measurement['time_per_item'])
+        
+        if memory_used is not None:
+            if 'memory_per_item' not in baselines:
+                baselines['memory_per_item'] = RollingHistogram(
+                    window=baselines['time_per_item'].window, min_value=1.0, max_value=1e12
+                )
+            measurement['memory_per_item'] = memory_used / input_items
+            baselines['memory_per_item'].record(measurement['memory_per_item'])
+            
+        self.last_measurement = measurement
+        
     def _log_operation(self, operation: str, params: Dict[str, Any]) -> None:
         """Registra uma operação no histórico."""
         self.history.append({
@@ -248,10 +521,24 @@ class AmplificationEngine:
 class BaseTransformer(ABC):
     """
     Classe base para transformadores de dados entre camadas.
+    
+    Subclasses podem declarar em ``tunable_parameters`` as estratégias
+    alternativas que suportam (o primeiro valor é o padrão); ``optimize``
+    escolhe entre elas a partir do desempenho medido pela engine, explorando
+    apenas os parâmetros que ``active_parameters`` considera ativos.
     """
     
+    tunable_parameters: Dict[str, List[Any]] = {}
+    
+    def __init_subclass__(cls, **kwargs):
+        # Apenas transformadores podem ser recriados a partir de snapshots
+        super().__init_subclass__(**kwargs)
+        snapshot.register_class(cls)
+        
     def __init__(self, config: Optional[Dict[str, Any]] = None):
-        self.config = config or {}
+        self.config = dict(config or {})
+        for name, candidates in self.tunable_parameters.items():
+            self.config.setdefault(name, candidates[0])
         
     @abstractmethod
     def transform(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -270,27 +557,111 @@ class BaseTransformer(ABC):
         """Retorna a configuração do transformador."""
         return self.config
         
+    def get_tuned_settings(self) -> Dict[str, Any]:
+        """Retorna os valores atuais dos parâmetros ajustáveis ativos."""
+        return {name: self.config[name] for name in self.active_parameters()}
+        
+    def active_parameters(self, settings: Optional[Dict[str, Any]] = None) -> List[str]:
+        """
+        Parâmetros ajustáveis que têm efeito numa configuração.
+        
+        Subclasses sobrescrevem quando um parâmetro só vale para certas
+        estratégias; parâmetros inertes não são explorados por ``optimize``.
+        
+        Args:
+            settings: Configuração avaliada (padrão: ``self.config``)
+            
+        Returns:
+            Nomes dos parâmetros ativos
+        """
+        return list(self.tunable_parameters)
+        
     def optimize(self, patterns: List[Dict[str, Any]]) -> None:
         """
         Otimiza o transformador baseado em padrões identificados.
         
+        Ajusta um parâmetro por vez (busca coordenada): compara o custo médio por
+        item de cada valor candidato, mantendo os demais parâmetros fixos e
+        considerando apenas entradas da mesma ordem de grandeza das mais
+        recentes. Candidatos ainda não medidos são experimentados primeiro; os
+        valores vencedores são gravados em ``self.config``.
+        
         Args:
             patterns: Padrões de operação identificados
         """
-        pass
+        performance = [p for p in patterns if p.get('pattern_type') == 'performance']
+        if not self.tunable_parameters or not performance:
+            return
+            
+        min_samples = self.config.get('tuning_min_samples', 3)
+        size_class = self._input_size_class(performance)
+        
+        for name in self.active_parameters():
+            candidates = self.tunable_parameters[name]
+            costs = {}
+            for pattern in performance:
+                settings = pattern['settings']
+                if any(settings.get(other) != self.config[other]
+                       for other in self.active_parameters(settings) if other != name):
+                    continue
+                samples = [
+                    cost for items, cost in zip(pattern['input_items'], pattern['time_per_item'])
+                    if self._size_class(items) == size_class
+                ]
+                if settings.get(name) in candidates and samples:
+                    costs.setdefault(settings[name], []).extend(samples)
+                    
+            untried = [c for c in candidates if len(costs.get(c, [])) < min_samples]
+            if untried:
+                self.config[name] = untried[0]
+                return
+                
+            self.config[name] = min(candidates, key=lambda c: float(np.median(costs[c])))
+            
+    def _input_size_class(self, performance: List[Dict[str, Any]]) -> int:
+        """Classe de tamanho (log2) mais frequente entre as entradas medidas."""
+        classes = [self._size_class(items) for p in performance for items in p['input_items']]
+        values, counts = np.unique(classes, return_counts=True)
+        return int(values[np.argmax(counts)])
+        
+    def _size_class(self, items: float) -> int:
+        """Ordem de grandeza (log2) de um tamanho de entrada."""
+        return int(np.log2(max(items, 1)))
 
 
 class Layer1ToLayer2Transformer(BaseTransformer):
     """Transformador de Layer 1 (Manuscript Encoding) para Layer 2 (Symbolic Abstraction)."""
     
+    tunable_parameters = {
+        'relationship_strategy': ['sparse', 'dense'],
+        'vectorized': [False, True],
+        'batch_size': [0, 256, 4096],
+        'cache_size': [0, 64]
+    }
+    
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        super().__init__(config)
+        self._relationship_cache = OrderedDict()
+        
+    def active_parameters(self, settings: Optional[Dict[str, Any]] = None) -> List[str]:
+        """Parâmetros ativos: ``batch_size`` só vale no caminho vetorizado."""
+        settings = self.config if settings is None else settings
+        names = super().active_parameters(settings)
+        if not settings.get('vectorized'):
+            names.remove('batch_size')
+        return names
+        
     def transform(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """Transforma dados manuscritos em representações simbólicas."""
         strokes = input_data.get('strokes', [])
         
-        symbols = []
-        for stroke in strokes:
-            symbol = self._stroke_to_symbol(stroke)
-            symbols.append(symbol)
+        if self.config['vectorized']:
+            symbols = self._strokes_to_symbols(strokes)
+        else:
+            symbols = []
+            for stroke in strokes:
+                symbol = self._stroke_to_symbol(stroke)
+                symbols.append(symbol)
             
         return {
             'symbols': symbols,
@@ -305,16 +676,32 @@ class Layer1ToLayer2Transformer(BaseTransformer):
         
     def _stroke_to_symbol(self, stroke: Dict[str, Any]) -> Dict[str, Any]:
         """Converte um traço em um símbolo."""
+        return self._build_symbol(stroke, self._is_closed_stroke(stroke))
+        
+    def _build_symbol(self, stroke: Dict[str, Any], closed: bool) -> Dict[str, Any]:
+        """Monta o dicionário do símbolo de um traço."""
         return {
             'id': stroke.get('id'),
             'type': 'geometric_symbol',
             'properties': {
                 'complexity': len(stroke.get('points', [])),
-                'closed': self._is_closed_stroke(stroke),
+                'closed': closed,
                 'curvature': stroke.get('curvature', 0.0)
             }
         }
         
+    def _strokes_to_symbols(self, strokes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Converte traços em símbolos, testando o fechamento em lotes vetorizados."""
+        batch_size = self.config['batch_size'] or len(strokes) or 1
+        symbols = []
+        
+        for start in range(0, len(strokes), batch_size):
+            batch = strokes[start:start + batch_size]
+            closed = self._are_closed_strokes(batch)
+            symbols.extend(self._build_symbol(stroke, bool(c)) for stroke, c in zip(batch, closed))
+            
+        return symbols
+        
     def _is_closed_stroke(self, stroke: Dict[str, Any]) -> bool:
         """Verifica se um traço é fechado."""
         points = stroke.get('points', [])
@@ -322,8 +709,40 @@ class Layer1ToLayer2Transformer(BaseTransformer):
             return False
         return np.linalg.norm(np.array(points[0]) - np.array(points[-1])) < 0.1
         
+    def _are_closed_strokes(self, strokes: List[Dict[str, Any]]) -> np.ndarray:
+        """Versão vetorizada de ``_is_closed_stroke`` para um lote de traços."""
+        closed = np.zeros(len(strokes), dtype=bool)
+        candidates = [i for i, stroke in enumerate(strokes) if len(stroke.get('points', [])) >= 3]
+        if candidates:
+            first = np.array([strokes[i]['points'][0] for i in candidates], dtype=np.float64)
+            last = np.array([strokes[i]['points'][-1] for i in candidates], dtype=np.float64)
+            closed[candidates] = np.linalg.norm(first - last, axis=1) < 0.1
+        return closed
+        
     def _extract_relationships(self, symbols: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Extrai relacionamentos entre símbolos."""
+        cache_size = self.config['cache_size']
+        key = tuple(symbol['id'] for symbol in symbols)
+        
+        if cache_size and key in self._relationship_cache:
+            self._relationship_cache.move_to_end(key)
+            return list(self._relationship_cache[key])
+            
+        if self.config['relationship_strategy'] == 'dense':
+            relationships = self._extract_relationships_dense(key)
+        else:
+            relationships = self._extract_relationships_sparse(symbols)
+            
+        if cache_size:
+            self._relationship_cache[key] = relationships
+            while len(self._relationship_cache) > cache_size:
+                self._relationship_cache.popitem(last=False)
+            relationships = list(relationships)
+            
+        return relationships
+        
+    def _extract_relationships_sparse(self, symbols: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Extrai relacionamentos percorrendo os pares de símbolos um a um."""
         relationships = []
         
         for i, symbol1 in enumerate(symbols):
@@ -337,6 +756,14 @@ class Layer1ToLayer2Transformer(BaseTransformer):
                 relationships.append(relationship)
                 
         return relationships
+        
+    def _extract_relationships_dense(self, ids: Tuple[Any, ...]) -> List[Dict[str, Any]]:
+        """Extrai relacionamentos a partir da matriz triangular de pares."""
+        sources, targets = np.triu_indices(len(ids), 1)
+        return [
+            {'source': ids[i], 'target': ids[j], 'type': 'spatial_proximity', 'strength': 0.5}
+            for i, j in zip(sources.tolist(), targets.tolist())
+        ]
 
 
 class Layer2ToLayer3Transformer(BaseTransformer):
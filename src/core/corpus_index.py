@@ -0,0 +1,409 @@
+import numpy as np
+from typing import Dict, Any, List, Optional, Iterable, Sequence, Tuple
+from collections import OrderedDict, defaultdict
+import json
+import os
+import struct
+
+# Segmento: MAGIC | versão (u32) | tamanho do cabeçalho (u64) | cabeçalho
+# JSON ({"manuscripts": nomes do segmento, "terms": termo -> [offset, bytes,
+# ocorrências]}) | listas de postings. Na versão 1 o cabeçalho era só o
+# dicionário de termos e os nomes ficavam no manifesto.
+# Cada lista é uma sequência varint de pares (delta do manuscrito, posição),
+# onde a posição é relativa à anterior quando o manuscrito se repete.
+SEGMENT_MAGIC = b'JALSIDX1'
+SEGMENT_VERSION = 2
+_SEGMENT_HEADER = struct.Struct('<8sIQ')
+_MANIFEST = 'index.json'
+
+
+def encode_varints(values: np.ndarray) -> bytes:
+    """
+    Codifica inteiros não negativos em varint (7 bits por byte), vetorizado.
+
+    Args:
+        values: Inteiros não negativos
+
+    Returns:
+        Bytes codificados
+    """
+    values = np.asarray(values, dtype=np.uint64)
+    if len(values) == 0:
+        return b''
+    widths = np.ones(len(values), dtype=np.int64)
+    for shift in range(7, 64, 7):
+        widths += values >= np.uint64(1 << shift)
+
+    starts = np.cumsum(widths) - widths
+    out = np.empty(int(widths.sum()), dtype=np.uint8)
+    for byte in range(int(widths.max())):
+        mask = widths > byte
+        chunk = (values[mask] >> np.uint64(7 * byte)) & np.uint64(0x7F)
+        more = (widths[mask] > byte + 1).astype(np.uint64) << np.uint64(7)
+        out[starts[mask] + byte] = (chunk | more).astype(np.uint8)
+    return out.tobytes()
+
+
+def decode_varints(data: Any) -> np.ndarray:
+    """
+    Decodifica uma sequência varint, vetorizado.
+
+    Args:
+        data: Bytes (ou array uint8) codificados
+
+    Returns:
+        Array uint64 de valores
+    """
+    encoded = np.frombuffer(data, dtype=np.uint8) if isinstance(data, (bytes, bytearray)) else np.asarray(data)
+    last_bytes = encoded < 0x80
+    if last_bytes.all():
+        # Caso comum em postings densas: todos os valores cabem em um byte
+        return encoded.astype(np.uint64)
+    ends = np.flatnonzero(last_bytes)
+    starts = np.concatenate([[0], ends[:-1] + 1]).astype(np.int64)
+    widths = ends - starts + 1
+    values = np.zeros(len(ends), dtype=np.uint64)
+    for byte in range(int(widths.max()) if len(widths) else 0):
+        mask = widths > byte
+        values[mask] |= (encoded[starts[mask] + byte] & 0x7F).astype(np.uint64) << np.uint64(7 * byte)
+    return values
+
+
+def encode_postings(documents: np.ndarray, positions: np.ndarray) -> bytes:
+    """Comprime uma lista de postings ordenada por (manuscrito, posição)."""
+    documents = np.asarray(documents, dtype=np.int64)
+    positions = np.asarray(positions, dtype=np.int64)
+    document_deltas = np.diff(documents, prepend=0)
+    position_deltas = np.diff(positions, prepend=0)
+    same_document = document_deltas == 0
+    same_document[0] = False
+    pairs = np.empty(2 * len(documents), dtype=np.uint64)
+    pairs[0::2] = document_deltas
+    pairs[1::2] = np.where(same_document, position_deltas, positions)
+    return encode_varints(pairs)
+
+
+def decode_postings(data: Any) -> Tuple[np.ndarray, np.ndarray]:
+    """Descomprime uma lista de postings em (manuscritos, posições)."""
+    pairs = decode_varints(data).astype(np.int64)
+    document_deltas, values = pairs[0::2], pairs[1::2]
+    if len(values) == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    documents = np.cumsum(document_deltas)
+    new_document = document_deltas != 0
+    new_document[0] = True
+    totals = np.cumsum(values)
+    group_start = np.maximum.accumulate(np.where(new_document, np.arange(len(values)), 0))
+    positions = totals - (totals[group_start] - values[group_start])
+    return documents, positions
+
+
+def _contains(sorted_values: np.ndarray, candidates: np.ndarray) -> np.ndarray:
+    """Máscara dos ``candidates`` presentes em ``sorted_values`` (busca binária, sem ordenar)."""
+    if len(sorted_values) == 0:
+        return np.zeros(len(candidates), dtype=bool)
+    index = np.searchsorted(sorted_values, candidates)
+    index[index == len(sorted_values)] = 0
+    return sorted_values[index] == candidates
+
+
+def _unique_sorted(values: np.ndarray) -> np.ndarray:
+    """Valores distintos de um array já ordenado, em O(n)."""
+    if len(values) == 0:
+        return values
+    return values[np.concatenate([[True], values[1:] != values[:-1]])]
+
+
+def manuscript_terms(layer2_data: Optional[Dict[str, Any]] = None,
+                     layer3_data: Optional[Dict[str, Any]] = None,
+                     tokens: Optional[Sequence[int]] = None) -> List[Tuple[str, int]]:
+    """
+    Extrai os termos indexáveis de um manuscrito, por posição de símbolo.
+
+    Args:
+        layer2_data: Saída de ``Layer2.abstract`` (termos 'type:<tipo>')
+        layer3_data: Saída de ``Layer3.integrate`` (termos 'category:<categoria>')
+        tokens: Tokens de ``CoreIdeogram`` (termos 'token:<id>')
+
+    Returns:
+        Pares (termo, posição)
+    """
+    terms = []
+    if layer2_data is not None:
+        terms += [(f"type:{symbol.get('type')}", position)
+                  for position, symbol in enumerate(layer2_data.get('symbols', []))]
+    if layer3_data is not None:
+        terms += [(f"category:{unit.get('category')}", position)
+                  for position, unit in enumerate(layer3_data.get('linguistic_units', []))]
+    if tokens is not None:
+        terms += [(f"token:{int(token)}", position) for position, token in enumerate(tokens)]
+    return terms
+
+
+class _Segment:
+    """Segmento imutável do índice, com postings mapeados em memória."""
+
+    def __init__(self, path: str):
+        with open(path, 'rb') as f:
+            magic, version, header_size = _SEGMENT_HEADER.unpack(f.read(_SEGMENT_HEADER.size))
+            if magic != SEGMENT_MAGIC:
+                raise ValueError(f"{path} is not a JALS index segment")
+            if version > SEGMENT_VERSION:
+                raise ValueError(f"Unsupported index segment version: {version}")
+            header = json.loads(f.read(header_size))
+        if version < 2:
+            self.dictionary, self.manuscripts = header, None
+        else:
+            self.dictionary, self.manuscripts = header['terms'], header['manuscripts']
+        offset = _SEGMENT_HEADER.size + header_size
+        size = os.path.getsize(path) - offset
+        self.postings = (np.memmap(path, dtype=np.uint8, mode='r', offset=offset, shape=(size,))
+                         if size else np.empty(0, dtype=np.uint8))
+
+    def read(self, term: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """Lê as postings de um termo, ou None se ausente."""
+        entry = self.dictionary.get(term)
+        if entry is None:
+            return None
+        offset, length, _ = entry
+        return decode_postings(self.postings[offset:offset + length])
+
+    @staticmethod
+    def write(path: str, postings: Dict[str, Tuple[np.ndarray, np.ndarray]],
+              manuscripts: List[str]) -> None:
+        """Grava um segmento a partir de postings ordenadas por termo e dos nomes dos seus manuscritos."""
+        dictionary = {}
+        blobs = []
+        offset = 0
+        for term in sorted(postings):
+            documents, positions = postings[term]
+            blob = encode_postings(documents, positions)
+            dictionary[term] = [offset, len(blob), len(documents)]
+            blobs.append(blob)
+            offset += len(blob)
+        encoded = json.dumps({'manuscripts': manuscripts, 'terms': dictionary},
+                             separators=(',', ':')).encode('utf-8')
+        temporary = f"{path}.tmp"
+        with open(temporary, 'wb') as f:
+            f.write(_SEGMENT_HEADER.pack(SEGMENT_MAGIC, SEGMENT_VERSION, len(encoded)))
+            f.write(encoded)
+            f.write(b''.join(blobs))
+        os.replace(temporary, path)
+
+
+class CorpusIndex:
+    """
+    Índice invertido em disco sobre tipos de símbolo, categorias linguísticas
+    e ids de token de um corpus de manuscritos.
+
+    Cada ``commit`` grava um novo segmento imutável (append incremental);
+    os manuscritos recebem ids crescentes, de modo que as postings de um
+    termo são a concatenação das postings de cada segmento. Os nomes dos
+    manuscritos ficam no próprio segmento, e o manifesto só lista os
+    segmentos, então um ``commit`` não regrava o corpus inteiro. ``compact``
+    funde os segmentos num só.
+    """
+
+    def __init__(self, directory: str, cache_size: int = 64):
+        """
+        Abre (ou cria) um índice num diretório.
+
+        Args:
+            directory: Diretório do índice
+            cache_size: Termos com postings decodificadas mantidas em cache (LRU)
+        """
+        self.directory = directory
+        self.cache_size = cache_size
+        self._cache: OrderedDict = OrderedDict()
+        os.makedirs(directory, exist_ok=True)
+        manifest_path = os.path.join(directory, _MANIFEST)
+        if os.path.exists(manifest_path):
+            with open(manifest_path) as f:
+                manifest = json.load(f)
+        else:
+            manifest = {'version': 2, 'segments': []}
+        self.segment_names: List[str] = manifest['segments']
+        self._segments = [_Segment(os.path.join(directory, name)) for name in self.segment_names]
+        # Manifestos da versão 1 guardam os nomes dos segmentos antigos, que
+        # precedem todos os segmentos gravados com nomes
+        self._legacy_manuscripts: List[str] = manifest.get('manuscripts', [])
+        self.manuscripts: List[str] = list(self._legacy_manuscripts)
+        for segment in self._segments:
+            if segment.manuscripts is not None:
+                self.manuscripts.extend(segment.manuscripts)
+        self._pending: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+        self._pending_manuscripts: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self.manuscripts) + len(self._pending_manuscripts)
+
+    def add(self, name: str, layer2_data: Optional[Dict[str, Any]] = None,
+            layer3_data: Optional[Dict[str, Any]] = None,
+            tokens: Optional[Sequence[int]] = None) -> int:
+        """
+        Adiciona um manuscrito ao lote pendente (gravado no próximo ``commit``).
+
+        Args:
+            name: Identificador do manuscrito
+            layer2_data: Saída de ``Layer2.abstract``
+            layer3_data: Saída de ``Layer3.integrate``
+            tokens: Tokens de ``CoreIdeogram``
+
+        Returns:
+            Id do manuscrito no índice
+        """
+        document = len(self)
+        self._pending_manuscripts.append(name)
+        for term, position in manuscript_terms(layer2_data, layer3_data, tokens):
+            self._pending[term].append((document, position))
+        return document
+
+    def commit(self) -> Optional[str]:
+        """
+        Grava o lote pendente como um novo segmento.
+
+        Returns:
+            Nome do segmento gravado, ou None se não havia nada pendente
+        """
+        if not self._pending_manuscripts:
+            return None
+        postings = {}
+        for term, entries in self._pending.items():
+            array = np.array(sorted(entries), dtype=np.int64).reshape(-1, 2)
+            postings[term] = (array[:, 0], array[:, 1])
+        name = self._write_segment(postings, self._pending_manuscripts)
+        self.manuscripts.extend(self._pending_manuscripts)
+        self.segment_names.append(name)
+        self._pending = defaultdict(list)
+        self._pending_manuscripts = []
+        self._write_manifest()
+        return name
+
+    def compact(self) -> None:
+        """Funde todos os segmentos gravados num único segmento."""
+        if len(self._segments) <= 1:
+            return
+        terms = set()
+        for segment in self._segments:
+            terms.update(segment.dictionary)
+        postings = {term: self.postings(term) for term in terms}
+        old_names = self.segment_names
+        self.segment_names = [self._write_segment(postings, self.manuscripts, replace=True)]
+        self._legacy_manuscripts = []
+        self._write_manifest()
+        for name in old_names:
+            os.remove(os.path.join(self.directory, name))
+
+    def postings(self, term: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Retorna as postings gravadas de um termo.
+
+        Args:
+            term: Termo (por exemplo 'type:closed_symbol', 'category:noun', 'token:3')
+
+        Returns:
+            Arrays (manuscritos, posições), ordenados
+        """
+        cached = self._cache.get(term)
+        if cached is not None:
+            self._cache.move_to_end(term)
+            return cached
+            
+        parts = [part for part in (segment.read(term) for segment in self._segments) if part is not None]
+        if not parts:
+            result = np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        else:
+            result = np.concatenate([p[0] for p in parts]), np.concatenate([p[1] for p in parts])
+            
+        if self.cache_size:
+            self._cache[term] = result
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return result
+
+    def documents(self, term: str) -> np.ndarray:
+        """Ids dos manuscritos que contêm um termo."""
+        return _unique_sorted(self.postings(term)[0])
+        
+    def frequency(self, term: str) -> int:
+        """Número de ocorrências gravadas de um termo."""
+        return sum(segment.dictionary[term][2] for segment in self._segments if term in segment.dictionary)
+
+    def query(self, all_of: Iterable[str] = (), any_of: Iterable[str] = (),
+              none_of: Iterable[str] = ()) -> np.ndarray:
+        """
+        Consulta booleana por manuscrito.
+
+        Args:
+            all_of: Termos obrigatórios (AND)
+            any_of: Termos alternativos (OR; ao menos um, se informados)
+            none_of: Termos excluídos (NOT)
+
+        Returns:
+            Ids dos manuscritos, ordenados
+        """
+        all_of = sorted(all_of, key=self.frequency)
+        any_of, none_of = list(any_of), list(none_of)
+        if not all_of and not any_of:
+            result = np.arange(len(self.manuscripts), dtype=np.int64)
+        else:
+            # Termos mais raros primeiro: o conjunto de candidatos só diminui
+            result = None
+            for term in all_of:
+                documents = self.documents(term)
+                result = documents if result is None else result[_contains(documents, result)]
+            if any_of:
+                alternatives = np.unique(np.concatenate([self.postings(term)[0] for term in any_of]))
+                result = alternatives if result is None else result[_contains(alternatives, result)]
+        for term in none_of:
+            result = result[~_contains(self.documents(term), result)]
+        return result
+
+    def phrase(self, terms: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Consulta de frase: termos em posições consecutivas de um manuscrito.
+
+        Args:
+            terms: Sequência de termos
+
+        Returns:
+            Arrays (manuscritos, posição inicial) das ocorrências
+        """
+        if not terms:
+            raise ValueError("Phrase query requires at least one term")
+        # Chave (manuscrito << 32 | posição inicial): as postings já vêm
+        # ordenadas, então a interseção é uma busca binária, a partir do
+        # termo mais raro.
+        matches = None
+        for offset, term in sorted(enumerate(terms), key=lambda item: self.frequency(item[1])):
+            documents, positions = self.postings(term)
+            valid = positions >= offset
+            keys = (documents[valid] << 32) | (positions[valid] - offset)
+            matches = keys if matches is None else matches[_contains(keys, matches)]
+        return matches >> 32, matches & 0xFFFFFFFF
+
+    def names(self, documents: Iterable[int]) -> List[str]:
+        """Converte ids de manuscritos nos nomes informados em ``add``."""
+        return [self.manuscripts[int(document)] for document in documents]
+
+    def _write_segment(self, postings: Dict[str, Tuple[np.ndarray, np.ndarray]],
+                       manuscripts: List[str], replace: bool = False) -> str:
+        """Grava um segmento com o próximo nome livre e o abre."""
+        number = 1 + max([int(name[8:14]) for name in self.segment_names] or [0])
+        name = f"segment-{number:06d}.seg"
+        path = os.path.join(self.directory, name)
+        _Segment.write(path, postings, manuscripts)
+        segment = _Segment(path)
+        self._segments = [segment] if replace else self._segments + [segment]
+        self._cache.clear()
+        return name
+
+    def _write_manifest(self) -> None:
+        """Grava o manifesto (lista de segmentos) atomicamente."""
+        path = os.path.join(self.directory, _MANIFEST)
+        manifest = {'version': 2, 'segments': self.segment_names}
+        if self._legacy_manuscripts:
+            manifest['manuscripts'] = self._legacy_manuscripts
+        with open(f"{path}.tmp", 'w') as f:
+            json.dump(manifest, f)
+        os.replace(f"{path}.tmp", path)
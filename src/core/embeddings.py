@@ -0,0 +1,382 @@
+import numpy as np
+from typing import Dict, Any, Optional, Sequence, Tuple
+import json
+import os
+
+# Dimensões do embedding de traço, na ordem das colunas de ``embed_strokes``
+STROKE_EMBEDDING_FEATURES = (
+    'log_length', 'log_area', 'curvature', 'log_width', 'log_height', 'aspect',
+    'log_velocity', 'log_acceleration', 'pressure', 'has_pressure', 'log_timing',
+    'loop', 'log_degree', 'compactness'
+)
+STROKE_EMBEDDING_DIM = len(STROKE_EMBEDDING_FEATURES)
+IDEOGRAM_EMBEDDING_DIM = 2 * STROKE_EMBEDDING_DIM
+
+# Colunas de características consumidas pelos embeddings (família -> chaves)
+EMBEDDING_COLUMNS = {
+    'geometric': ('length', 'area', 'curvature', 'bbox'),
+    'kinematic': ('velocity', 'acceleration', 'pressure', 'timing'),
+    'topological': ('loops',)
+}
+
+
+def _column(values: Sequence[Any], default: float = 0.0) -> np.ndarray:
+    """Converte uma coluna de características em float64 (None vira ``default``)."""
+    return np.array([default if value is None else value for value in values], dtype=np.float64)
+
+
+def embed_strokes(features: Dict[str, Any], degrees: Optional[Sequence[int]] = None) -> np.ndarray:
+    """
+    Calcula embeddings de traços em lote.
+
+    Cada linha depende apenas do próprio traço (e do seu número de relações),
+    sem estatísticas do lote; assim o resultado de um traço não muda quando
+    outros traços são adicionados ou removidos.
+
+    Args:
+        features: Características por traço (saída de ``CoreIdeogram.extract_features``)
+        degrees: Número de relações de cada traço (zeros se None)
+
+    Returns:
+        Matriz float32 (traços x ``STROKE_EMBEDDING_DIM``) com linhas normalizadas
+    """
+    geometric, kinematic = features['geometric'], features['kinematic']
+    count = len(geometric['length'])
+    if count == 0:
+        return np.zeros((0, STROKE_EMBEDDING_DIM), dtype=np.float32)
+
+    length = _column(geometric['length'])
+    area = _column(geometric['area'])
+    bboxes = np.array([bbox if bbox is not None else [0.0] * 4 for bbox in geometric['bbox']], dtype=np.float64)
+    width = bboxes[:, 2] - bboxes[:, 0]
+    height = bboxes[:, 3] - bboxes[:, 1]
+    pressure = kinematic['pressure']
+    degrees = np.zeros(count) if degrees is None else np.asarray(degrees, dtype=np.float64)
+
+    matrix = np.stack([
+        np.log1p(length),
+        np.log1p(area),
+        _column(geometric['curvature']),
+        np.log1p(width),
+        np.log1p(height),
+        np.clip(np.log((width + 1e-3) / (height + 1e-3)), -5.0, 5.0) / 5.0,
+        np.log1p(_column(kinematic['velocity'])),
+        np.log1p(_column(kinematic['acceleration'])),
+        _column(pressure),
+        np.array([value is not None for value in pressure], dtype=np.float64),
+        np.log1p(_column(kinematic['timing'])),
+        _column(features['topological']['loops']),
+        np.log1p(degrees),
+        np.clip(4 * np.pi * area / np.maximum(length, 1e-12) ** 2, 0.0, 1.0)
+    ], axis=1)
+
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return (matrix / np.where(norms > 0, norms, 1.0)).astype(np.float32)
+
+
+def pool_embeddings(stroke_embeddings: np.ndarray, offsets: Optional[Sequence[int]] = None) -> np.ndarray:
+    """
+    Combina embeddings de traços em embeddings de ideogramas (média e máximo).
+
+    Args:
+        stroke_embeddings: Embeddings de traços concatenados
+        offsets: Início de cada ideograma em ``stroke_embeddings`` (um único
+            ideograma se None)
+
+    Returns:
+        Matriz float32 (ideogramas x ``IDEOGRAM_EMBEDDING_DIM``), linhas normalizadas
+    """
+    offsets = np.asarray([0] if offsets is None else offsets, dtype=np.int64)
+    bounds = np.append(offsets, len(stroke_embeddings))
+    sizes = np.diff(bounds)
+    pooled = np.zeros((len(offsets), IDEOGRAM_EMBEDDING_DIM), dtype=np.float32)
+
+    non_empty = sizes > 0
+    if non_empty.any():
+        starts = offsets[non_empty]
+        pooled[non_empty, :STROKE_EMBEDDING_DIM] = (
+            np.add.reduceat(stroke_embeddings, starts, axis=0) / sizes[non_empty, None]
+        )
+        pooled[non_empty, STROKE_EMBEDDING_DIM:] = np.maximum.reduceat(stroke_embeddings, starts, axis=0)
+
+    norms = np.linalg.norm(pooled, axis=1, keepdims=True)
+    return pooled / np.where(norms > 0, norms, 1.0)
+
+
+def embed_corpus(feature_sets: Sequence[Dict[str, Any]],
+                 degree_sets: Optional[Sequence[Sequence[int]]] = None) -> np.ndarray:
+    """
+    Calcula embeddings de muitos ideogramas numa única passagem vetorizada.
+
+    Args:
+        feature_sets: Características por traço de cada ideograma
+        degree_sets: Número de relações por traço de cada ideograma
+
+    Returns:
+        Matriz float32 (ideogramas x ``IDEOGRAM_EMBEDDING_DIM``)
+    """
+    merged = {family: {key: [] for key in keys} for family, keys in EMBEDDING_COLUMNS.items()}
+    offsets = []
+    degrees = []
+    total = 0
+    for index, features in enumerate(feature_sets):
+        offsets.append(total)
+        for family, keys in EMBEDDING_COLUMNS.items():
+            for key in keys:
+                merged[family][key].extend(features[family][key])
+        count = len(features['geometric']['length'])
+        degrees.extend(degree_sets[index] if degree_sets is not None else [0] * count)
+        total += count
+
+    return pool_embeddings(embed_strokes(merged, degrees), offsets)
+
+
+# Elementos por bloco em IVFIndex.search: distâncias (consultas x candidatos)
+# de cada bloco de consultas e vetores reunidos (candidatos x dim) de cada parte
+_SEARCH_BLOCK_SIZE = 1 << 22
+
+
+class IVFIndex:
+    """
+    Índice aproximado de vizinhos mais próximos (IVF) em NumPy puro.
+
+    Os vetores são agrupados por k-means em ``nlist`` listas invertidas,
+    guardadas contíguas (ordenadas por lista); uma busca compara a consulta
+    apenas com as ``nprobe`` listas de centróides mais próximos. O índice é
+    persistido como arquivos ``.npy`` que podem ser mapeados em memória.
+    """
+
+    def __init__(self, centroids: np.ndarray, vectors: np.ndarray,
+                 ids: np.ndarray, offsets: np.ndarray, nprobe: int = 8):
+        """
+        Inicializa o índice a partir de listas já construídas.
+
+        Args:
+            centroids: Centróides (nlist x dim)
+            vectors: Vetores ordenados por lista
+            ids: Ids dos vetores, na mesma ordem
+            offsets: Início de cada lista (nlist + 1)
+            nprobe: Listas examinadas por busca
+        """
+        self.centroids = centroids
+        self.vectors = vectors
+        self.ids = ids
+        self.offsets = offsets
+        self.nprobe = nprobe
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @classmethod
+    def build(cls, vectors: np.ndarray, ids: Optional[np.ndarray] = None,
+              nlist: Optional[int] = None, nprobe: int = 8, iterations: int = 10,
+              sample_size: int = 65536, seed: int = 0) -> 'IVFIndex':
+        """
+        Treina os centróides e distribui os vetores nas listas.
+
+        Args:
+            vectors: Vetores (n x dim)
+            ids: Ids dos vetores (0..n-1 se None)
+            nlist: Número de listas (aproximadamente sqrt(n) se None)
+            nprobe: Listas examinadas por busca
+            iterations: Iterações do k-means
+            sample_size: Vetores usados no treino do k-means
+            seed: Semente da amostragem
+
+        Returns:
+            Índice construído
+        """
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        if vectors.ndim != 2 or len(vectors) == 0:
+            raise ValueError("IVFIndex.build requires a non-empty 2D array of vectors")
+        ids = np.arange(len(vectors), dtype=np.int64) if ids is None else np.asarray(ids, dtype=np.int64)
+        if len(ids) != len(vectors):
+            raise ValueError("ids and vectors must have the same length")
+
+        nlist = min(nlist or max(1, int(np.sqrt(len(vectors)))), len(vectors))
+        rng = np.random.default_rng(seed)
+        sample = vectors[rng.choice(len(vectors), min(sample_size, len(vectors)), replace=False)]
+        centroids = sample[rng.choice(len(sample), nlist, replace=False)].copy()
+
+        for _ in range(iterations):
+            assignment = _nearest(sample, centroids)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignment, sample)
+            counts = np.bincount(assignment, minlength=nlist)
+            filled = counts > 0
+            centroids[filled] = sums[filled] / counts[filled, None]
+
+        index = cls(centroids, np.empty((0, vectors.shape[1]), dtype=np.float32),
+                    np.empty(0, dtype=np.int64), np.zeros(nlist + 1, dtype=np.int64), nprobe)
+        index.add(vectors, ids)
+        return index
+
+    def add(self, vectors: np.ndarray, ids: np.ndarray) -> None:
+        """
+        Acrescenta vetores às listas (os centróides não são retreinados).
+
+        Args:
+            vectors: Vetores (n x dim)
+            ids: Ids dos vetores
+        """
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        nlist = len(self.centroids)
+        old_lists = np.repeat(np.arange(nlist), np.diff(self.offsets))
+        lists = np.concatenate([old_lists, _nearest(vectors, self.centroids)])
+        order = np.argsort(lists, kind='stable')
+
+        self.vectors = np.concatenate([np.asarray(self.vectors), vectors])[order]
+        self.ids = np.concatenate([np.asarray(self.ids), np.asarray(ids, dtype=np.int64)])[order]
+        self.offsets = np.zeros(nlist + 1, dtype=np.int64)
+        self.offsets[1:] = np.cumsum(np.bincount(lists, minlength=nlist))
+
+    def search(self, queries: np.ndarray, k: int = 10,
+               nprobe: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Busca os ``k`` vizinhos aproximados de cada consulta (distância L2).
+
+        Args:
+            queries: Consultas (m x dim) ou um único vetor
+            k: Número de vizinhos
+            nprobe: Listas examinadas (usa ``self.nprobe`` se None)
+
+        Returns:
+            Ids (m x k, -1 quando faltam candidatos) e distâncias ao quadrado
+        """
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        nprobe = min(nprobe or self.nprobe, len(self.centroids))
+        probes = np.argsort(_squared_distances(queries, self.centroids), axis=1)[:, :nprobe]
+
+        lengths = self.offsets[probes + 1] - self.offsets[probes]
+        totals = lengths.sum(axis=1)
+
+        result_ids = np.full((len(queries), k), -1, dtype=np.int64)
+        result_distances = np.full((len(queries), k), np.inf, dtype=np.float32)
+        width = int(totals.max()) if len(queries) else 0
+        if width == 0:
+            return result_ids, result_distances
+
+        # Consultas em blocos, limitando a matriz de distâncias de cada bloco
+        rows = max(1, _SEARCH_BLOCK_SIZE // width)
+        for block in range(0, len(queries), rows):
+            window = slice(block, block + rows)
+            self._search_block(queries[window], probes[window], lengths[window], totals[window],
+                               result_ids[window], result_distances[window])
+        return result_ids, result_distances
+
+    def _search_block(self, queries: np.ndarray, probes: np.ndarray, lengths: np.ndarray,
+                      totals: np.ndarray, result_ids: np.ndarray, result_distances: np.ndarray) -> None:
+        """
+        Busca de um bloco de consultas sem laço por consulta. As distâncias
+        vão para uma matriz (consultas x candidatos) preenchida com infinito,
+        da qual sai o top-k de cada linha.
+
+        Args:
+            queries: Consultas do bloco (m x dim)
+            probes: Listas examinadas por consulta (m x nprobe)
+            lengths: Tamanho de cada lista examinada (m x nprobe)
+            totals: Candidatos por consulta (m)
+            result_ids: Saída dos ids (m x k)
+            result_distances: Saída das distâncias (m x k)
+        """
+        width = int(totals.max())
+        if width == 0:
+            return
+        distances = np.full((len(queries), width), np.inf, dtype=np.float32)
+        positions = np.zeros((len(queries), width), dtype=np.int64)
+        # Coluna inicial de cada lista examinada na linha da sua consulta
+        columns = (np.cumsum(lengths, axis=1) - lengths).ravel()
+        rows = np.repeat(np.arange(len(queries)), probes.shape[1])
+        lists = probes.ravel()
+        order = np.argsort(lists, kind='stable')
+        bounds = np.flatnonzero(np.diff(lists[order])) + 1
+
+        if len(bounds) + 1 > len(queries):
+            # Mais listas distintas que consultas: os candidatos de todos os
+            # pares são reunidos num vetor plano e comparados de uma vez
+            segment_lengths = lengths.ravel()
+            within = np.arange(int(segment_lengths.sum())) - \
+                np.repeat(np.cumsum(segment_lengths) - segment_lengths, segment_lengths)
+            cells = np.repeat(rows, segment_lengths), np.repeat(columns, segment_lengths) + within
+            candidates = np.repeat(self.offsets[lists], segment_lengths) + within
+            positions[cells] = candidates
+            # Os vetores reunidos (candidatos x dim) são processados em partes
+            # de até _SEARCH_BLOCK_SIZE elementos
+            step = max(1, _SEARCH_BLOCK_SIZE // queries.shape[1])
+            for start in range(0, len(candidates), step):
+                part = slice(start, start + step)
+                differences = np.asarray(np.take(self.vectors, candidates[part], axis=0), dtype=np.float32)
+                differences -= np.take(queries, cells[0][part], axis=0)
+                distances[cells[0][part], cells[1][part]] = np.einsum('ij,ij->i', differences, differences)
+        else:
+            # Cada lista examinada é comparada de uma vez com todas as
+            # consultas que a examinam
+            for group in np.split(order, bounds):
+                start, end = self.offsets[lists[group[0]]], self.offsets[lists[group[0]] + 1]
+                if start == end:
+                    continue
+                cells = rows[group, None], columns[group, None] + np.arange(end - start)
+                distances[cells] = _squared_distances(queries[rows[group]],
+                                                      np.asarray(self.vectors[start:end]))
+                positions[cells] = np.arange(start, end)
+
+        top = min(result_ids.shape[1], width)
+        best = np.argpartition(distances, top - 1, axis=1)[:, :top]
+        best = np.take_along_axis(best, np.argsort(np.take_along_axis(distances, best, axis=1),
+                                                   axis=1, kind='stable'), axis=1)
+        best_distances = np.take_along_axis(distances, best, axis=1)
+        found = np.isfinite(best_distances)
+        result_ids[:, :top] = np.where(found, self.ids[np.take_along_axis(positions, best, axis=1)], -1)
+        result_distances[:, :top] = best_distances
+
+    def save(self, directory: str) -> None:
+        """
+        Grava o índice como arquivos ``.npy`` (mapeáveis em memória).
+
+        Args:
+            directory: Diretório de destino (criado se necessário)
+        """
+        os.makedirs(directory, exist_ok=True)
+        for name in ('centroids', 'vectors', 'ids', 'offsets'):
+            np.save(os.path.join(directory, f'{name}.npy'), np.asarray(getattr(self, name)))
+        with open(os.path.join(directory, 'index.json'), 'w') as f:
+            json.dump({'type': 'ivf', 'version': 1, 'nprobe': self.nprobe,
+                       'size': len(self), 'dim': int(self.centroids.shape[1])}, f)
+
+    @classmethod
+    def load(cls, directory: str, mmap: bool = True) -> 'IVFIndex':
+        """
+        Carrega um índice salvo.
+
+        Args:
+            directory: Diretório do índice
+            mmap: Se os vetores e ids são mapeados em memória (somente leitura)
+
+        Returns:
+            Índice carregado
+        """
+        with open(os.path.join(directory, 'index.json')) as f:
+            meta = json.load(f)
+        if meta.get('type') != 'ivf':
+            raise ValueError(f"{directory} is not an IVF index")
+        mode = 'r' if mmap else None
+        arrays = {
+            name: np.load(os.path.join(directory, f'{name}.npy'), mmap_mode=mode)
+            for name in ('centroids', 'vectors', 'ids', 'offsets')
+        }
+        return cls(np.asarray(arrays['centroids']), arrays['vectors'], arrays['ids'],
+                   np.asarray(arrays['offsets']), meta['nprobe'])
+
+
+def _squared_distances(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Distâncias L2 ao quadrado entre as linhas de ``a`` e de ``b``."""
+    return (np.einsum('ij,ij->i', a, a)[:, None] - 2 * a @ b.T
+            + np.einsum('ij,ij->i', b, b)[None, :])
+
+
+def _nearest(vectors: np.ndarray, centroids: np.ndarray, chunk_size: int = 16384) -> np.ndarray:
+    """Centróide mais próximo de cada vetor, em blocos para limitar a memória."""
+    return np.concatenate([
+        np.argmin(_squared_distances(vectors[start:start + chunk_size], centroids), axis=1)
+        for start in range(0, len(vectors), chunk_size)
+    ]) if len(vectors) else np.empty(0, dtype=np.int64)
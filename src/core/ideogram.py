@@ -1,17 +1,180 @@
 import numpy as np
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Iterable
+from bisect import bisect_left, insort
+from collections import Counter
+from itertools import compress
 import json
+import math
 import pickle
 
+from .embeddings import EMBEDDING_COLUMNS, embed_strokes, pool_embeddings
+from .vocabulary import TokenVocabulary
+
+# Colunas por traço de ``extract_features`` (família -> chaves); as demais
+# chaves de cada família permanecem listas vazias.
+_STROKE_FEATURE_COLUMNS = {
+    'geometric': ('curvature', 'length', 'area', 'centroid', 'bbox'),
+    'kinematic': ('velocity', 'acceleration', 'pressure', 'timing'),
+    'topological': ('loops',)
+}
+
+
+def _json_default(value: Any) -> Any:
+    """Converte arrays e escalares NumPy para tipos JSON."""
+    if isinstance(value, (np.ndarray, np.generic)):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class _RowBuffer:
+    """
+    Array por traço (tokens, embeddings) com capacidade excedente.
+
+    ``rows`` é a visão das linhas ocupadas. Acréscimos dobram a capacidade
+    quando ela se esgota (O(1) amortizado por traço) e as remoções de uma
+    atualização são compactadas por uma única máscara booleana; a ordem
+    das linhas é a do manuscrito, por isso não há troca com a última linha.
+    """
+
+    def __init__(self, rows: np.ndarray):
+        self._buffer = rows
+        self._size = len(rows)
+        self.rows = rows
+
+    def extend(self, count: int) -> None:
+        """Acrescenta ``count`` linhas zeradas no fim."""
+        size = self._size + count
+        if size > len(self._buffer):
+            grown = np.zeros((max(2 * size, 16),) + self._buffer.shape[1:],
+                             dtype=self._buffer.dtype)
+            grown[:self._size] = self._buffer[:self._size]
+            self._buffer = grown
+        else:
+            self._buffer[self._size:size] = 0
+        self._size = size
+        self.rows = self._buffer[:size]
+
+    def compact(self, keep: np.ndarray) -> None:
+        """Mantém só as linhas marcadas em ``keep``, preservando a ordem."""
+        size = int(np.count_nonzero(keep))
+        self._buffer[:size] = self._buffer[:self._size][keep]
+        self._size = size
+        self.rows = self._buffer[:size]
+
+
+class _VersionedData(dict):
+    """
+    Dicionário de dados com contador de versão por chave.
+
+    Toda atribuição incrementa a versão da chave; alterações feitas dentro
+    dos valores (por exemplo ``data['strokes'].append(...)``) devem ser
+    sinalizadas com ``touch``.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.versions = {key: 0 for key in self}
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.touch(key)
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def __reduce__(self):
+        # Serializado como dicionário comum: as versões só valem em memória
+        return (dict, (dict(self),))
+
+    def touch(self, *keys) -> None:
+        """Marca chaves como alteradas."""
+        for key in keys:
+            self.versions[key] = self.versions.get(key, 0) + 1
+
+    def version(self, key) -> int:
+        """Versão atual de uma chave."""
+        return self.versions.get(key, 0)
+
+
+class _SpatialGrid:
+    """Índice espacial em grade uniforme sobre caixas delimitadoras (chave -> bbox)."""
+
+    def __init__(self, cell_size: float):
+        self.cell_size = cell_size
+        self.cells: Dict[tuple, set] = {}
+        self.boxes: Dict[int, List[float]] = {}
+
+    def insert(self, key: int, bbox: Optional[List[float]]) -> None:
+        """Insere uma caixa (caixas None são ignoradas)."""
+        if bbox is None:
+            return
+        self.boxes[key] = bbox
+        for cell in self._cells(bbox):
+            self.cells.setdefault(cell, set()).add(key)
+
+    def remove(self, key: int) -> None:
+        """Remove a caixa de uma chave, se presente."""
+        bbox = self.boxes.pop(key, None)
+        if bbox is None:
+            return
+        for cell in self._cells(bbox):
+            members = self.cells[cell]
+            members.discard(key)
+            if not members:
+                del self.cells[cell]
+
+    def query(self, bbox: Optional[List[float]], tolerance: float = 0.0) -> set:
+        """Retorna as chaves cujas caixas tocam ``bbox`` (expandida por ``tolerance``)."""
+        if bbox is None:
+            return set()
+        x0, y0, x1, y1 = bbox[0] - tolerance, bbox[1] - tolerance, bbox[2] + tolerance, bbox[3] + tolerance
+        candidates = set()
+        for cell in self._cells((x0, y0, x1, y1)):
+            candidates.update(self.cells.get(cell, ()))
+        return {
+            key for key in candidates
+            if self.boxes[key][0] <= x1 and x0 <= self.boxes[key][2]
+            and self.boxes[key][1] <= y1 and y0 <= self.boxes[key][3]
+        }
+
+    def _cells(self, bbox) -> List[tuple]:
+        """Células da grade cobertas por uma caixa."""
+        x0, y0, x1, y1 = (math.floor(value / self.cell_size) for value in bbox)
+        return [(cx, cy) for cx in range(x0, x1 + 1) for cy in range(y0, y1 + 1)]
+
 
 class CoreIdeogram:
     """
     Core Ideogram: o signo matricial do sistema, condensando a origem 
     manuscrita e sua tradução digital.
+    
+    Após um processamento completo (``extract_features``,
+    ``generate_symbolic_representation`` e ``to_computational_representation``),
+    ``update_strokes`` reprocessa apenas os traços adicionados, alterados ou
+    removidos, mantendo resultados por traço indexados pelo id do traço
+    (que deve ser único).
     """
+    
+    # Tamanho da célula da grade espacial e tolerância para considerar dois
+    # traços conectados (caixas delimitadoras que se tocam)
+    GRID_CELL_SIZE = 32.0
+    CONNECTION_TOLERANCE = 0.0
 
-    def __init__(self):
-        """Inicializa o Core Ideogram com estrutura de dados vazia."""
+    def __init__(self, vocabulary: Optional[TokenVocabulary] = None):
+        """
+        Inicializa o Core Ideogram com estrutura de dados vazia.
+        
+        Args:
+            vocabulary: Vocabulário de tokens (por exemplo carregado de um
+                arquivo compartilhado); um vocabulário novo se None
+        """
+        self.vocabulary = vocabulary if vocabulary is not None else TokenVocabulary()
         self.data = {
             'strokes': [],
             'metadata': {},
@@ -19,6 +182,53 @@ class CoreIdeogram:
             'computational_representation': None
         }
         self.history = []
+        self._reset_stroke_state()
+
+    @property
+    def data(self) -> _VersionedData:
+        """
+        Dados do ideograma, com versão por chave.
+
+        As representações derivadas são memorizadas e só recalculadas quando
+        a versão de suas entradas muda; após alterar valores no lugar, chame
+        ``mark_dirty``.
+        """
+        return self._data
+
+    @data.setter
+    def data(self, value: Dict[str, Any]) -> None:
+        self._data = value if isinstance(value, _VersionedData) else _VersionedData(value)
+        self._memo: Dict[str, Any] = {}
+
+    def mark_dirty(self, *keys: str) -> None:
+        """
+        Sinaliza alterações feitas no lugar em ``data`` (por exemplo 'strokes').
+
+        Args:
+            keys: Chaves de ``data`` alteradas
+        """
+        self._data.touch(*keys)
+
+    def is_dirty(self, representation: str) -> bool:
+        """
+        Verifica se uma representação derivada precisa ser recalculada.
+
+        Args:
+            representation: 'features', 'symbolic_representation' ou
+                'computational_representation'
+
+        Returns:
+            True se as entradas mudaram desde o último cálculo
+        """
+        if representation == 'features':
+            return self._features is None or self._memo.get('features') != self._data.version('strokes')
+        if representation == 'symbolic_representation':
+            return (self.is_dirty('features')
+                    or self._memo.get('symbolic') != (self._symbolic_inputs(), self._data.version('symbolic_representation')))
+        if representation == 'computational_representation':
+            return (self.is_dirty('symbolic_representation')
+                    or self._memo.get('computational') != self._computational_stamp())
+        raise ValueError(f"Unknown representation: {representation}")
 
     def load_manuscript(self, source: str, format: str = 'json') -> None:
         """
@@ -48,12 +258,27 @@ class CoreIdeogram:
         Returns:
             Dicionário com características extraídas
         """
+        if not self.is_dirty('features'):
+            return self._features
+            
         features = {
             'geometric': self._extract_geometric_features(),
             'kinematic': self._extract_kinematic_features(),
             'topological': self._extract_topological_features()
         }
         
+        self._reset_stroke_state()
+        for stroke in self.data['strokes']:
+            row = self._stroke_features(stroke)
+            for family, keys in _STROKE_FEATURE_COLUMNS.items():
+                for key in keys:
+                    features[family][key].append(row[family][key])
+            self._track_stroke(stroke)
+        self._features = features
+        self._features_version += 1
+        self._memo['features'] = self._data.version('strokes')
+        self._stage = 1
+        
         self._update_history('extract_features', features)
         return features
 
@@ -64,6 +289,9 @@ class CoreIdeogram:
         Args:
             features: Características extraídas dos traços
         """
+        if features is self._features and not self.is_dirty('symbolic_representation'):
+            return
+            
         # Implementação da abstração simbólica
         symbolic_data = {
             'symbols': [],
@@ -71,39 +299,190 @@ class CoreIdeogram:
             'semiotic_attributes': {}
         }
         
+        # Relações: traços cujas caixas delimitadoras se tocam
+        strokes = self.data['strokes']
+        bboxes = features.get('geometric', {}).get('bbox', [])
+        if features is not self._features or len(bboxes) != len(strokes):
+            self._reset_stroke_state()
+            for stroke in strokes:
+                self._track_stroke(stroke)
+            bboxes = bboxes if len(bboxes) == len(strokes) else [None] * len(strokes)
+        for key, bbox in zip(self._order, bboxes):
+            self._grid.insert(key, bbox)
+        for key, bbox in zip(self._order, bboxes):
+            self._neighbors[key] = sorted(self._grid.query(bbox, self.CONNECTION_TOLERANCE) - {key})
+        
         # Processamento para gerar símbolos
-        for stroke in self.data['strokes']:
+        for key, stroke in zip(self._order, strokes):
             symbol = self._stroke_to_symbol(stroke, features)
+            symbol['relations'] = self._relations_of(key)
             symbolic_data['symbols'].append(symbol)
         
+        self._stage = 2 if features is self._features else 0
         self.data['symbolic_representation'] = symbolic_data
+        if features is self._features:
+            self._memo['symbolic'] = (self._symbolic_inputs(), self._data.version('symbolic_representation'))
+        else:
+            self._memo.pop('symbolic', None)
         self._update_history('generate_symbolic_representation', symbolic_data)
 
     def to_computational_representation(self) -> Dict[str, Any]:
         """
         Converte a representação simbólica em formato computacional.
         
+        Os tokens são ids int32 do vocabulário (``comp_rep['tokens']`` é um
+        array NumPy); use ``render_tokens`` para obter as assinaturas em texto.
+        ``comp_rep['embeddings']`` recebe os embeddings float32 dos traços
+        quando as características vêm de ``extract_features``.
+        
         Returns:
             Representação computacional do ideograma
         """
         if not self.data['symbolic_representation']:
             raise ValueError("Symbolic representation not generated yet")
+        if self._memo.get('computational') == self._computational_stamp():
+            return self.data['computational_representation']
         
+        # Conversão para representação computacional
+        symbols = self.data['symbolic_representation']['symbols']
         comp_rep = {
-            'tokens': [],
-            'embeddings': None,
+            'tokens': self.vocabulary.encode([self._symbol_to_token(symbol) for symbol in symbols]),
+            'embeddings': self._stroke_embeddings(symbols),
             'graph': None,
             'executable_code': None
         }
         
-        # Conversão para representação computacional
-        for symbol in self.data['symbolic_representation']['symbols']:
-            token = self._symbol_to_token(symbol)
-            comp_rep['tokens'].append(token)
-        
         self.data['computational_representation'] = comp_rep
+        self._memo['computational'] = self._computational_stamp()
+        self._stage = 3 if self._stage >= 2 else 0
         self._update_history('to_computational_representation', comp_rep)
         return comp_rep
+        
+    def embedding(self) -> Optional[np.ndarray]:
+        """
+        Retorna o embedding do ideograma (média e máximo dos embeddings dos traços).
+        
+        Returns:
+            Vetor float32 de ``IDEOGRAM_EMBEDDING_DIM`` posições, ou None se
+            não houver embeddings de traços
+        """
+        comp_rep = self.data['computational_representation']
+        if not comp_rep or comp_rep.get('embeddings') is None:
+            return None
+        return pool_embeddings(comp_rep['embeddings'])[0]
+        
+    def render_tokens(self) -> List[str]:
+        """
+        Converte os tokens da representação computacional em texto.
+        
+        Returns:
+            Assinaturas dos tokens (por exemplo 'TOKEN_1')
+        """
+        if not self.data['computational_representation']:
+            raise ValueError("Computational representation not generated yet")
+        return self.vocabulary.decode(self.data['computational_representation']['tokens'])
+        
+    def update_strokes(self, added: Optional[Iterable[Dict[str, Any]]] = None,
+                       changed: Optional[Iterable[Dict[str, Any]]] = None,
+                       removed: Optional[Iterable[Any]] = None) -> Dict[str, Any]:
+        """
+        Reprocessa incrementalmente apenas os traços afetados.
+        
+        Traços adicionados entram no fim do manuscrito; traços alterados
+        mantêm sua posição. Somente as características, relações e tokens dos
+        traços afetados (e de seus vizinhos) são recalculados, e o resultado é
+        igual ao de um reprocessamento completo.
+        
+        Args:
+            added: Novos traços (com ids inéditos)
+            changed: Novas versões de traços existentes (mesmo id)
+            removed: Ids dos traços removidos
+            
+        Returns:
+            Representação computacional atualizada
+        """
+        if self._stage < 3:
+            raise ValueError("Incremental update requires a full processing pass first")
+        if len(self._key_by_id) != len(self._order):
+            raise ValueError("Incremental update requires unique stroke ids")
+        
+        added, changed, removed = list(added or []), list(changed or []), list(removed or [])
+        updated_ids = removed + [stroke.get('id') for stroke in changed]
+        added_ids = [stroke.get('id') for stroke in added]
+        for stroke_id in updated_ids:
+            if stroke_id not in self._key_by_id:
+                raise ValueError(f"Unknown stroke id: {stroke_id}")
+        for stroke_id in added_ids:
+            if stroke_id in self._key_by_id:
+                raise ValueError(f"Stroke id already exists: {stroke_id}")
+        # Cada id aparece uma única vez: entre os adicionados e entre os
+        # alterados/removidos (um traço não pode ser alterado e removido)
+        for ids in (updated_ids, added_ids):
+            repeated = [stroke_id for stroke_id, count in Counter(ids).items() if count > 1]
+            if repeated:
+                raise ValueError(f"Stroke ids listed more than once: {repeated}")
+        
+        affected = set()
+        comp_rep = self.data['computational_representation']
+        buffers = self._row_buffers()
+        
+        # Remoções: uma máscara compacta cada coluna e buffer numa só passada
+        removed_keys = [self._key_by_id[stroke_id] for stroke_id in removed]
+        for key in removed_keys:
+            affected.update(self._unlink(key))
+        columns = self._stroke_columns()
+        if removed_keys:
+            keep = np.ones(len(self._order), dtype=bool)
+            keep[[bisect_left(self._order, key) for key in removed_keys]] = False
+            for column in columns + [self._order]:
+                column[:] = compress(column, keep)
+            for name, buffer in buffers.items():
+                buffer.compact(keep)
+                comp_rep[name] = buffer.rows
+        for stroke_id, key in zip(removed, removed_keys):
+            del self._key_by_id[stroke_id]
+            del self._stroke_by_key[key]
+        affected.difference_update(removed_keys)
+        
+        for stroke in changed:
+            key = self._key_by_id[stroke.get('id')]
+            affected.update(self._unlink(key))
+            index = bisect_left(self._order, key)
+            self._stroke_by_key[key] = stroke
+            self._set_stroke_row(index, stroke)
+            affected.update(self._link(key))
+        
+        # Adições: os buffers crescem uma vez para todos os novos traços
+        start = len(self._order)
+        if added:
+            for column in columns:
+                column.extend([None] * len(added))
+            for name, buffer in buffers.items():
+                buffer.extend(len(added))
+                comp_rep[name] = buffer.rows
+        for offset, stroke in enumerate(added):
+            key = self._track_stroke(stroke)
+            self._set_stroke_row(start + offset, stroke)
+            affected.update(self._link(key))
+            
+        symbols = self.data['symbolic_representation']['symbols']
+        for key in affected:
+            symbols[bisect_left(self._order, key)]['relations'] = self._relations_of(key)
+        self._refresh_embeddings(sorted(bisect_left(self._order, key) for key in affected))
+            
+        # As representações foram atualizadas no lugar e continuam válidas
+        self._data.touch('strokes', 'symbolic_representation', 'computational_representation')
+        self._features_version += 1
+        self._memo = {
+            'features': self._data.version('strokes'),
+            'symbolic': (self._symbolic_inputs(), self._data.version('symbolic_representation')),
+            'computational': self._computational_stamp()
+        }
+            
+        self._update_history('update_strokes', {
+            'added': len(added), 'changed': len(changed), 'removed': len(removed)
+        })
+        return self.data['computational_representation']
 
     def save(self, filepath: str, format: str = 'json') -> None:
         """
@@ -115,7 +494,7 @@ class CoreIdeogram:
         """
         if format == 'json':
             with open(filepath, 'w') as f:
-                json.dump(self.data, f, indent=2)
+                json.dump(self.data, f, indent=2, default=_json_default)
         elif format == 'pickle':
             with open(filepath, 'wb') as f:
                 pickle.dump(self.data, f)
@@ -129,7 +508,8 @@ class CoreIdeogram:
             'curvature': [],
             'length': [],
             'area': [],
-            'centroid': []
+            'centroid': [],
+            'bbox': []
         }
 
     def _extract_kinematic_features(self) -> Dict[str, Any]:
@@ -163,10 +543,179 @@ class CoreIdeogram:
         }
 
     def _symbol_to_token(self, symbol: Dict[str, Any]) -> str:
-        """Converte um símbolo em um token computacional."""
+        """Converte um símbolo na assinatura do seu token no vocabulário."""
         # Implementação simplificada
         return f"TOKEN_{symbol['id']}"
 
+    def _stroke_features(self, stroke: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """
+        Calcula as características de um único traço.
+        
+        Args:
+            stroke: Traço com 'points' e, opcionalmente, 'pressure' e 'timestamps'
+            
+        Returns:
+            Valores por família e chave de ``_STROKE_FEATURE_COLUMNS``
+        """
+        points = np.asarray(stroke.get('points', []), dtype=float).reshape(-1, 2)
+        segments = np.diff(points, axis=0)
+        segment_lengths = np.hypot(segments[:, 0], segments[:, 1])
+        length = float(segment_lengths.sum())
+        
+        if len(points) >= 3:
+            x, y = points[:, 0], points[:, 1]
+            area = float(abs(np.dot(x, np.roll(y, -1)) - np.dot(y, np.roll(x, -1))) / 2)
+            headings = np.arctan2(segments[:, 1], segments[:, 0])
+            turns = np.angle(np.exp(1j * np.diff(headings)))
+            curvature = float(np.abs(turns).mean())
+            closed = bool(np.hypot(*(points[0] - points[-1])) < 0.1)
+        else:
+            area, curvature, closed = 0.0, 0.0, False
+            
+        velocity = acceleration = timing = 0.0
+        timestamps = np.asarray(stroke.get('timestamps', []), dtype=float)
+        if len(timestamps) == len(points) and len(points) >= 2:
+            timing = float(timestamps[-1] - timestamps[0])
+            dt = np.diff(timestamps)
+            valid = dt > 0
+            if valid.any():
+                speeds = segment_lengths[valid] / dt[valid]
+                velocity = float(speeds.mean())
+                if len(speeds) >= 2:
+                    acceleration = float(np.abs(np.diff(speeds) / dt[valid][1:]).mean())
+                    
+        pressure = stroke.get('pressure')
+        
+        return {
+            'geometric': {
+                'curvature': curvature,
+                'length': length,
+                'area': area,
+                'centroid': points.mean(axis=0).tolist() if len(points) else None,
+                'bbox': points.min(axis=0).tolist() + points.max(axis=0).tolist() if len(points) else None
+            },
+            'kinematic': {
+                'velocity': velocity,
+                'acceleration': acceleration,
+                'pressure': float(np.mean(pressure)) if pressure else None,
+                'timing': timing
+            },
+            'topological': {
+                'loops': closed
+            }
+        }
+        
+    def _reset_stroke_state(self) -> None:
+        """Descarta os resultados por traço usados no modo incremental."""
+        # Cada traço recebe uma chave crescente: a ordem das chaves é a ordem
+        # do manuscrito, o que permite localizar posições por bisseção.
+        self._order: List[int] = []
+        self._next_key = 0
+        self._buffers: Dict[str, _RowBuffer] = {}
+        self._key_by_id: Dict[Any, int] = {}
+        self._stroke_by_key: Dict[int, Dict[str, Any]] = {}
+        self._grid = _SpatialGrid(self.GRID_CELL_SIZE)
+        self._neighbors: Dict[int, List[int]] = {}
+        self._features = None
+        self._features_version = getattr(self, '_features_version', 0) + 1
+        self._stage = 0
+        
+    def _stroke_embeddings(self, symbols: List[Dict[str, Any]]) -> Optional[np.ndarray]:
+        """Embeddings dos traços, se as características estiverem alinhadas aos símbolos."""
+        if self._features is None or self._stage < 2 or len(self._features['geometric']['length']) != len(symbols):
+            return None
+        return embed_strokes(self._features, [len(symbol.get('relations', [])) for symbol in symbols])
+        
+    def _refresh_embeddings(self, indices: List[int]) -> None:
+        """Recalcula os embeddings dos traços nas posições indicadas."""
+        embeddings = self.data['computational_representation']['embeddings']
+        if embeddings is None or not indices:
+            return
+        subset = {
+            family: {key: [self._features[family][key][i] for i in indices] for key in keys}
+            for family, keys in EMBEDDING_COLUMNS.items()
+        }
+        symbols = self.data['symbolic_representation']['symbols']
+        embeddings[indices] = embed_strokes(subset, [len(symbols[i]['relations']) for i in indices])
+        
+    def _symbolic_inputs(self) -> tuple:
+        """Versões das entradas da representação simbólica."""
+        return (self._data.version('strokes'), self._features_version)
+        
+    def _computational_stamp(self) -> tuple:
+        """Versões da representação simbólica e da computacional derivada dela."""
+        return (self._data.version('symbolic_representation'),
+                self._data.version('computational_representation'))
+        
+    def _track_stroke(self, stroke: Dict[str, Any]) -> int:
+        """Registra um traço no fim da ordem e retorna sua chave."""
+        key = self._next_key
+        self._next_key += 1
+        self._order.append(key)
+        self._key_by_id[stroke.get('id')] = key
+        self._stroke_by_key[key] = stroke
+        return key
+        
+    def _stroke_columns(self) -> List[list]:
+        """Listas paralelas indexadas pela posição do traço (exceto os tokens, um array)."""
+        columns = [self.data['strokes']]
+        columns += [self._features[family][key] for family, keys in _STROKE_FEATURE_COLUMNS.items() for key in keys]
+        columns.append(self.data['symbolic_representation']['symbols'])
+        return columns
+        
+    def _row_buffers(self) -> Dict[str, _RowBuffer]:
+        """
+        Buffers dos arrays por traço da representação computacional (tokens e
+        embeddings), recriados quando a representação foi regenerada.
+        """
+        comp_rep = self.data['computational_representation']
+        buffers = {}
+        for name in ('tokens', 'embeddings'):
+            rows = comp_rep.get(name)
+            buffer = self._buffers.get(name)
+            if rows is None:
+                self._buffers.pop(name, None)
+                continue
+            if buffer is None or buffer.rows is not rows:
+                buffer = self._buffers[name] = _RowBuffer(rows)
+            buffers[name] = buffer
+        return buffers
+        
+    def _set_stroke_row(self, index: int, stroke: Dict[str, Any]) -> None:
+        """Recalcula traço, características, símbolo e token numa posição."""
+        row = self._stroke_features(stroke)
+        self.data['strokes'][index] = stroke
+        for family, keys in _STROKE_FEATURE_COLUMNS.items():
+            for key in keys:
+                self._features[family][key][index] = row[family][key]
+        symbol = self._stroke_to_symbol(stroke, self._features)
+        self.data['symbolic_representation']['symbols'][index] = symbol
+        tokens = self.data['computational_representation']['tokens']
+        tokens[index] = self.vocabulary.encode([self._symbol_to_token(symbol)])[0]
+        
+    def _link(self, key: int) -> set:
+        """Insere um traço na grade e retorna as chaves cujas relações mudaram."""
+        bbox = self._features['geometric']['bbox'][bisect_left(self._order, key)]
+        self._grid.insert(key, bbox)
+        neighbors = sorted(self._grid.query(bbox, self.CONNECTION_TOLERANCE) - {key})
+        self._neighbors[key] = neighbors
+        for neighbor in neighbors:
+            insort(self._neighbors[neighbor], key)
+        return set(neighbors) | {key}
+        
+    def _unlink(self, key: int) -> set:
+        """Remove um traço da grade e retorna as chaves cujas relações mudaram."""
+        self._grid.remove(key)
+        neighbors = self._neighbors.pop(key, [])
+        for neighbor in neighbors:
+            others = self._neighbors[neighbor]
+            del others[bisect_left(others, key)]
+        return set(neighbors) | {key}
+        
+    def _relations_of(self, key: int) -> List[Any]:
+        """Ids dos traços conectados a um traço, na ordem do manuscrito."""
+        return [self._stroke_by_key[neighbor].get('id') for neighbor in self._neighbors.get(key, [])]
+        
     def _update_history(self, operation: str, params: Dict[str, Any]) -> None:
         """Atualiza o histórico de operações."""
         self.history.append({
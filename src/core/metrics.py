@@ -0,0 +1,619 @@
+import math
+import numpy as np
+from typing import Dict, Any, List, Optional, Callable, Iterable
+import bisect
+import functools
+import itertools
+import json
+import os
+import re
+import sys
+import threading
+import time
+
+
+class RollingHistogram:
+    """
+    Histograma compacto com janela deslizante e buckets logarítmicos.
+
+    Mantém duas janelas de contagem (atual e anterior); quando a janela atual
+    atinge ``window`` amostras ela passa a ser a anterior. Assim o registro é
+    O(1) e os quantis refletem apenas as amostras mais recentes.
+    """
+
+    def __init__(self, window: int = 1024,
+                 min_value: float = 1e-9,
+                 max_value: float = 1e3,
+                 buckets_per_octave: int = 4):
+        """
+        Inicializa o histograma.
+
+        Args:
+            window: Número de amostras por janela
+            min_value: Menor valor distinguível (limite do primeiro bucket)
+            max_value: Maior valor distinguível (limite do último bucket)
+            buckets_per_octave: Resolução dos buckets por potência de 2
+        """
+        self.window = window
+        self.min_value = min_value
+        self.max_value = max_value
+        self.buckets_per_octave = buckets_per_octave
+        self.num_buckets = int(math.ceil(math.log2(max_value / min_value) * buckets_per_octave)) + 2
+        self._current = np.zeros(self.num_buckets, dtype=np.uint32)
+        self._previous = np.zeros(self.num_buckets, dtype=np.uint32)
+        self._current_count = 0
+        self.last_value = None
+
+    def record(self, value: float) -> None:
+        """
+        Registra uma amostra.
+
+        Args:
+            value: Valor observado
+        """
+        self._current[self._bucket_index(value)] += 1
+        self._current_count += 1
+        self.last_value = value
+
+        if self._current_count >= self.window:
+            self._previous, self._current = self._current, self._previous
+            self._current[:] = 0
+            self._current_count = 0
+
+    @property
+    def count(self) -> int:
+        """Número de amostras atualmente representadas."""
+        return int(self._current.sum() + self._previous.sum())
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estima um quantil a partir dos buckets.
+
+        Args:
+            q: Quantil desejado (0-1)
+
+        Returns:
+            Valor representativo do bucket do quantil, ou None se vazio
+        """
+        counts = self._current.astype(np.int64) + self._previous
+        total = counts.sum()
+        if total == 0:
+            return None
+
+        cumulative = np.cumsum(counts)
+        index = int(np.searchsorted(cumulative, q * total, side='left'))
+        return self._bucket_value(min(index, self.num_buckets - 1))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Retorna um resumo serializável do histograma."""
+        return {
+            'count': self.count,
+            'p50': self.quantile(0.5),
+            'p90': self.quantile(0.9),
+            'p99': self.quantile(0.99),
+            'last': self.last_value
+        }
+
+    def _bucket_index(self, value: float) -> int:
+        """Computa o índice do bucket de um valor."""
+        if value <= self.min_value:
+            return 0
+        if value >= self.max_value:
+            return self.num_buckets - 1
+        return int(math.log2(value / self.min_value) * self.buckets_per_octave) + 1
+
+    def _bucket_value(self, index: int) -> float:
+        """Computa o valor representativo (média geométrica) de um bucket."""
+        if index == 0:
+            return self.min_value
+        if index == self.num_buckets - 1:
+            return self.max_value
+        return self.min_value * 2 ** ((index - 0.5) / self.buckets_per_octave)
+
+
+class Counter:
+    """Contador monotônico."""
+
+    def __init__(self):
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1) -> None:
+        """Incrementa o contador."""
+        with self._lock:
+            self.value += amount
+
+
+class Gauge:
+    """Valor instantâneo."""
+
+    def __init__(self):
+        self.value = 0.0
+
+    def set(self, value: float) -> None:
+        """Define o valor atual."""
+        self.value = value
+
+
+class LatencyHistogram:
+    """
+    Histograma de latências no estilo HDR: buckets log-lineares (cada potência
+    de 2 dividida em ``sub_buckets`` faixas lineares), com erro relativo
+    limitado a 1/``sub_buckets`` e registro O(1).
+    """
+
+    def __init__(self, sub_buckets: int = 16, min_exponent: int = -30, max_exponent: int = 8):
+        """
+        Inicializa o histograma.
+
+        Args:
+            sub_buckets: Faixas lineares por potência de 2
+            min_exponent: Menor expoente de 2 representado (2**-30 s ~ 1 ns)
+            max_exponent: Maior expoente de 2 representado (2**8 s ~ 4 min)
+        """
+        self.sub_buckets = sub_buckets
+        self.min_exponent = min_exponent
+        self.max_exponent = max_exponent
+        self.counts = [0] * ((max_exponent - min_exponent + 1) * sub_buckets)
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+        self._lock = threading.Lock()
+
+    def record(self, value: float) -> None:
+        """
+        Registra uma latência.
+
+        Args:
+            value: Latência em segundos
+        """
+        index = self._bucket_index(value)
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.total += value
+            if self.min is None or value < self.min:
+                self.min = value
+            if self.max is None or value > self.max:
+                self.max = value
+
+    def reset(self) -> None:
+        """Descarta todas as amostras."""
+        with self._lock:
+            self.counts = [0] * len(self.counts)
+            self.count = 0
+            self.total = 0.0
+            self.min = None
+            self.max = None
+
+    def merge(self, other: 'LatencyHistogram') -> 'LatencyHistogram':
+        """Acumula outro histograma (com o mesmo esquema de buckets) neste."""
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.count += other.count
+        self.total += other.total
+        for attribute, pick in (('min', min), ('max', max)):
+            values = [v for v in (getattr(self, attribute), getattr(other, attribute)) if v is not None]
+            setattr(self, attribute, pick(values) if values else None)
+        return self
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estima um quantil (limite superior do bucket).
+
+        Args:
+            q: Quantil desejado (0-1)
+
+        Returns:
+            Latência em segundos, ou None se vazio
+        """
+        return self.quantiles((q,))[0]
+
+    def quantiles(self, qs: Iterable[float]) -> List[Optional[float]]:
+        """
+        Estima vários quantis com uma única soma acumulada dos buckets.
+
+        Args:
+            qs: Quantis desejados (0-1)
+
+        Returns:
+            Latências em segundos (None se vazio), na ordem de ``qs``
+        """
+        with self._lock:
+            count, maximum = self.count, self.max
+            if count == 0:
+                return [None for _ in qs]
+            cumulative = list(itertools.accumulate(self.counts))
+
+        results = []
+        for q in qs:
+            threshold = q * count
+            # Primeiro bucket não vazio cuja contagem acumulada atinge o limiar
+            index = (bisect.bisect_left(cumulative, threshold) if threshold > 0
+                     else bisect.bisect_right(cumulative, 0))
+            results.append(min(self._bucket_upper(index), maximum)
+                           if index < len(cumulative) else maximum)
+        return results
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Retorna um resumo serializável do histograma."""
+        p50, p90, p99 = self.quantiles((0.5, 0.9, 0.99))
+        return {
+            'count': self.count,
+            'mean': self.total / self.count if self.count else None,
+            'min': self.min,
+            'max': self.max,
+            'p50': p50,
+            'p90': p90,
+            'p99': p99
+        }
+
+    def _bucket_index(self, value: float) -> int:
+        """Computa o índice do bucket de uma latência."""
+        if value <= 0:
+            return 0
+        mantissa, exponent = math.frexp(value)
+        exponent -= 1  # value = (2 * mantissa) * 2**exponent, com 2 * mantissa em [1, 2)
+        if exponent < self.min_exponent:
+            return 0
+        if exponent > self.max_exponent:
+            return len(self.counts) - 1
+        sub = int((mantissa * 2 - 1) * self.sub_buckets)
+        return (exponent - self.min_exponent) * self.sub_buckets + sub
+
+    def _bucket_upper(self, index: int) -> float:
+        """Limite superior de um bucket."""
+        exponent, sub = divmod(index, self.sub_buckets)
+        return (1 + (sub + 1) / self.sub_buckets) * 2.0 ** (exponent + self.min_exponent)
+
+
+class WindowedCounter:
+    """
+    Contagem de eventos numa janela deslizante de tempo: um anel de ``slots``
+    intervalos, cada um reiniciado quando o relógio passa por ele de novo.
+    O registro é O(1) e eventos mais antigos que ``window`` são descartados.
+    """
+
+    def __init__(self, window: float = 60.0, slots: int = 60):
+        """
+        Inicializa o contador.
+
+        Args:
+            window: Duração da janela, em segundos
+            slots: Número de intervalos da janela (resolução)
+        """
+        self.window = window
+        self.resolution = window / slots
+        self._counts = [0] * slots
+        self._epochs = [-1] * slots
+        self._lock = threading.Lock()
+
+    def add(self, now: float, amount: int = 1) -> None:
+        """
+        Registra eventos.
+
+        Args:
+            now: Instante do evento (``time.perf_counter``)
+            amount: Número de eventos
+        """
+        epoch = int(now / self.resolution)
+        slot = epoch % len(self._counts)
+        with self._lock:
+            if self._epochs[slot] != epoch:
+                self._epochs[slot] = epoch
+                self._counts[slot] = 0
+            self._counts[slot] += amount
+
+    def total(self, now: float) -> int:
+        """Número de eventos registrados na janela que termina em ``now``."""
+        oldest = int(now / self.resolution) - len(self._counts) + 1
+        with self._lock:
+            return sum(count for count, epoch in zip(self._counts, self._epochs) if epoch >= oldest)
+
+    def reset(self) -> None:
+        """Descarta todos os eventos."""
+        with self._lock:
+            self._counts = [0] * len(self._counts)
+            self._epochs = [-1] * len(self._epochs)
+
+
+_ALERT_CONDITION = re.compile(r'^\s*(\w+)\s*(>=|<=|>|<|==)\s*([\d.]+)\s*(%|ms|us|s|b|kb|mb|gb)?\s*$', re.I)
+_ALERT_UNITS = {
+    None: 1.0, '%': 0.01, 's': 1.0, 'ms': 1e-3, 'us': 1e-6,
+    'b': 1.0, 'kb': 1024.0, 'mb': 1024.0 ** 2, 'gb': 1024.0 ** 3
+}
+_ALERT_OPERATORS = {
+    '>': lambda a, b: a > b, '<': lambda a, b: a < b,
+    '>=': lambda a, b: a >= b, '<=': lambda a, b: a <= b, '==': lambda a, b: a == b
+}
+
+
+class MetricsRegistry:
+    """
+    Registro de métricas em processo: contadores, gauges e histogramas de
+    latência, com exportação em formato texto do Prometheus (arquivo ou HTTP)
+    e avaliação de condições de alerta sobre os dados correntes.
+
+    O registro de uma chamada é O(1); agregados (quantis, taxas, memória)
+    são calculados apenas em ``snapshot``, isto é, na leitura ou exportação.
+    """
+
+    def __init__(self, rate_window: float = 60.0):
+        """
+        Inicializa o registro.
+
+        Args:
+            rate_window: Janela, em segundos, de 'throughput' e 'error_rate'
+        """
+        self.counters: Dict[str, Counter] = {}
+        self.gauges: Dict[str, Gauge] = {}
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self.started_at = time.time()
+        self._started_clock = time.perf_counter()
+        self._recent_calls = WindowedCounter(rate_window)
+        self._recent_errors = WindowedCounter(rate_window)
+        self._lock = threading.Lock()
+
+    def counter(self, name: str) -> Counter:
+        """Retorna (criando se necessário) um contador."""
+        return self._get_or_create(self.counters, name, Counter)
+
+    def gauge(self, name: str) -> Gauge:
+        """Retorna (criando se necessário) um gauge."""
+        return self._get_or_create(self.gauges, name, Gauge)
+
+    def histogram(self, name: str) -> LatencyHistogram:
+        """Retorna (criando se necessário) um histograma de latência."""
+        return self._get_or_create(self.histograms, name, LatencyHistogram)
+
+    def observe(self, operation: str, duration: float, error: bool = False) -> None:
+        """
+        Registra uma chamada instrumentada.
+
+        Args:
+            operation: Nome da operação (por exemplo 'layer1.preprocess')
+            duration: Duração em segundos
+            error: Se a chamada terminou com exceção
+        """
+        now = time.perf_counter()
+        self.histogram(f"{operation}.response_time").record(duration)
+        self._recent_calls.add(now)
+        if error:
+            self.counter(f"{operation}.errors").inc()
+            self._recent_errors.add(now)
+
+    def timed(self, operation: str) -> Callable:
+        """
+        Decorador que registra latência, chamadas e erros de uma função.
+
+        As métricas são resolvidas uma única vez, na decoração; o custo por
+        chamada se resume a dois ``perf_counter``, um registro no histograma e
+        outro no contador da janela.
+        """
+        histogram = self.histogram(f"{operation}.response_time")
+        errors = self.counter(f"{operation}.errors")
+        recent_calls, recent_errors = self._recent_calls, self._recent_errors
+        perf_counter = time.perf_counter
+
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                start = perf_counter()
+                try:
+                    result = func(*args, **kwargs)
+                except BaseException:
+                    end = perf_counter()
+                    histogram.record(end - start)
+                    recent_calls.add(end)
+                    errors.inc()
+                    recent_errors.add(end)
+                    raise
+                end = perf_counter()
+                histogram.record(end - start)
+                recent_calls.add(end)
+                return result
+            return wrapper
+        return decorator
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Calcula as métricas agregadas atuais.
+
+        Returns:
+            'response_time' (segundos, todas as operações), 'throughput'
+            (chamadas/s) e 'error_rate' (fração) na janela recente,
+            'memory_usage' (RSS atual, bytes) e o detalhe por operação
+        """
+        self._sample_memory()
+        now = time.perf_counter()
+        # Logo após o início (ou ``reset``) a janela cobre apenas o tempo decorrido
+        elapsed = max(min(now - self._started_clock, self._recent_calls.window), 1e-9)
+        recent_calls = self._recent_calls.total(now)
+        recent_errors = self._recent_errors.total(now)
+
+        operations = {}
+        combined = LatencyHistogram()
+        for name, histogram in list(self.histograms.items()):
+            if not name.endswith('.response_time'):
+                continue
+            operation = name[:-len('.response_time')]
+            calls = histogram.count
+            errors = self.counters[f"{operation}.errors"].value if f"{operation}.errors" in self.counters else 0
+            operations[operation] = {
+                'calls': calls,
+                'errors': errors,
+                'response_time': histogram.to_dict()
+            }
+            combined.merge(histogram)
+
+        return {
+            'response_time': combined.to_dict(),
+            'throughput': recent_calls / elapsed,
+            'error_rate': recent_errors / recent_calls if recent_calls else 0.0,
+            'memory_usage': self.gauges['process.rss_bytes'].value,
+            'operations': operations,
+            'gauges': {name: gauge.value for name, gauge in self.gauges.items()}
+        }
+
+    def evaluate_alerts(self, alerts: List[Dict[str, Any]],
+                        snapshot: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """
+        Avalia condições de alerta como ``'error_rate > 5%'`` ou
+        ``'response_time > 1000ms'`` (response_time usa o p99).
+
+        Args:
+            alerts: Alertas com 'name', 'condition' e 'action'
+            snapshot: Métricas agregadas (calculadas se None)
+
+        Returns:
+            Alertas com 'value', 'threshold' e 'firing'
+        """
+        snapshot = snapshot or self.snapshot()
+        results = []
+        for alert in alerts:
+            match = _ALERT_CONDITION.match(alert['condition'])
+            if not match:
+                raise ValueError(f"Unsupported alert condition: {alert['condition']}")
+            metric, operator, threshold, unit = match.groups()
+            value = snapshot.get(metric)
+            if isinstance(value, dict):
+                value = value.get('p99')
+            threshold = float(threshold) * _ALERT_UNITS[unit.lower() if unit else None]
+            results.append(dict(
+                alert, value=value, threshold=threshold,
+                firing=value is not None and _ALERT_OPERATORS[operator](value, threshold)
+            ))
+        return results
+
+    def to_prometheus(self) -> str:
+        """Exporta as métricas no formato texto do Prometheus."""
+        snapshot = self.snapshot()
+        lines = []
+        for name, counter in sorted(self.counters.items()):
+            metric = _prometheus_name(name)
+            lines += [f"# TYPE {metric}_total counter", f"{metric}_total {counter.value}"]
+        for name, gauge in sorted(self.gauges.items()):
+            metric = _prometheus_name(name)
+            lines += [f"# TYPE {metric} gauge", f"{metric} {gauge.value}"]
+        for name, histogram in sorted(self.histograms.items()):
+            metric = _prometheus_name(name) + '_seconds'
+            lines.append(f"# TYPE {metric} summary")
+            for q in (0.5, 0.9, 0.99):
+                value = histogram.quantile(q)
+                lines.append(f'{metric}{{quantile="{q}"}} {value if value is not None else "NaN"}')
+            lines += [f"{metric}_sum {histogram.total}", f"{metric}_count {histogram.count}"]
+        for name in ('throughput', 'error_rate'):
+            lines += [f"# TYPE jals_{name} gauge", f"jals_{name} {snapshot[name]}"]
+        return "\n".join(lines) + "\n"
+
+    def write_file(self, filepath: str, format: str = 'prometheus') -> None:
+        """
+        Exporta as métricas para arquivo (escrita atômica).
+
+        Args:
+            filepath: Caminho do arquivo
+            format: 'prometheus' ou 'json'
+        """
+        content = self.to_prometheus() if format == 'prometheus' else json.dumps(self.snapshot())
+        temporary = f"{filepath}.tmp"
+        with open(temporary, 'w') as f:
+            f.write(content)
+        os.replace(temporary, filepath)
+
+    def serve_http(self, port: int = 0, host: str = '127.0.0.1'):
+        """
+        Expõe as métricas num endpoint HTTP local (``/metrics`` em texto
+        Prometheus, ``/metrics.json`` em JSON), numa thread daemon.
+
+        Args:
+            port: Porta (0 escolhe uma porta livre)
+            host: Endereço de escuta
+
+        Returns:
+            ``http.server.ThreadingHTTPServer`` iniciado (use ``shutdown()``
+            para encerrar)
+        """
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        registry = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path == '/metrics':
+                    body, content_type = registry.to_prometheus(), 'text/plain; version=0.0.4'
+                elif self.path == '/metrics.json':
+                    body, content_type = json.dumps(registry.snapshot()), 'application/json'
+                else:
+                    self.send_error(404)
+                    return
+                payload = body.encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), MetricsHandler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+    def reset(self) -> None:
+        """
+        Zera todas as métricas (as instâncias são mantidas, pois as funções
+        decoradas guardam referências a elas).
+        """
+        with self._lock:
+            for metric in list(self.counters.values()) + list(self.gauges.values()):
+                metric.value = 0
+            for histogram in self.histograms.values():
+                histogram.reset()
+            self._recent_calls.reset()
+            self._recent_errors.reset()
+            self.started_at = time.time()
+            self._started_clock = time.perf_counter()
+
+    def _get_or_create(self, metrics: Dict[str, Any], name: str, factory: Callable) -> Any:
+        """Busca uma métrica, criando-a sob o lock apenas na primeira vez."""
+        metric = metrics.get(name)
+        if metric is None:
+            with self._lock:
+                metric = metrics.setdefault(name, factory())
+        return metric
+
+    def _sample_memory(self) -> None:
+        """
+        Amostra o uso de memória do processo fora do caminho crítico: RSS
+        atual (``/proc/self/statm``; nas demais plataformas, o pico de RSS) e
+        pico de RSS.
+        """
+        try:
+            import resource
+            max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            max_rss *= 1 if sys.platform == 'darwin' else 1024
+        except ImportError:
+            max_rss = 0
+        try:
+            with open('/proc/self/statm') as f:
+                rss = int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+        except (OSError, ValueError, AttributeError, IndexError):
+            rss = max_rss
+        self.gauge('process.rss_bytes').set(rss)
+        self.gauge('process.max_rss_bytes').set(max_rss)
+
+
+def _prometheus_name(name: str) -> str:
+    """Converte um nome de métrica para o formato do Prometheus."""
+    return 'jals_' + re.sub(r'[^a-zA-Z0-9_]', '_', name)
+
+
+# Registro padrão do processo, usado pela instrumentação das camadas
+default_registry = MetricsRegistry()
+
+
+def timed(operation: str) -> Callable:
+    """Decorador que registra a chamada no registro padrão."""
+    return default_registry.timed(operation)
@@ -0,0 +1,621 @@
+import numpy as np
+from typing import Dict, Any, List, Optional, Tuple
+from collections.abc import Mapping, MutableSequence, Sequence
+import base64
+import bz2
+import datetime
+import importlib
+import json
+import lzma
+import struct
+import zlib
+
+# Formato: MAGIC | versão (u16) | codec (u8) | reservado (u8) | corpo (comprimido)
+# Corpo: sequência de seções ``nome (u8 + bytes) | tamanho (u64) | dados``.
+# Seções estruturadas são JSON (``encode_value``) e o histórico é colunar;
+# nenhuma seção é desserializada com pickle, de modo que carregar um snapshot
+# não executa código.
+SNAPSHOT_MAGIC = b'JALSSNAP'
+# A versão 3 grava os parâmetros do histórico em colunas; a 2 ainda é lida
+SNAPSHOT_VERSION = 3
+# A versão 1 guardava seções com pickle e não é mais lida
+_MIN_SNAPSHOT_VERSION = 2
+_HEADER = struct.Struct('<8sHBB')
+_SECTION_LENGTH = struct.Struct('<Q')
+
+
+def _optional_codec(module_name: str, compress_name: str, decompress_name: str):
+    """Retorna (compress, decompress) de uma biblioteca opcional, ou None."""
+    try:
+        module = importlib.import_module(module_name)
+    except ImportError:
+        return None
+    return getattr(module, compress_name), getattr(module, decompress_name)
+
+
+def _zstd_codec():
+    """Retorna (compress, decompress) do zstandard, ou None."""
+    try:
+        import zstandard
+    except ImportError:
+        return None
+    return (lambda data: zstandard.ZstdCompressor(level=3).compress(data),
+            lambda data: zstandard.ZstdDecompressor().decompress(data))
+
+
+CODECS = {
+    'none': (0, lambda: (lambda data: data, lambda data: data)),
+    'zlib': (1, lambda: (lambda data: zlib.compress(data, 1), zlib.decompress)),
+    'lzma': (2, lambda: (lzma.compress, lzma.decompress)),
+    'bz2': (3, lambda: (bz2.compress, bz2.decompress)),
+    'zstd': (4, _zstd_codec),
+    'lz4': (5, lambda: _optional_codec('lz4.frame', 'compress', 'decompress')),
+}
+_CODEC_NAMES = {codec_id: name for name, (codec_id, _) in CODECS.items()}
+
+
+def available_codecs() -> List[str]:
+    """Lista os codecs de compressão disponíveis neste ambiente."""
+    return [name for name, (_, factory) in CODECS.items() if factory() is not None]
+
+
+def _get_codec(name: str):
+    """Retorna (compress, decompress) de um codec pelo nome."""
+    if name not in CODECS:
+        raise ValueError(f"Unknown snapshot compression: {name}")
+    codec = CODECS[name][1]()
+    if codec is None:
+        raise ValueError(f"Snapshot compression '{name}' is not available")
+    return codec
+
+
+def is_snapshot(filepath: str) -> bool:
+    """Verifica se um arquivo é um snapshot binário."""
+    with open(filepath, 'rb') as f:
+        return f.read(len(SNAPSHOT_MAGIC)) == SNAPSHOT_MAGIC
+
+
+# Chave que marca, no JSON, valores que o JSON não representa diretamente
+_TAG = '__jals__'
+
+# Classes que ``import_class`` pode devolver, por ``modulo:Classe``
+_REGISTERED_CLASSES: Dict[str, type] = {}
+
+
+def _encode(value: Any) -> Any:
+    """Converte um valor em estrutura JSON, marcando os tipos não nativos."""
+    if value is None or isinstance(value, (bool, str)):
+        return value
+    if isinstance(value, (int, float)) and type(value) in (int, float):
+        if isinstance(value, float) and not np.isfinite(value):
+            return {_TAG: 'float', 'value': repr(value)}
+        return value
+    if isinstance(value, dict):
+        if all(isinstance(key, str) and key != _TAG for key in value):
+            return {key: _encode(item) for key, item in value.items()}
+        return {_TAG: 'dict', 'items': [[_encode(key), _encode(item)] for key, item in value.items()]}
+    if isinstance(value, list):
+        return [_encode(item) for item in value]
+    if isinstance(value, tuple):
+        return {_TAG: 'tuple', 'items': [_encode(item) for item in value]}
+    if isinstance(value, np.datetime64):
+        return {_TAG: 'datetime64', 'dtype': value.dtype.str, 'value': int(value.view(np.int64))}
+    if isinstance(value, np.ndarray) and value.dtype.kind in 'biufcmM':
+        data = np.ascontiguousarray(value)
+        return {_TAG: 'ndarray', 'dtype': data.dtype.str, 'shape': list(data.shape),
+                'data': base64.b64encode(data.tobytes()).decode('ascii')}
+    if isinstance(value, np.ndarray):
+        return {_TAG: 'array', 'items': _encode(value.tolist())}
+    if isinstance(value, np.generic):
+        return {_TAG: 'scalar', 'dtype': value.dtype.str, 'value': _encode(value.item())}
+    if isinstance(value, datetime.datetime):
+        return {_TAG: 'datetime', 'value': value.isoformat()}
+    if isinstance(value, (bytes, bytearray)):
+        return {_TAG: 'bytes', 'value': base64.b64encode(bytes(value)).decode('ascii')}
+    if isinstance(value, (set, frozenset)):
+        return {_TAG: 'set', 'items': [_encode(item) for item in value]}
+    # Tabelas colunares, mapeamentos e sequências seguem a regra do formato
+    # JSON; os demais objetos, sua representação textual
+    return _encode(json_default(value))
+
+
+def json_default(value: Any) -> Any:
+    """
+    Conversão (``default`` do ``json``) dos objetos que o JSON não serializa:
+    tabelas colunares pelos seus registros (``to_records``), mapeamentos e
+    sequências como dicionário e lista; os demais viram texto.
+
+    Args:
+        value: Objeto não serializável
+
+    Returns:
+        Valor serializável em JSON
+    """
+    if hasattr(value, 'to_records'):
+        return value.to_records()
+    if isinstance(value, Mapping):
+        return dict(value)
+    if isinstance(value, Sequence) and not isinstance(value, (str, bytes, bytearray)):
+        return list(value)
+    return str(value)
+
+
+def _decode(value: Any) -> Any:
+    """Inverte ``_encode``."""
+    if isinstance(value, list):
+        return [_decode(item) for item in value]
+    if not isinstance(value, dict):
+        return value
+    return _decode_tagged({key: _decode(item) for key, item in value.items()})
+
+
+def _decode_tagged(value: Dict[str, Any]) -> Any:
+    """
+    Restaura um dict marcado por ``_encode`` cujos itens já foram decodificados.
+
+    Serve de ``object_hook`` do ``json.loads``, que decodifica de dentro para
+    fora: a seção é restaurada durante a própria leitura do JSON.
+    """
+    tag = value.get(_TAG)
+    if tag is None:
+        return value
+    if tag == 'float':
+        return float(value['value'])
+    if tag == 'dict':
+        return {key: item for key, item in value['items']}
+    if tag == 'tuple':
+        return tuple(value['items'])
+    if tag == 'datetime64':
+        return np.array(value['value'], dtype=np.int64).view(np.dtype(value['dtype']))[()]
+    if tag == 'ndarray':
+        data = base64.b64decode(value['data'])
+        return np.frombuffer(data, dtype=np.dtype(value['dtype'])).reshape(value['shape']).copy()
+    if tag == 'array':
+        return np.array(value['items'], dtype=object)
+    if tag == 'scalar':
+        return np.dtype(value['dtype']).type(value['value'])
+    if tag == 'datetime':
+        return datetime.datetime.fromisoformat(value['value'])
+    if tag == 'bytes':
+        return base64.b64decode(value['value'])
+    if tag == 'set':
+        return set(value['items'])
+    raise ValueError(f"Unknown snapshot value tag: {tag}")
+
+
+def encode_value(value: Any) -> bytes:
+    """
+    Codifica um valor numa seção JSON.
+
+    Tipos que o JSON não representa (tuplas, arrays e escalares NumPy,
+    datas, bytes, conjuntos, chaves não textuais) são marcados e restaurados
+    por ``decode_value``; outros objetos viram texto, como no formato JSON.
+
+    Args:
+        value: Valor a codificar
+
+    Returns:
+        JSON em UTF-8
+    """
+    return json.dumps(_encode(value), separators=(',', ':')).encode('utf-8')
+
+
+def decode_value(data: bytes) -> Any:
+    """
+    Decodifica uma seção gravada por ``encode_value``.
+
+    Args:
+        data: JSON em UTF-8
+
+    Returns:
+        Valor restaurado
+    """
+    return json.loads(data.decode('utf-8'), object_hook=_decode_tagged)
+
+
+# Tipos imutáveis cujos valores servem diretamente de chave junto com o tipo
+_SCALAR_TYPES = frozenset((str, int, float, bool, type(None)))
+
+
+def _freeze(value: Any) -> Any:
+    """
+    Chave hashable de um valor para internar colunas do histórico.
+
+    O tipo faz parte da chave, para que ``1``, ``1.0`` e ``True`` não sejam
+    confundidos; valores não hashable (arrays, conjuntos) levantam TypeError.
+    """
+    kind = type(value)
+    if kind is dict:
+        key_types = tuple(map(type, value))
+        value_types = tuple(map(type, value.values()))
+        if _SCALAR_TYPES.issuperset(key_types) and _SCALAR_TYPES.issuperset(value_types):
+            return (dict, key_types, tuple(value), value_types, tuple(value.values()))
+        return (dict, tuple((_freeze(key), _freeze(item)) for key, item in value.items()))
+    if kind is list or kind is tuple:
+        return (kind, tuple(_freeze(item) for item in value))
+    hash(value)
+    return (kind, value)
+
+
+def _is_flat(value: Any) -> bool:
+    """Verifica se um valor é imutável ou um dict/lista só de valores imutáveis."""
+    if isinstance(value, (dict, list)):
+        items = value.values() if isinstance(value, dict) else value
+        return all(not isinstance(item, (dict, list, set, np.ndarray)) for item in items)
+    return not isinstance(value, (set, np.ndarray))
+
+
+def _encode_column(values: List[Any]) -> Tuple[Dict[str, Any], bytes]:
+    """
+    Codifica uma coluna do histórico.
+
+    Colunas só de int, float, bool ou ``np.datetime64`` viram arrays NumPy;
+    as demais são internadas (tabela de valores distintos + códigos uint32) ou,
+    se contiverem valores não hashable, gravadas registro a registro em JSON.
+
+    Returns:
+        Metadados da coluna e seus bytes
+    """
+    kinds = set(map(type, values))
+    if kinds == {int}:
+        try:
+            return {'kind': 'i'}, np.array(values, dtype=np.int64).tobytes()
+        except OverflowError:
+            pass
+    elif kinds == {float}:
+        return {'kind': 'f'}, np.array(values, dtype=np.float64).tobytes()
+    elif kinds == {bool}:
+        return {'kind': 'b'}, np.array(values, dtype=np.bool_).tobytes()
+    elif kinds == {np.datetime64}:
+        column = np.array(values)
+        return {'kind': 'M', 'dtype': column.dtype.str}, column.view(np.int64).tobytes()
+
+    index: Dict[Any, int] = {}
+    table = []
+    if len(kinds) == 1 and kinds <= _SCALAR_TYPES:
+        codes = [index.setdefault(value, len(index)) for value in values]
+        return {'kind': 't', 'table': list(index)}, np.array(codes, dtype=np.uint32).tobytes()
+    try:
+        codes = []
+        for value in values:
+            key = _freeze(value)
+            code = index.get(key)
+            if code is None:
+                code = index[key] = len(table)
+                table.append(value)
+            codes.append(code)
+    except TypeError:
+        return {'kind': 'j'}, encode_value(values)
+    return {'kind': 't', 'table': table}, np.array(codes, dtype=np.uint32).tobytes()
+
+
+def _decode_column(meta: Dict[str, Any], data: bytes) -> List[Any]:
+    """Inverte ``_encode_column``, devolvendo a coluna como lista."""
+    kind = meta['kind']
+    if kind == 'i':
+        return np.frombuffer(data, dtype=np.int64).tolist()
+    if kind == 'f':
+        return np.frombuffer(data, dtype=np.float64).tolist()
+    if kind == 'b':
+        return np.frombuffer(data, dtype=np.bool_).tolist()
+    if kind == 'M':
+        return list(np.frombuffer(data, dtype=np.int64).view(np.dtype(meta['dtype'])))
+    if kind == 'j':
+        return decode_value(data)
+
+    table = meta['table']
+    codes = np.frombuffer(data, dtype=np.uint32).tolist()
+    if all(not isinstance(value, (dict, list, set, np.ndarray)) for value in table):
+        return [table[code] for code in codes]
+    # Valores mutáveis são copiados para que os registros não compartilhem objetos
+    copies = [value.copy if _is_flat(value) else
+              (lambda encoded=_encode(value): _decode(encoded)) for value in table]
+    return [copies[code]() for code in codes]
+
+
+def encode_history(history: List[Dict[str, Any]]) -> Dict[str, bytes]:
+    """
+    Codifica o histórico em colunas.
+
+    Timestamps ``np.datetime64`` viram um array int64 (com a unidade guardada
+    nos metadados) e as operações viram códigos uint16 de uma tabela. Os
+    parâmetros são agrupados por esquema (operação + chaves) e cada chave vira
+    uma coluna: numérica quando possível, internada nos demais casos.
+
+    Args:
+        history: Histórico de operações da engine
+
+    Returns:
+        Seções binárias do histórico
+    """
+    op_index: Dict[str, int] = {}
+    schema_index: Dict[Tuple[str, Any], int] = {}
+    schemas = []
+    rows: List[List[List[Any]]] = []
+    op_codes = []
+    schema_codes = []
+
+    for entry in history:
+        operation = entry['operation']
+        op_code = op_index.setdefault(operation, len(op_index))
+        params = entry['params']
+        keys = tuple(params) if type(params) is dict else None
+        schema_code = schema_index.get((operation, keys))
+        if schema_code is None:
+            schema_code = schema_index[(operation, keys)] = len(schemas)
+            schemas.append({'keys': list(keys) if keys is not None else None})
+            rows.append([])
+        rows[schema_code].append(list(params.values()) if keys is not None else [params])
+        op_codes.append(op_code)
+        schema_codes.append(schema_code)
+
+    sections = {}
+    for code, (schema, schema_rows) in enumerate(zip(schemas, rows)):
+        schema['columns'] = []
+        for position, column in enumerate(zip(*schema_rows)):
+            column_meta, sections[f'hist_c{code}_{position}'] = _encode_column(list(column))
+            schema['columns'].append(column_meta)
+
+    timestamp_meta, sections['hist_ts'] = _encode_column([entry['timestamp'] for entry in history])
+    sections['hist_meta'] = encode_value({
+        'op_table': list(op_index),
+        'schemas': schemas,
+        'length': len(history),
+        'timestamps': timestamp_meta
+    })
+    sections['hist_op'] = np.array(op_codes, dtype=np.uint16).tobytes()
+    sections['hist_schema'] = np.array(schema_codes, dtype=np.uint32).tobytes()
+    return sections
+
+
+class HistoryTable(MutableSequence):
+    """
+    Histórico restaurado de um snapshot, em formato colunar.
+
+    Operações, timestamps e parâmetros ficam nas colunas lidas do arquivo (as
+    de parâmetros são decodificadas por esquema, no primeiro acesso a um
+    registro do esquema); o dicionário de cada registro só é montado (e
+    guardado) quando é acessado. Registros acrescentados ficam numa lista.
+    """
+
+    def __init__(self, meta: Dict[str, Any], sections: Dict[str, bytes]):
+        """
+        Inicializa a tabela.
+
+        Args:
+            meta: Metadados do histórico (seção 'hist_meta')
+            sections: Seções lidas do snapshot
+        """
+        self._op_table = meta['op_table']
+        self._op_codes = np.frombuffer(sections['hist_op'], dtype=np.uint16)
+        self._schema_codes = np.frombuffer(sections['hist_schema'], dtype=np.uint32)
+        self._schemas = meta['schemas']
+        self._column_data = {
+            code: [sections[f'hist_c{code}_{position}'] for position in range(len(schema['columns']))]
+            for code, schema in enumerate(self._schemas)
+        }
+        self._timestamp_meta = meta['timestamps']
+        self._timestamp_data = sections['hist_ts']
+        self._timestamps = None
+        self._ranks: Optional[np.ndarray] = None
+        self._columns: Dict[int, List[List[Any]]] = {}
+        self._entries: List[Optional[Dict[str, Any]]] = [None] * meta['length']
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        entry = self._entries[index]
+        if entry is None:
+            if index < 0:
+                index += len(self)
+            entry = self._entries[index] = self._build(index)
+        return entry
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            self._materialize()
+        self._entries[index] = value
+
+    def __delitem__(self, index):
+        self._materialize()
+        del self._entries[index]
+
+    def insert(self, index: int, value: Dict[str, Any]) -> None:
+        if index < len(self):
+            self._materialize()
+        self._entries.insert(index, value)
+
+    def __eq__(self, other):
+        if isinstance(other, HistoryTable):
+            other = list(other)
+        return list(self) == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"HistoryTable({len(self)} entries)"
+
+    def _materialize(self) -> None:
+        """Monta todos os registros pendentes (antes de deslocar posições)."""
+        for index in range(len(self)):
+            self[index]
+
+    def _build(self, index: int) -> Dict[str, Any]:
+        """Monta o dicionário de um registro a partir das colunas."""
+        if self._ranks is None:
+            # Posição de cada registro dentro das colunas do seu esquema
+            codes = self._schema_codes
+            counts = np.bincount(codes, minlength=len(self._schemas))
+            ranks = np.empty(len(codes), dtype=np.int64)
+            ranks[np.argsort(codes, kind='stable')] = \
+                np.arange(len(codes)) - np.repeat(np.cumsum(counts) - counts, counts)
+            self._ranks = ranks
+        if self._timestamps is None:
+            meta = self._timestamp_meta
+            if meta['kind'] == 'M':
+                self._timestamps = np.frombuffer(self._timestamp_data, dtype=np.int64).view(np.dtype(meta['dtype']))
+            else:
+                self._timestamps = _decode_column(meta, self._timestamp_data)
+
+        code = int(self._schema_codes[index])
+        columns = self._columns.get(code)
+        if columns is None:
+            columns = self._columns[code] = [
+                _decode_column(column_meta, data)
+                for column_meta, data in zip(self._schemas[code]['columns'], self._column_data.pop(code))
+            ]
+        rank = self._ranks[index]
+        keys = self._schemas[code]['keys']
+        if keys is None:
+            params = columns[0][rank]
+        else:
+            params = dict(zip(keys, [column[rank] for column in columns]))
+        return {
+            'operation': self._op_table[self._op_codes[index]],
+            'timestamp': self._timestamps[index],
+            'params': params
+        }
+
+
+def decode_history(sections: Dict[str, bytes]) -> List[Dict[str, Any]]:
+    """
+    Restaura o histórico a partir das seções colunares.
+
+    Snapshots da versão 3 devolvem uma ``HistoryTable``: a carga não monta
+    nenhum registro, apenas mapeia as colunas.
+
+    Args:
+        sections: Seções lidas do snapshot
+
+    Returns:
+        Histórico de operações
+    """
+    meta = decode_value(sections['hist_meta'])
+    if 'hist_params' in sections:
+        return _decode_history_v2(meta, sections)
+    return HistoryTable(meta, sections)
+
+
+def _decode_history_v2(meta: Dict[str, Any], sections: Dict[str, bytes]) -> List[Dict[str, Any]]:
+    """Lê o histórico da versão 2 (parâmetros gravados registro a registro)."""
+    op_table = meta['op_table']
+    codes = np.frombuffer(sections['hist_op'], dtype=np.uint16).tolist()
+    extra = decode_value(sections['hist_params'])
+
+    if meta['timestamp_dtype'] is not None:
+        dtype = np.dtype(meta['timestamp_dtype'])
+        timestamps = list(np.frombuffer(sections['hist_ts'], dtype=np.int64).view(dtype))
+        params = extra
+    else:
+        params = [item[0] for item in extra]
+        timestamps = [item[1] for item in extra]
+
+    return [
+        {'operation': op_table[code], 'timestamp': timestamp, 'params': entry_params}
+        for code, timestamp, entry_params in zip(codes, timestamps, params)
+    ]
+
+
+def write_snapshot(filepath: str, sections: Dict[str, bytes], compression: str = 'zlib') -> None:
+    """
+    Grava seções binárias num arquivo de snapshot versionado.
+
+    Args:
+        filepath: Caminho do arquivo
+        sections: Seções (nome -> bytes)
+        compression: Codec de compressão (ver ``available_codecs``)
+    """
+    compress, _ = _get_codec(compression)
+    body = []
+    for name, data in sections.items():
+        encoded_name = name.encode('ascii')
+        body.append(bytes([len(encoded_name)]) + encoded_name)
+        body.append(_SECTION_LENGTH.pack(len(data)))
+        body.append(data)
+
+    with open(filepath, 'wb') as f:
+        f.write(_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, CODECS[compression][0], 0))
+        f.write(compress(b''.join(body)))
+
+
+def read_snapshot(filepath: str) -> Tuple[int, Dict[str, bytes]]:
+    """
+    Lê um arquivo de snapshot.
+
+    Args:
+        filepath: Caminho do arquivo
+
+    Returns:
+        Versão do formato e seções (nome -> bytes)
+    """
+    with open(filepath, 'rb') as f:
+        data = f.read()
+
+    magic, version, codec_id, _ = _HEADER.unpack_from(data)
+    if magic != SNAPSHOT_MAGIC:
+        raise ValueError(f"{filepath} is not a JALS snapshot")
+    if not _MIN_SNAPSHOT_VERSION <= version <= SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported snapshot version: {version}")
+    if codec_id not in _CODEC_NAMES:
+        raise ValueError(f"Unknown snapshot compression id: {codec_id}")
+
+    _, decompress = _get_codec(_CODEC_NAMES[codec_id])
+    body = memoryview(decompress(data[_HEADER.size:]))
+
+    sections = {}
+    offset = 0
+    while offset < len(body):
+        name_length = body[offset]
+        name = bytes(body[offset + 1:offset + 1 + name_length]).decode('ascii')
+        offset += 1 + name_length
+        (length,) = _SECTION_LENGTH.unpack_from(body, offset)
+        offset += _SECTION_LENGTH.size
+        sections[name] = bytes(body[offset:offset + length])
+        offset += length
+
+    return version, sections
+
+
+def class_path(obj: Any) -> str:
+    """Retorna o caminho importável ``modulo:Classe`` da classe de um objeto."""
+    cls = type(obj)
+    return f"{cls.__module__}:{cls.__qualname__}"
+
+
+def register_class(cls: type) -> type:
+    """
+    Autoriza uma classe a ser recriada a partir de snapshots.
+
+    Args:
+        cls: Classe a registrar
+
+    Returns:
+        A própria classe (pode ser usada como decorador)
+    """
+    _REGISTERED_CLASSES[f"{cls.__module__}:{cls.__qualname__}"] = cls
+    return cls
+
+
+def import_class(path: str) -> type:
+    """
+    Retorna a classe registrada em ``modulo:Classe``.
+
+    Nenhum módulo é importado: apenas classes previamente registradas com
+    ``register_class`` podem ser recriadas a partir de um snapshot.
+
+    Args:
+        path: Caminho gravado por ``class_path``
+
+    Returns:
+        Classe registrada
+    """
+    if path not in _REGISTERED_CLASSES:
+        raise ValueError(f"Class {path!r} is not registered for snapshot restore")
+    return _REGISTERED_CLASSES[path]
@@ -0,0 +1,193 @@
+import os
+import json
+import random
+import threading
+import time
+import functools
+from contextvars import ContextVar
+from typing import Dict, Any, List, Optional, Callable
+
+# Formato de saída: spans Zipkin v2 em JSON, um por linha (NDJSON), prontos para
+# ``POST /api/v2/spans`` ou para inspeção local.
+SERVICE_NAME = 'jals'
+
+# Marca de contexto para requisições não amostradas: as chamadas aninhadas
+# herdam a decisão da raiz (amostragem head-based) sem criar spans.
+_UNSAMPLED = object()
+
+_current_span: ContextVar[Any] = ContextVar('jals_current_span', default=None)
+
+
+class Span:
+    """Span em andamento (formato Zipkin v2)."""
+
+    __slots__ = ('trace_id', 'id', 'parent_id', 'name', 'start', 'tags')
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str] = None):
+        self.trace_id = trace_id
+        self.id = '%016x' % random.getrandbits(64)
+        self.parent_id = parent_id
+        self.name = name
+        self.start = time.time()
+        self.tags: Dict[str, str] = {}
+
+    def to_zipkin(self, duration: float) -> Dict[str, Any]:
+        """
+        Converte o span para o modelo Zipkin v2.
+
+        Args:
+            duration: Duração em segundos
+
+        Returns:
+            Span serializável
+        """
+        span = {
+            'traceId': self.trace_id,
+            'id': self.id,
+            'name': self.name,
+            'timestamp': int(self.start * 1e6),
+            'duration': max(int(duration * 1e6), 1),
+            'localEndpoint': {'serviceName': SERVICE_NAME}
+        }
+        if self.parent_id is not None:
+            span['parentId'] = self.parent_id
+        if self.tags:
+            span['tags'] = self.tags
+        return span
+
+
+class Tracer:
+    """
+    Tracer local com amostragem head-based.
+
+    A decisão de amostragem é tomada na raiz de cada requisição e propagada às
+    chamadas aninhadas via ``contextvars``. Requisições não amostradas não
+    criam spans; com o tracer desativado o custo é uma única verificação.
+    Os spans de cada trace são gravados juntos quando a raiz termina.
+    """
+
+    def __init__(self, filepath: Optional[str] = None, sample_rate: float = 0.1):
+        """
+        Inicializa o tracer.
+
+        Args:
+            filepath: Arquivo NDJSON de saída (tracing desativado se None)
+            sample_rate: Fração de requisições amostradas (0-1)
+        """
+        self._lock = threading.Lock()
+        self._pending: Dict[str, List[Dict[str, Any]]] = {}
+        self.spans_recorded = 0
+        self.configure(filepath, sample_rate)
+
+    def configure(self, filepath: Optional[str] = None, sample_rate: float = 0.1) -> None:
+        """
+        Reconfigura o destino e a taxa de amostragem.
+
+        Args:
+            filepath: Arquivo NDJSON de saída (tracing desativado se None)
+            sample_rate: Fração de requisições amostradas (0-1)
+        """
+        if not 0.0 <= sample_rate <= 1.0:
+            raise ValueError(f"sample_rate must be between 0 and 1, got {sample_rate}")
+        self.filepath = filepath
+        self.sample_rate = sample_rate
+        self.enabled = filepath is not None and sample_rate > 0
+
+    def get_config(self) -> Dict[str, Any]:
+        """Retorna a configuração efetiva do tracer."""
+        return {
+            'system': 'local',
+            'format': 'zipkin_v2_ndjson',
+            'enabled': self.enabled,
+            'sampling': 'head_based',
+            'sampling_rate': self.sample_rate,
+            'output': self.filepath,
+            'spans_recorded': self.spans_recorded
+        }
+
+    def traced(self, name: str) -> Callable:
+        """Decorador que envolve uma função num span."""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+
+                parent = _current_span.get()
+                if parent is _UNSAMPLED:
+                    return func(*args, **kwargs)
+                if parent is None:
+                    if random.random() >= self.sample_rate:
+                        token = _current_span.set(_UNSAMPLED)
+                        try:
+                            return func(*args, **kwargs)
+                        finally:
+                            _current_span.reset(token)
+                    span = Span(name, '%032x' % random.getrandbits(128))
+                else:
+                    span = Span(name, parent.trace_id, parent.id)
+
+                token = _current_span.set(span)
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                except BaseException as error:
+                    span.tags['error'] = f"{type(error).__name__}: {error}"
+                    raise
+                finally:
+                    _current_span.reset(token)
+                    self._finish(span, time.perf_counter() - start, root=parent is None)
+            return wrapper
+        return decorator
+
+    def flush(self) -> None:
+        """Grava spans de traces ainda abertos (por exemplo em threads sem raiz)."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        for spans in pending.values():
+            self._write(spans)
+
+    def _finish(self, span: Span, duration: float, root: bool) -> None:
+        """Registra um span encerrado e grava o trace quando a raiz termina."""
+        record = span.to_zipkin(duration)
+        with self._lock:
+            spans = self._pending.setdefault(span.trace_id, [])
+            spans.append(record)
+            if not root:
+                return
+            del self._pending[span.trace_id]
+        self._write(spans)
+
+    def _write(self, spans: List[Dict[str, Any]]) -> None:
+        """Acrescenta spans ao arquivo de saída."""
+        lines = ''.join(json.dumps(span, separators=(',', ':')) + '\n' for span in spans)
+        with self._lock:
+            with open(self.filepath, 'a') as f:
+                f.write(lines)
+            self.spans_recorded += len(spans)
+
+
+def set_tag(key: str, value: Any) -> None:
+    """Adiciona uma tag ao span corrente, se a requisição estiver sendo amostrada."""
+    span = _current_span.get()
+    if span is not None and span is not _UNSAMPLED:
+        span.tags[key] = str(value)
+
+
+def _default_sample_rate() -> float:
+    """Lê a taxa de amostragem de ``JALS_TRACE_SAMPLE_RATE`` (padrão 0.1)."""
+    return float(os.environ.get('JALS_TRACE_SAMPLE_RATE', 0.1))
+
+
+# Tracer padrão do processo, ativado por ``JALS_TRACE_FILE`` ou ``configure``
+default_tracer = Tracer(os.environ.get('JALS_TRACE_FILE'), _default_sample_rate())
+
+
+def configure(filepath: Optional[str] = None, sample_rate: float = 0.1) -> None:
+    """Configura o tracer padrão."""
+    default_tracer.configure(filepath, sample_rate)
+
+
+def traced(name: str) -> Callable:
+    """Decorador que envolve a função num span do tracer padrão."""
+    return default_tracer.traced(name)
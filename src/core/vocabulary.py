@@ -0,0 +1,177 @@
+import numpy as np
+from typing import Dict, List, Optional, Iterable
+import hashlib
+import os
+import struct
+
+# Formato: cabeçalho | hashes (u64, ordenados) | ids (i32, na ordem dos hashes)
+# | offsets (i64, por id, count + 1) | textos UTF-8 concatenados.
+VOCABULARY_MAGIC = b'JALSVOCB'
+VOCABULARY_VERSION = 1
+_HEADER = struct.Struct('<8sIIQQ')
+
+
+def signature_hash(signature: str) -> int:
+    """Hash estável de 64 bits de uma assinatura (igual em todos os processos)."""
+    return int.from_bytes(hashlib.blake2b(signature.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+def _aligned(offset: int, alignment: int = 8) -> int:
+    """Arredonda um offset para o próximo múltiplo de ``alignment``."""
+    return (offset + alignment - 1) // alignment * alignment
+
+
+class TokenVocabulary:
+    """
+    Vocabulário persistente que mapeia assinaturas de símbolos para ids int32
+    densos.
+
+    A parte persistida é lida por ``np.memmap`` (compartilhável entre
+    processos, sem cópia) e consultada em lote por ``np.searchsorted`` sobre
+    os hashes ordenados; assinaturas novas ficam num dicionário em memória até
+    o próximo ``save``.
+    """
+
+    def __init__(self):
+        """Inicializa um vocabulário vazio."""
+        self._hashes = np.empty(0, dtype=np.uint64)
+        self._hash_ids = np.empty(0, dtype=np.int32)
+        self._offsets = np.zeros(1, dtype=np.int64)
+        self._blob = b''
+        self._added: Dict[str, int] = {}
+        self._added_signatures: List[str] = []
+        self.path: Optional[str] = None
+
+    def __len__(self) -> int:
+        return self._base_size + len(self._added_signatures)
+
+    @property
+    def _base_size(self) -> int:
+        return len(self._offsets) - 1
+
+    def encode(self, signatures: Iterable[str], add: bool = True) -> np.ndarray:
+        """
+        Converte assinaturas em ids.
+
+        Args:
+            signatures: Assinaturas dos símbolos
+            add: Se assinaturas desconhecidas recebem novos ids (senão, -1)
+
+        Returns:
+            Array int32 de ids
+        """
+        signatures = list(signatures)
+        ids = np.full(len(signatures), -1, dtype=np.int32)
+        if not signatures:
+            return ids
+
+        if self._base_size:
+            hashes = np.fromiter((signature_hash(s) for s in signatures), dtype=np.uint64, count=len(signatures))
+            positions = np.searchsorted(self._hashes, hashes)
+            positions[positions == len(self._hashes)] = 0
+            found = self._hashes[positions] == hashes
+            ids[found] = self._hash_ids[positions[found]]
+
+        for index in np.flatnonzero(ids < 0):
+            signature = signatures[index]
+            token_id = self._added.get(signature)
+            if token_id is None and add:
+                token_id = self._add(signature)
+            if token_id is not None:
+                ids[index] = token_id
+        return ids
+
+    def decode(self, ids: Iterable[int]) -> List[str]:
+        """
+        Converte ids em assinaturas.
+
+        Args:
+            ids: Ids de tokens
+
+        Returns:
+            Assinaturas correspondentes
+        """
+        base_size = self._base_size
+        signatures = []
+        for token_id in np.asarray(ids, dtype=np.int64).tolist():
+            if token_id < 0 or token_id >= len(self):
+                raise ValueError(f"Unknown token id: {token_id}")
+            if token_id < base_size:
+                start, end = self._offsets[token_id], self._offsets[token_id + 1]
+                signatures.append(bytes(self._blob[start:end]).decode('utf-8'))
+            else:
+                signatures.append(self._added_signatures[token_id - base_size])
+        return signatures
+
+    def save(self, filepath: str) -> None:
+        """
+        Grava o vocabulário completo (escrita atômica).
+
+        Args:
+            filepath: Caminho do arquivo
+        """
+        signatures = self.decode(range(len(self)))
+        encoded = [signature.encode('utf-8') for signature in signatures]
+        hashes = np.fromiter((signature_hash(s) for s in signatures), dtype=np.uint64, count=len(signatures))
+        order = np.argsort(hashes, kind='stable')
+        if len(hashes) > 1 and (np.diff(hashes[order]) == 0).any():
+            raise ValueError("Token signature hash collision")
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(item) for item in encoded])
+
+        temporary = f"{filepath}.tmp"
+        with open(temporary, 'wb') as f:
+            f.write(_HEADER.pack(VOCABULARY_MAGIC, VOCABULARY_VERSION, 0, len(encoded), int(offsets[-1])))
+            f.write(hashes[order].tobytes())
+            ids = order.astype(np.int32).tobytes()
+            f.write(ids + b'\0' * (_aligned(len(ids)) - len(ids)))
+            f.write(offsets.tobytes())
+            f.write(b''.join(encoded))
+        os.replace(temporary, filepath)
+
+    @classmethod
+    def load(cls, filepath: str, mmap: bool = True) -> 'TokenVocabulary':
+        """
+        Carrega um vocabulário salvo.
+
+        Args:
+            filepath: Caminho do arquivo
+            mmap: Se os arrays são mapeados em memória (somente leitura)
+
+        Returns:
+            Vocabulário carregado
+        """
+        with open(filepath, 'rb') as f:
+            magic, version, _, count, blob_size = _HEADER.unpack(f.read(_HEADER.size))
+        if magic != VOCABULARY_MAGIC:
+            raise ValueError(f"{filepath} is not a JALS vocabulary")
+        if version > VOCABULARY_VERSION:
+            raise ValueError(f"Unsupported vocabulary version: {version}")
+
+        def array(offset, dtype, length):
+            if length == 0:
+                return np.empty(0, dtype=dtype)
+            if mmap:
+                return np.memmap(filepath, dtype=dtype, mode='r', offset=offset, shape=(length,))
+            return np.fromfile(filepath, dtype=dtype, count=length, offset=offset)
+
+        offset = _HEADER.size
+        vocabulary = cls()
+        vocabulary._hashes = array(offset, np.uint64, count)
+        offset += 8 * count
+        vocabulary._hash_ids = array(offset, np.int32, count)
+        offset += _aligned(4 * count)
+        vocabulary._offsets = array(offset, np.int64, count + 1)
+        offset += 8 * (count + 1)
+        vocabulary._blob = array(offset, np.uint8, blob_size)
+        vocabulary.path = filepath
+        return vocabulary
+
+    def _add(self, signature: str) -> int:
+        """Atribui o próximo id a uma assinatura nova."""
+        token_id = len(self)
+        if token_id > np.iinfo(np.int32).max:
+            raise ValueError("Token vocabulary is full")
+        self._added[signature] = token_id
+        self._added_signatures.append(signature)
+        return token_id
@@ -2,9 +2,29 @@
 JALS System Layers - Implementação das quatro camadas do sistema JALS.
 """
 
-from .layer1 import Layer1
-from .layer2 import Layer2
-from .layer3 import Layer3
-from .layer4 import Layer4
+import importlib
 
-__all__ = ["Layer1", "Layer2", "Layer3", "Layer4"]
\ No newline at end of file
+_LAZY_ATTRIBUTES = {
+    "Layer1": ".layer1",
+    "Layer2": ".layer2",
+    "Layer3": ".layer3",
+    "Layer4": ".layer4",
+    "ManuscriptDeduplicator": ".dedup",
+    "FeatureTable": ".feature_table",
+    "SymbolLibrary": ".symbol_library"
+}
+
+__all__ = ["Layer1", "Layer2", "Layer3", "Layer4", "ManuscriptDeduplicator", "FeatureTable", "SymbolLibrary"]
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        module = importlib.import_module(_LAZY_ATTRIBUTES[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,209 @@
+import numpy as np
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+import json
+import struct
+import zlib
+
+# Formato: MAGIC | versão (u16) | nº de membros (u16) | tamanho dos metadados (u32) |
+# índice | metadados JSON | membros. Cada entrada do índice é binária (nome,
+# codec, papel, dtype e escala dos pesos, offset, tamanho armazenado), de modo
+# que a abertura não interpreta JSON nem percorre o arquivo: documentos e
+# pesos, lidos na inicialização, ficam sem compressão, com os pesos alinhados
+# para leitura sem cópia; os demais membros (código) são comprimidos e só
+# descomprimidos no primeiro acesso.
+ARTIFACT_MAGIC = b'JALSPKG\x00'
+ARTIFACT_VERSION = 1
+_HEADER = struct.Struct('<8sHHI')
+_INDEX_ENTRY = struct.Struct('<32sBB6x8sdQQ')
+_ALIGNMENT = 8
+
+ARTIFACT_CODECS = ('none', 'zlib')
+_CODEC_IDS = {name: codec_id for codec_id, name in enumerate(ARTIFACT_CODECS)}
+
+# Membros menores que isto são gravados sem compressão mesmo com codec 'zlib':
+# o custo fixo do deflate/inflate supera a economia
+_MIN_COMPRESSED_SIZE = 512
+
+# Papel de cada membro: carregado sob demanda, documento JSON ou pesos
+_ROLE_MEMBER, _ROLE_DOCUMENT, _ROLE_WEIGHTS = range(3)
+
+
+def _compress(data: bytes, codec: str, level: int) -> bytes:
+    """Comprime os bytes de um membro."""
+    if codec == 'none':
+        return data
+    if codec == 'zlib':
+        # Janela do tamanho do membro: o custo de inicialização do deflate
+        # domina membros pequenos, e a descompressão aceita qualquer janela
+        window_bits = min(zlib.MAX_WBITS, max(9, (len(data) - 1).bit_length()))
+        return zlib.compress(data, level, window_bits)
+    raise ValueError(f"Unsupported artifact codec: {codec}")
+
+
+def _decompress(data: bytes, codec: str) -> bytes:
+    """Descomprime os bytes de um membro."""
+    if codec == 'none':
+        return data
+    if codec == 'zlib':
+        return zlib.decompress(data)
+    raise ValueError(f"Unsupported artifact codec: {codec}")
+
+
+def pack_artifact(members: Dict[str, Tuple[bytes, str]],
+                  documents: Iterable[str] = (),
+                  weights: Optional[Tuple[str, str, float]] = None,
+                  metadata: Optional[Dict[str, Any]] = None,
+                  level: int = 6) -> bytes:
+    """
+    Monta um artefato a partir dos seus membros.
+
+    Args:
+        members: Membros (nome -> (bytes, codec)); codec 'none' ou 'zlib'
+        documents: Membros JSON interpretados por ``load_artifact``
+        weights: (membro, dtype, escala) dos pesos quantizados
+        metadata: Metadados do artefato (devem ser serializáveis em JSON)
+        level: Nível de compressão do zlib
+
+    Returns:
+        Bytes do artefato
+    """
+    documents = set(documents)
+    weights_member, weights_dtype, weights_scale = weights or (None, '', 1.0)
+    index = []
+    payload = []
+    offset = 0
+    for name, (content, codec) in members.items():
+        encoded_name = name.encode('utf-8')
+        if len(encoded_name) > 32:
+            raise ValueError(f"Artifact member name too long: {name}")
+        if codec not in _CODEC_IDS:
+            raise ValueError(f"Unsupported artifact codec: {codec}")
+        if name == weights_member:
+            role, dtype, scale = _ROLE_WEIGHTS, weights_dtype.encode('ascii'), weights_scale
+        else:
+            role, dtype, scale = (_ROLE_DOCUMENT if name in documents else _ROLE_MEMBER), b'', 1.0
+        if len(content) < _MIN_COMPRESSED_SIZE:
+            codec = 'none'
+        stored = _compress(content, codec, level)
+        padding = -offset % _ALIGNMENT
+        payload.append(b'\0' * padding)
+        offset += padding
+        index.append(_INDEX_ENTRY.pack(encoded_name, _CODEC_IDS[codec], role, dtype, scale,
+                                       offset, len(stored)))
+        payload.append(stored)
+        offset += len(stored)
+
+    encoded_metadata = json.dumps(metadata or {}, separators=(',', ':')).encode('utf-8')
+    # O início dos membros é alinhado para permitir leitura sem cópia dos pesos
+    encoded_metadata += b' ' * (-(_HEADER.size + len(encoded_metadata)) % _ALIGNMENT)
+    header = _HEADER.pack(ARTIFACT_MAGIC, ARTIFACT_VERSION, len(index), len(encoded_metadata))
+    return b''.join([header] + index + [encoded_metadata] + payload)
+
+
+class ArtifactReader:
+    """
+    Leitura de um artefato: apenas o cabeçalho e o índice são decodificados na
+    abertura; os metadados e cada membro são lidos (e descomprimidos) quando
+    solicitados, sem cópia para membros não comprimidos.
+    """
+
+    def __init__(self, data: bytes):
+        """
+        Abre um artefato.
+
+        Args:
+            data: Bytes do artefato
+        """
+        magic, version, count, metadata_length = _HEADER.unpack_from(data)
+        if magic != ARTIFACT_MAGIC:
+            raise ValueError("Not a JALS artifact")
+        if version != ARTIFACT_VERSION:
+            raise ValueError(f"Unsupported artifact version: {version}")
+
+        view = memoryview(data)
+        index_end = _HEADER.size + count * _INDEX_ENTRY.size
+        payload_start = index_end + metadata_length
+        self.members = {}
+        self.documents = []
+        self.weights = None
+        for name, codec_id, role, dtype, scale, offset, length in \
+                _INDEX_ENTRY.iter_unpack(view[_HEADER.size:index_end]):
+            name = name.rstrip(b'\0').decode('utf-8')
+            self.members[name] = (ARTIFACT_CODECS[codec_id], offset, length)
+            if role == _ROLE_DOCUMENT:
+                self.documents.append(name)
+            elif role == _ROLE_WEIGHTS:
+                self.weights = (name, dtype.rstrip(b'\0').decode('ascii'), scale)
+        self._metadata = view[index_end:payload_start]
+        self._view = view[payload_start:]
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        """Metadados do artefato."""
+        return json.loads(str(self._metadata, 'utf-8'))
+
+    @property
+    def names(self) -> List[str]:
+        """Nomes dos membros."""
+        return list(self.members)
+
+    def read_bytes(self, name: str) -> bytes:
+        """Conteúdo de um membro (descomprimido)."""
+        codec, offset, length = self.members[name]
+        stored = self._view[offset:offset + length]
+        return _decompress(stored, codec) if codec != 'none' else stored
+
+    def read_text(self, name: str) -> str:
+        """Conteúdo textual (UTF-8) de um membro."""
+        return str(self.read_bytes(name), 'utf-8')
+
+    def read_json(self, name: str) -> Any:
+        """Documento JSON de um membro."""
+        return json.loads(self.read_text(name))
+
+    def read_array(self, name: str, dtype: str) -> np.ndarray:
+        """Array NumPy de um membro (sem cópia se o membro não for comprimido)."""
+        return np.frombuffer(self.read_bytes(name), dtype=dtype)
+
+
+def load_artifact(data: bytes) -> Dict[str, Any]:
+    """
+    Carga de inicialização de um artefato: índice, documentos JSON e pesos
+    dequantizados; o código fica no leitor e é descomprimido sob demanda.
+
+    Args:
+        data: Bytes do artefato
+
+    Returns:
+        'reader' (``ArtifactReader``), 'documents' e 'weights' (float64)
+    """
+    reader = ArtifactReader(data)
+    weights = None
+    if reader.weights is not None:
+        name, dtype, scale = reader.weights
+        weights = np.multiply(reader.read_array(name, dtype), scale, dtype=np.float64)
+    return {
+        'reader': reader,
+        'documents': {name: reader.read_json(name) for name in reader.documents},
+        'weights': weights
+    }
+
+
+def load_raw_package(files: Dict[str, bytes], weights: bytes) -> Dict[str, Any]:
+    """
+    Carga do pacote não otimizado: todos os arquivos decodificados, documentos
+    JSON interpretados e pesos float64.
+
+    Args:
+        files: Arquivos do pacote (nome -> bytes)
+        weights: Pesos float64
+
+    Returns:
+        'files', 'documents' e 'weights'
+    """
+    texts = {name: content.decode('utf-8') for name, content in files.items()}
+    return {
+        'files': texts,
+        'documents': {name: json.loads(text) for name, text in texts.items() if name.endswith('.json')},
+        'weights': np.frombuffer(weights, dtype=np.float64)
+    }
@@ -0,0 +1,270 @@
+import numpy as np
+from typing import Dict, Any, List, Optional, Tuple
+from collections import defaultdict
+import os
+import struct
+
+# Arquivo de assinaturas (somente acréscimos): cabeçalho seguido de registros
+# ``tamanho do nome (u16) | nome UTF-8 | assinatura (u32 x num_perm)``.
+SIGNATURES_MAGIC = b'JALSMHSH'
+SIGNATURES_VERSION = 1
+_HEADER = struct.Struct('<8sIIII')
+_NAME_LENGTH = struct.Struct('<H')
+
+
+def _splitmix64(values: np.ndarray) -> np.ndarray:
+    """Mistura de bits splitmix64, vetorizada (aritmética módulo 2**64)."""
+    with np.errstate(over='ignore'):
+        z = values.astype(np.uint64) + np.uint64(0x9E3779B97F4A7C15)
+        z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        return z ^ (z >> np.uint64(31))
+
+
+def _hash_rows(rows: np.ndarray) -> np.ndarray:
+    """Hash de 64 bits de cada linha de uma matriz de inteiros."""
+    hashes = np.zeros(len(rows), dtype=np.uint64)
+    for column in rows.T:
+        hashes = _splitmix64(hashes ^ column.astype(np.int64).view(np.uint64))
+    return hashes
+
+
+def stroke_shingles(strokes: List[Dict[str, Any]]) -> np.ndarray:
+    """
+    Converte traços em shingles: hashes de características quantizadas de
+    cada traço (unigramas) e de pares de traços consecutivos (bigramas).
+
+    A quantização (comprimento em escala log, direção em 16 setores, giro
+    total, fechamento, número de pontos e posição numa grade 8x8 relativa ao
+    manuscrito) torna os shingles estáveis a pequenos ruídos de captura.
+
+    Args:
+        strokes: Traços com 'points'
+
+    Returns:
+        Array uint64 de shingles distintos
+    """
+    point_sets = [np.asarray(stroke.get('points', []), dtype=float).reshape(-1, 2) for stroke in strokes]
+    point_sets = [points for points in point_sets if len(points)]
+    if not point_sets:
+        return np.empty(0, dtype=np.uint64)
+
+    all_points = np.concatenate(point_sets)
+    origin = all_points.min(axis=0)
+    extent = np.maximum(all_points.max(axis=0) - origin, 1e-9)
+
+    rows = []
+    for points in point_sets:
+        segments = np.diff(points, axis=0)
+        length = float(np.hypot(segments[:, 0], segments[:, 1]).sum())
+        displacement = points[-1] - points[0]
+        if np.hypot(*displacement) > 1e-9:
+            sector = int(np.floor((np.arctan2(displacement[1], displacement[0]) + np.pi) / (2 * np.pi) * 16)) % 16
+        else:
+            sector = 16
+        headings = np.arctan2(segments[:, 1], segments[:, 0])
+        turning = float(np.abs(np.angle(np.exp(1j * np.diff(headings)))).sum()) if len(segments) > 1 else 0.0
+        closed = len(points) >= 3 and np.hypot(*displacement) < 0.1
+        cell = np.minimum(((points.mean(axis=0) - origin) / extent * 8).astype(int), 7)
+        rows.append([
+            int(round(2 * np.log2(1 + length))),
+            sector,
+            min(int(round(turning / (np.pi / 4))), 15),
+            int(closed),
+            int(round(np.log2(len(points) + 1))),
+            int(cell[0]),
+            int(cell[1])
+        ])
+
+    unigrams = _hash_rows(np.array(rows, dtype=np.int64))
+    bigrams = _hash_rows(np.stack([unigrams[:-1], unigrams[1:]], axis=1).view(np.int64)) if len(unigrams) > 1 else unigrams[:0]
+    return np.unique(np.concatenate([unigrams, _splitmix64(bigrams)]))
+
+
+class ManuscriptDeduplicator:
+    """
+    Detector de manuscritos quase duplicados com MinHash e LSH.
+
+    Cada manuscrito vira uma assinatura MinHash de ``num_perm`` posições; a
+    assinatura é dividida em ``bands`` faixas e cada faixa indexa um balde,
+    de modo que uma consulta examina apenas os manuscritos que colidem em
+    alguma faixa (tempo sublinear). As assinaturas são acrescentadas a um
+    arquivo e recarregadas na inicialização.
+    """
+
+    def __init__(self, path: Optional[str] = None, num_perm: int = 128, bands: int = 16,
+                 threshold: float = 0.8, action: str = 'flag', seed: int = 1):
+        """
+        Inicializa o detector.
+
+        Args:
+            path: Arquivo de assinaturas (somente em memória se None)
+            num_perm: Número de permutações MinHash
+            bands: Número de faixas LSH (deve dividir ``num_perm``)
+            threshold: Similaridade de Jaccard estimada mínima para duplicata
+            action: 'flag' (anota e segue) ou 'skip' (interrompe o processamento)
+            seed: Semente das permutações
+        """
+        if num_perm % bands:
+            raise ValueError(f"bands ({bands}) must divide num_perm ({num_perm})")
+        if action not in ('flag', 'skip'):
+            raise ValueError(f"Unsupported duplicate action: {action}")
+        self.path = path
+        self.num_perm = num_perm
+        self.bands = bands
+        self.threshold = threshold
+        self.action = action
+        self.seed = seed
+
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, 2 ** 63, num_perm, dtype=np.uint64) | np.uint64(1)
+        self._b = rng.integers(0, 2 ** 63, num_perm, dtype=np.uint64)
+
+        self.names: List[str] = []
+        self._signatures: List[np.ndarray] = []
+        self._buckets = [defaultdict(list) for _ in range(bands)]
+        if path is not None and os.path.exists(path):
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def signature(self, manuscript: Dict[str, Any]) -> np.ndarray:
+        """
+        Calcula a assinatura MinHash de um manuscrito.
+
+        Args:
+            manuscript: Manuscrito com 'strokes'
+
+        Returns:
+            Assinatura uint32 de ``num_perm`` posições
+        """
+        shingles = stroke_shingles(manuscript.get('strokes', []))
+        if len(shingles) == 0:
+            return np.full(self.num_perm, 0xFFFFFFFF, dtype=np.uint32)
+        with np.errstate(over='ignore'):
+            hashed = (self._a[:, None] * shingles[None, :] + self._b[:, None]) >> np.uint64(32)
+        return hashed.min(axis=1).astype(np.uint32)
+
+    def query(self, signature: np.ndarray) -> List[Tuple[str, float]]:
+        """
+        Busca manuscritos similares a uma assinatura.
+
+        Args:
+            signature: Assinatura MinHash
+
+        Returns:
+            Pares (nome, similaridade estimada) acima do limiar, do mais similar
+        """
+        candidates = set()
+        for band, key in enumerate(self._band_keys(signature)):
+            candidates.update(self._buckets[band].get(key, ()))
+        matches = []
+        for index in candidates:
+            similarity = float(np.mean(self._signatures[index] == signature))
+            if similarity >= self.threshold:
+                matches.append((self.names[index], similarity))
+        return sorted(matches, key=lambda match: (-match[1], match[0]))
+
+    def add(self, name: str, signature: np.ndarray) -> None:
+        """
+        Registra a assinatura de um manuscrito (e a persiste, se houver arquivo).
+
+        Args:
+            name: Identificador do manuscrito
+            signature: Assinatura MinHash
+        """
+        self._insert(name, signature)
+        if self.path is not None:
+            self._append(name, signature)
+
+    def check(self, manuscript: Dict[str, Any], name: Optional[str] = None,
+              register: bool = True) -> Optional[Dict[str, Any]]:
+        """
+        Verifica se um manuscrito é quase duplicata de um já visto.
+
+        Args:
+            manuscript: Manuscrito com 'strokes' e 'metadata'
+            name: Identificador (usa metadata 'id'/'name' ou um sequencial se None)
+            register: Se o manuscrito é registrado quando não for duplicata
+
+        Returns:
+            {'duplicate_of', 'similarity', 'action'} da melhor correspondência,
+            ou None
+        """
+        signature = self.signature(manuscript)
+        matches = self.query(signature)
+        if matches:
+            best_name, similarity = matches[0]
+            return {'duplicate_of': best_name, 'similarity': similarity, 'action': self.action}
+        if register:
+            metadata = manuscript.get('metadata', {})
+            self.add(name or str(metadata.get('id', metadata.get('name', f"manuscript-{len(self)}"))), signature)
+        return None
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        """Chaves dos baldes de cada faixa da assinatura."""
+        rows = self.num_perm // self.bands
+        return [signature[band * rows:(band + 1) * rows].tobytes() for band in range(self.bands)]
+
+    def _insert(self, name: str, signature: np.ndarray) -> None:
+        """Registra uma assinatura nos baldes LSH."""
+        index = len(self.names)
+        self.names.append(name)
+        self._signatures.append(np.asarray(signature, dtype=np.uint32))
+        for band, key in enumerate(self._band_keys(signature)):
+            self._buckets[band][key].append(index)
+
+    def _append(self, name: str, signature: np.ndarray) -> None:
+        """Acrescenta um registro ao arquivo de assinaturas."""
+        encoded = name.encode('utf-8')
+        with open(self.path, 'ab') as f:
+            if f.tell() == 0:
+                f.write(_HEADER.pack(SIGNATURES_MAGIC, SIGNATURES_VERSION, self.num_perm, self.bands, self.seed))
+            f.write(_NAME_LENGTH.pack(len(encoded)) + encoded + np.asarray(signature, dtype='<u4').tobytes())
+
+    def _load(self) -> None:
+        """
+        Carrega as assinaturas persistidas e reconstrói os baldes.
+
+        Um registro final incompleto (gravação interrompida) é descartado e o
+        arquivo é truncado no último registro íntegro, para que os próximos
+        acréscimos não fiquem depois de bytes inválidos.
+        """
+        with open(self.path, 'rb') as f:
+            data = f.read()
+        if len(data) < _HEADER.size:
+            self._truncate(0)  # cabeçalho incompleto: o arquivo é recriado
+            return
+        magic, version, num_perm, bands, seed = _HEADER.unpack_from(data)
+        if magic != SIGNATURES_MAGIC:
+            raise ValueError(f"{self.path} is not a JALS signature file")
+        if version > SIGNATURES_VERSION:
+            raise ValueError(f"Unsupported signature file version: {version}")
+        if (num_perm, bands, seed) != (self.num_perm, self.bands, self.seed):
+            raise ValueError(
+                f"Signature file was built with num_perm={num_perm}, bands={bands}, seed={seed}"
+            )
+
+        offset = _HEADER.size
+        signature_size = 4 * num_perm
+        while offset + _NAME_LENGTH.size <= len(data):
+            (length,) = _NAME_LENGTH.unpack_from(data, offset)
+            name_start = offset + _NAME_LENGTH.size
+            end = name_start + length + signature_size
+            if end > len(data):
+                break
+            try:
+                name = data[name_start:name_start + length].decode('utf-8')
+            except UnicodeDecodeError:
+                break
+            self._insert(name, np.frombuffer(data, dtype='<u4', count=num_perm,
+                                             offset=name_start + length).astype(np.uint32))
+            offset = end
+        if offset < len(data):
+            self._truncate(offset)
+
+    def _truncate(self, size: int) -> None:
+        """Descarta os bytes do arquivo de assinaturas a partir de ``size``."""
+        with open(self.path, 'r+b') as f:
+            f.truncate(size)
@@ -0,0 +1,249 @@
+import numpy as np
+from collections.abc import Mapping, Sequence
+from itertools import chain
+from typing import Dict, Any, List, Iterator, Optional, Tuple
+
+
+def ragged(values: List[Any]) -> np.ndarray:
+    """
+    Coluna de tamanho variável: array de objetos com uma referência por traço
+    (as listas internas não são copiadas).
+
+    Args:
+        values: Um valor (tipicamente uma lista) por traço
+
+    Returns:
+        Array ``object`` de forma (n,)
+    """
+    return np.fromiter(values, dtype=object, count=len(values))
+
+
+def ragged_lengths(column: np.ndarray) -> np.ndarray:
+    """Número de itens de cada linha de uma coluna de tamanho variável."""
+    return np.fromiter(map(len, column), dtype=np.int64, count=len(column))
+
+
+def ragged_values(column: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Achata uma coluna de tamanho variável em (valores, offsets).
+
+    Args:
+        column: Coluna ``object`` de sequências numéricas
+
+    Returns:
+        (valores float concatenados, offsets com ``len(column) + 1`` posições)
+    """
+    offsets = np.zeros(len(column) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum(ragged_lengths(column))
+    values = np.fromiter(chain.from_iterable(column), dtype=float, count=int(offsets[-1]))
+    return values, offsets
+
+
+def _column(values: List[Any]) -> np.ndarray:
+    """Converte valores por traço na coluna mais compacta que os comporta."""
+    if values and all(isinstance(value, (int, float, np.number, bool)) for value in values):
+        return np.asarray(values)
+    try:
+        dense = np.asarray(values, dtype=float)
+    except (TypeError, ValueError):
+        return ragged(values)
+    return dense if dense.ndim == 2 and dense.shape[1] > 0 else ragged(values)
+
+
+class FeatureTable:
+    """
+    Características codificadas da Layer 1 em formato colunar.
+
+    Cada coluna (``'família.chave'``) é um array alinhado pelo índice do traço:
+    escalares viram arrays numéricos, vetores de tamanho fixo viram matrizes
+    (n, k) e listas de tamanho variável ficam em colunas ``object``. A visão
+    por traço (``row``/``rows``) é montada sob demanda a partir das colunas,
+    sem copiar dados.
+    """
+
+    def __init__(self, ids: np.ndarray, columns: Dict[str, np.ndarray]):
+        """
+        Inicializa a tabela.
+
+        Args:
+            ids: Identificador de cada traço
+            columns: Colunas nomeadas ``'família.chave'``, todas com ``len(ids)`` linhas
+        """
+        self.ids = ids if isinstance(ids, np.ndarray) else _column(list(ids))
+        self.columns = columns
+        self.families: Dict[str, List[str]] = {}
+        for name, column in columns.items():
+            if len(column) != len(self.ids):
+                raise ValueError(f"Column {name!r} has {len(column)} rows, expected {len(self.ids)}")
+            family, key = name.split('.', 1)
+            self.families.setdefault(family, []).append(key)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @classmethod
+    def from_columns(cls, ids: Any, families: Dict[str, Dict[str, np.ndarray]]) -> 'FeatureTable':
+        """
+        Monta a tabela a partir de colunas agrupadas por família.
+
+        Args:
+            ids: Identificador de cada traço
+            families: {família: {chave: coluna}}
+
+        Returns:
+            Tabela com as colunas informadas (sem cópia)
+        """
+        return cls(ids, {
+            f"{family}.{key}": column
+            for family, columns in families.items()
+            for key, column in columns.items()
+        })
+
+    @classmethod
+    def from_features(cls, features: Dict[str, Any], ids: Optional[Any] = None) -> 'FeatureTable':
+        """
+        Converte famílias no formato de lista (um dicionário por traço) em colunas.
+
+        Args:
+            features: {família: [características do traço i]}
+            ids: Identificadores (índices se None)
+
+        Returns:
+            Tabela equivalente
+        """
+        families = {}
+        count = 0
+        for family, rows in features.items():
+            if not isinstance(rows, (list, tuple)):
+                continue
+            count = max(count, len(rows))
+            keys = list(rows[0]) if rows else []
+            families[family] = {key: _column([row.get(key) for row in rows]) for key in keys}
+        return cls.from_columns(np.arange(count) if ids is None else ids, families)
+
+    def column(self, name: str) -> np.ndarray:
+        """Retorna a coluna ``'família.chave'``."""
+        return self.columns[name]
+
+    def family(self, family: str) -> Dict[str, np.ndarray]:
+        """Retorna as colunas de uma família, por chave."""
+        return {key: self.columns[f"{family}.{key}"] for key in self.families[family]}
+
+    def row(self, index: int) -> 'StrokeView':
+        """Visão do traço ``index`` no formato de dicionário por traço."""
+        if not -len(self) <= index < len(self):
+            raise IndexError(f"Stroke index out of range: {index}")
+        return StrokeView(self, index % len(self))
+
+    def rows(self) -> 'TableRows':
+        """Sequência preguiçosa das visões de todos os traços."""
+        return TableRows(self)
+
+    def family_rows(self, family: str) -> 'TableRows':
+        """Sequência preguiçosa das visões de uma família, traço a traço."""
+        return TableRows(self, family)
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """Materializa a tabela como lista de dicionários independentes."""
+        records = []
+        for index in range(len(self)):
+            view = StrokeView(self, index)
+            record = {'id': view['id']}
+            for family in self.families:
+                record[family] = _plain_family(view[family])
+            records.append(record)
+        return records
+
+
+def _plain_family(view: 'FamilyView') -> Dict[str, Any]:
+    """Características de uma família como dicionário de tipos nativos."""
+    return {key: value.tolist() if isinstance(value, np.ndarray) else value for key, value in view.items()}
+
+
+class FamilyView(Mapping):
+    """Características de uma família para um traço, lidas das colunas."""
+
+    __slots__ = ('_table', '_family', '_index')
+
+    def __init__(self, table: FeatureTable, family: str, index: int):
+        self._table = table
+        self._family = family
+        self._index = index
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._table.families[self._family]:
+            raise KeyError(key)
+        column = self._table.columns[f"{self._family}.{key}"]
+        value = column[self._index]
+        # Escalares saem como tipos Python; linhas de matrizes, como visões
+        return value.item() if column.ndim == 1 and column.dtype != object else value
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._table.families[self._family])
+
+    def __len__(self) -> int:
+        return len(self._table.families[self._family])
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+
+class StrokeView(Mapping):
+    """Visão de um traço da tabela: 'id' e uma ``FamilyView`` por família."""
+
+    __slots__ = ('_table', '_index')
+
+    def __init__(self, table: FeatureTable, index: int):
+        self._table = table
+        self._index = index
+
+    def __getitem__(self, key: str) -> Any:
+        if key == 'id':
+            value = self._table.ids[self._index]
+            return value.item() if isinstance(value, np.generic) else value
+        if key not in self._table.families:
+            raise KeyError(key)
+        return FamilyView(self._table, key, self._index)
+
+    def __iter__(self) -> Iterator[str]:
+        yield 'id'
+        yield from self._table.families
+
+    def __len__(self) -> int:
+        return 1 + len(self._table.families)
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+
+class TableRows(Sequence):
+    """Sequência de visões por traço (de uma família ou do traço inteiro)."""
+
+    __slots__ = ('_table', '_family')
+
+    def __init__(self, table: FeatureTable, family: Optional[str] = None):
+        self._table = table
+        self._family = family
+
+    def __len__(self) -> int:
+        return len(self._table)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if not -len(self) <= index < len(self):
+            raise IndexError(f"Stroke index out of range: {index}")
+        index %= len(self)
+        if self._family is None:
+            return StrokeView(self._table, index)
+        return FamilyView(self._table, self._family, index)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """Materializa as visões como dicionários independentes (serializáveis em JSON)."""
+        if self._family is None:
+            return self._table.to_records()
+        return [_plain_family(view) for view in self]
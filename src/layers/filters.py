@@ -0,0 +1,145 @@
+import numpy as np
+from typing import Optional, Tuple
+
+# SciPy é importado dentro das funções: só quem filtra paga o custo de import.
+
+FILTER_METHODS = ('savgol', 'lowpass')
+
+
+def _butter(cutoff: float, order: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Coeficientes (b, a) de um passa-baixas Butterworth."""
+    from scipy import signal
+
+    if not 0.0 < cutoff < 1.0:
+        raise ValueError(f"cutoff must be between 0 and 1 (fraction of Nyquist), got {cutoff}")
+    return signal.butter(order, cutoff)
+
+
+def _edge_padded(starts: np.ndarray, counts: np.ndarray, pad: int,
+                 width: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Índices de cada traço estendido com ``pad`` amostras de borda de cada
+    lado (linhas de ``width + 2 * pad`` colunas, completadas com o último
+    valor) e a máscara das posições que pertencem ao traço.
+    """
+    columns = np.arange(width + 2 * pad) - pad
+    gather = starts[:, None] + np.clip(columns[None, :], 0, (counts - 1)[:, None])
+    inside = (columns[None, :] >= 0) & (columns[None, :] < counts[:, None])
+    return gather, inside
+
+
+def filter_batch(values: np.ndarray, offsets: np.ndarray, method: str = 'savgol',
+                 window: int = 7, polyorder: int = 2, cutoff: float = 0.25,
+                 order: int = 2) -> np.ndarray:
+    """
+    Filtra todos os traços sem misturar traços vizinhos.
+
+    Cada traço é estendido nas bordas com ``pad`` cópias do seu valor
+    extremo. O Savitzky–Golay (janela de no máximo ``2 * pad + 1``) corre
+    numa única chamada sobre os traços estendidos concatenados, pois a janela
+    nunca alcança o vizinho. O passa-baixas (IIR) levaria estado de um traço
+    ao seguinte, então os traços são agrupados por faixa de comprimento
+    (potências de 2) e cada grupo é filtrado como matriz (traços x amostras):
+    a memória fica limitada a cerca do dobro da entrada estendida, em vez de
+    traços x traço mais longo.
+
+    Args:
+        values: Amostras concatenadas (N,) ou (N, canais)
+        offsets: Limites dos traços (o traço k ocupa ``values[offsets[k]:offsets[k + 1]]``)
+        method: 'savgol' (Savitzky–Golay) ou 'lowpass' (Butterworth de fase zero)
+        window: Janela do Savitzky–Golay (ímpar)
+        polyorder: Grau do polinômio do Savitzky–Golay
+        cutoff: Corte do passa-baixas como fração da frequência de Nyquist
+        order: Ordem do passa-baixas
+
+    Returns:
+        Amostras filtradas, com a mesma forma de ``values``
+    """
+    from scipy import signal
+
+    if method not in FILTER_METHODS:
+        raise ValueError(f"Unsupported filter method: {method}")
+    values = np.asarray(values, dtype=float)
+    if not len(values):
+        return values.copy()
+
+    if method == 'savgol':
+        if window % 2 == 0 or window <= polyorder:
+            raise ValueError(f"window must be odd and greater than polyorder, got {window}/{polyorder}")
+        pad = window // 2
+    else:
+        b, a = _butter(cutoff, order)
+        pad = 3 * max(len(a), len(b))
+
+    offsets = np.asarray(offsets)
+    counts = np.diff(offsets)
+    rows = counts > 0
+    starts, counts = offsets[:-1][rows], counts[rows]
+
+    if method == 'savgol':
+        padded = counts + 2 * pad
+        local = np.arange(padded.sum()) - np.repeat(np.cumsum(padded) - padded, padded) - pad
+        gather = np.repeat(starts, padded) + np.clip(local, 0, np.repeat(counts - 1, padded))
+        inside = (local >= 0) & (local < np.repeat(counts, padded))
+        filtered = signal.savgol_filter(values[gather], window, polyorder, axis=0, mode='interp')
+        return filtered[inside]
+
+    result = np.empty_like(values)
+    buckets = np.ceil(np.log2(counts + 2 * pad)).astype(int)
+    for bucket in np.unique(buckets):
+        members = buckets == bucket
+        bucket_starts, bucket_counts = starts[members], counts[members]
+        gather, inside = _edge_padded(bucket_starts, bucket_counts, pad, int(bucket_counts.max()))
+        filtered = signal.filtfilt(b, a, values[gather], axis=1, padtype=None)
+        result[gather[inside]] = filtered[inside]
+    return result
+
+
+class StreamingFilter:
+    """
+    Passa-baixas Butterworth causal para entrada ao vivo.
+
+    O estado interno do filtro (condições iniciais de ``lfilter``) é mantido
+    entre blocos, de modo que filtrar um traço em pedaços dá o mesmo
+    resultado que filtrá-lo de uma vez, sem reprocessar o histórico.
+    """
+
+    def __init__(self, cutoff: float = 0.25, order: int = 2):
+        """
+        Inicializa o filtro.
+
+        Args:
+            cutoff: Corte como fração da frequência de Nyquist
+            order: Ordem do filtro
+        """
+        self.cutoff = cutoff
+        self.order = order
+        self._b, self._a = _butter(cutoff, order)
+        self._zi: Optional[np.ndarray] = None
+
+    def process(self, samples: np.ndarray) -> np.ndarray:
+        """
+        Filtra o próximo bloco de amostras.
+
+        Args:
+            samples: Amostras (n,) ou (n, canais); o número de canais deve
+                ser o mesmo em todos os blocos de um traço
+
+        Returns:
+            Amostras filtradas
+        """
+        from scipy import signal
+
+        samples = np.asarray(samples, dtype=float)
+        if not len(samples):
+            return samples.copy()
+        if self._zi is None:
+            # Estado de regime para o primeiro valor: sem transitório inicial
+            steady = signal.lfilter_zi(self._b, self._a)
+            self._zi = steady.reshape((-1,) + (1,) * (samples.ndim - 1)) * samples[0]
+        filtered, self._zi = signal.lfilter(self._b, self._a, samples, axis=0, zi=self._zi)
+        return filtered
+
+    def reset(self) -> None:
+        """Descarta o estado (início de um novo traço)."""
+        self._zi = None
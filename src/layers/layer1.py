@@ -1,27 +1,42 @@
 import numpy as np
 from typing import Dict, Any, List, Optional
-import cv2
-from scipy import signal
 import json
 
+from ..core.metrics import timed
+from ..core.tracing import traced
+from .dedup import ManuscriptDeduplicator
+from .stroke_geometry import process_strokes
+from .filters import StreamingFilter, filter_batch
+from .moments import Moments
+from .feature_table import FeatureTable, ragged
+
+# OpenCV e SciPy são dependências pesadas: importe-as apenas dentro das funções
+# que efetivamente as utilizam.
+
 class Layer1:
     """
     Layer 1 – Manuscript Encoding: traço humano como dado primário.
     Responsável pela captura e codificação do gesto humano como dado primário.
     """
     
-    def __init__(self, config_path: Optional[str] = None):
+    def __init__(self, config_path: Optional[str] = None,
+                 deduplicator: Optional[ManuscriptDeduplicator] = None):
         """
         Inicializa a Layer 1 com configurações opcionais.
         
         Args:
             config_path: Caminho para arquivo de configuração YAML
+            deduplicator: Detector de quase duplicatas aplicado antes do
+                pré-processamento (desativado se None)
         """
         self.config = self._load_config(config_path) if config_path else {}
+        self.deduplicator = deduplicator
         self.raw_data = None
         self.processed_data = None
         self.features = None
         
+    @traced('layer1.capture')
+    @timed('layer1.capture')
     def capture(self, source: str, source_type: str = 'file') -> Dict[str, Any]:
         """
         Captura dados de entrada a partir de diversas fontes.
@@ -44,6 +59,8 @@ class Layer1:
             
         return self.raw_data
         
+    @traced('layer1.preprocess')
+    @timed('layer1.preprocess')
     def preprocess(self, raw_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Realiza o pré-processamento dos dados brutos.
@@ -64,14 +81,39 @@ class Layer1:
             'preprocessing_info': {}
         }
         
+        # Quase duplicatas são anotadas ou, com action='skip', não reprocessadas
+        if self.deduplicator is not None:
+            duplicate = self.deduplicator.check(data)
+            if duplicate is not None:
+                processed['preprocessing_info']['duplicate'] = duplicate
+                if duplicate['action'] == 'skip':
+                    processed['preprocessing_info']['skipped'] = True
+                    self.processed_data = processed
+                    return processed
+        
         # Pré-processamento de cada traço
         for stroke in data.get('strokes', []):
             processed_stroke = self._preprocess_stroke(stroke)
             processed['strokes'].append(processed_stroke)
             
+        # Filtragem de ruído em lote (desativada por padrão)
+        if self.config.get('noise_filter'):
+            processed['strokes'] = self._filter_noise(processed['strokes'])
+            processed['preprocessing_info']['noise_filter'] = self.config['noise_filter']
+            
+        # Reamostragem e simplificação em lote (desativadas por padrão)
+        tolerance = self.config.get('simplify_tolerance')
+        spacing = self.config.get('resample_spacing')
+        if tolerance is not None or spacing is not None:
+            processed['strokes'], processed['preprocessing_info']['geometry'] = process_strokes(
+                processed['strokes'], tolerance=tolerance, spacing=spacing
+            )
+            
         self.processed_data = processed
         return processed
         
+    @traced('layer1.extract_features')
+    @timed('layer1.extract_features')
     def extract_features(self, processed_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Extrai características dos dados pré-processados.
@@ -86,16 +128,32 @@ class Layer1:
         if data is None:
             raise ValueError("No processed data available")
             
-        features = {
-            'geometric': self._extract_geometric_features(data),
-            'kinematic': self._extract_kinematic_features(data),
-            'topological': self._extract_topological_features(data),
-            'statistical': self._extract_statistical_features(data)
-        }
+        moments = self._extract_statistical_features(data)
+        table = FeatureTable.from_columns(
+            [stroke.get('id', i) for i, stroke in enumerate(data['strokes'])],
+            {
+                'geometric': self._extract_geometric_features(data),
+                'kinematic': self._extract_kinematic_features(data),
+                'topological': self._extract_topological_features(data),
+                'statistical': {
+                    'mean': moments.mean,
+                    'std': moments.std,
+                    'skewness': moments.skewness,
+                    'kurtosis': moments.kurtosis
+                }
+            }
+        )
+        
+        # Cada família continua acessível traço a traço, por visões sobre as colunas
+        features = {family: table.family_rows(family) for family in table.families}
+        features['moments'] = moments
+        features['table'] = table
         
         self.features = features
         return features
         
+    @traced('layer1.encode')
+    @timed('layer1.encode')
     def encode(self, features: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Codifica as características em formato estruturado para camadas superiores.
@@ -110,9 +168,18 @@ class Layer1:
         if feats is None:
             raise ValueError("No features available for encoding")
             
+        # Características já colunares são apenas referenciadas; famílias no
+        # formato de lista (um dicionário por traço) são convertidas uma vez
+        table = feats.get('table')
+        if table is None:
+            table = FeatureTable.from_features(
+                feats, [stroke.get('id', i) for i, stroke in enumerate(self.processed_data['strokes'])]
+            )
+            
         encoded = {
-            'strokes': [],
-            'global_features': {},
+            'strokes': table.rows(),
+            'table': table,
+            'global_features': self._compute_global_features(feats),
             'encoding_metadata': {
                 'layer': 'manuscript_encoding',
                 'version': '1.0',
@@ -120,22 +187,29 @@ class Layer1:
             }
         }
         
-        # Codificação de características por traço
-        for i, stroke in enumerate(self.processed_data['strokes']):
-            stroke_features = {
-                'id': stroke.get('id', i),
-                'geometric': feats['geometric'].get(i, {}),
-                'kinematic': feats['kinematic'].get(i, {}),
-                'topological': feats['topological'].get(i, {}),
-                'statistical': feats['statistical'].get(i, {})
-            }
-            encoded['strokes'].append(stroke_features)
-            
-        # Codificação de características globais
-        encoded['global_features'] = self._compute_global_features(feats)
-        
         return encoded
         
+    def to_records(self, encoded: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Converte a saída de ``encode`` em estruturas nativas, serializáveis em JSON.
+        
+        Os traços viram uma lista de dicionários (a tabela colunar, que contém
+        os mesmos dados, é omitida) e o timestamp vira texto ISO 8601.
+        
+        Args:
+            encoded: Saída de ``encode``
+            
+        Returns:
+            Dados codificados no formato de lista (um dicionário por traço)
+        """
+        records = {key: value for key, value in encoded.items() if key != 'table'}
+        strokes = encoded['strokes']
+        records['strokes'] = strokes.to_records() if hasattr(strokes, 'to_records') else list(strokes)
+        metadata = encoded.get('encoding_metadata')
+        if metadata is not None:
+            records['encoding_metadata'] = dict(metadata, timestamp=str(metadata['timestamp']))
+        return records
+        
     def _load_config(self, config_path: str) -> Dict[str, Any]:
         """Carrega configuração a partir de arquivo YAML."""
         # Implementação simplificada
@@ -167,12 +241,6 @@ class Layer1:
             points = self._normalize_coordinates(points)
             processed['points'] = points.tolist()
             
-        # Filtragem de ruído
-        if 'pressure' in stroke:
-            pressure = np.array(stroke['pressure'])
-            pressure = self._filter_noise(pressure)
-            processed['pressure'] = pressure.tolist()
-            
         # Interpolação de pontos
         if 'timestamps' in stroke:
             timestamps = np.array(stroke['timestamps'])
@@ -186,77 +254,115 @@ class Layer1:
         # Implementação simplificada
         return points
         
-    def _filter_noise(self, signal_data: np.ndarray) -> np.ndarray:
-        """Aplica filtro de ruído em sinal."""
-        # Implementação simplificada
-        return signal_data
+    def _filter_noise(self, strokes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Suaviza coordenadas e pressão de todos os traços numa chamada por canal.
+        
+        Args:
+            strokes: Traços pré-processados
+            
+        Returns:
+            Traços com 'points' e 'pressure' filtrados
+        """
+        options = {
+            'method': self.config['noise_filter'],
+            'window': self.config.get('filter_window', 7),
+            'polyorder': self.config.get('filter_polyorder', 2),
+            'cutoff': self.config.get('filter_cutoff', 0.25),
+            'order': self.config.get('filter_order', 2)
+        }
+        strokes = [dict(stroke) for stroke in strokes]
+        for channel in self.config.get('filter_channels', ('points', 'pressure')):
+            selected = [stroke for stroke in strokes if len(stroke.get(channel, ()))]
+            if not selected:
+                continue
+            arrays = [np.asarray(stroke[channel], dtype=float) for stroke in selected]
+            offsets = np.concatenate([[0], np.cumsum([len(values) for values in arrays])])
+            filtered = filter_batch(np.concatenate(arrays), offsets, **options)
+            for stroke, start, end in zip(selected, offsets[:-1], offsets[1:]):
+                stroke[channel] = filtered[start:end].tolist()
+        return strokes
+        
+    def stream_filter(self) -> StreamingFilter:
+        """
+        Cria um filtro passa-baixas com estado para entrada ao vivo (um por traço).
+        
+        Returns:
+            Filtro configurado com 'filter_cutoff' e 'filter_order'
+        """
+        return StreamingFilter(self.config.get('filter_cutoff', 0.25), self.config.get('filter_order', 2))
         
     def _interpolate_timestamps(self, timestamps: np.ndarray) -> np.ndarray:
         """Interpola timestamps para regularização."""
         # Implementação simplificada
         return timestamps
         
-    def _extract_geometric_features(self, data: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Extrai características geométricas dos dados."""
-        features = []
-        for stroke in data['strokes']:
-            feat = {
-                'length': self._compute_stroke_length(stroke),
-                'curvature': self._compute_curvature(stroke),
-                'area': self._compute_area(stroke),
-                'centroid': self._compute_centroid(stroke)
-            }
-            features.append(feat)
-        return features
+    def _extract_geometric_features(self, data: Dict[str, Any]) -> Dict[str, np.ndarray]:
+        """Extrai características geométricas dos dados (uma coluna por característica)."""
+        strokes = data['strokes']
+        return {
+            'length': np.array([self._compute_stroke_length(stroke) for stroke in strokes], dtype=float),
+            'curvature': np.array([self._compute_curvature(stroke) for stroke in strokes], dtype=float),
+            'area': np.array([self._compute_area(stroke) for stroke in strokes], dtype=float),
+            'centroid': np.array([self._compute_centroid(stroke) for stroke in strokes], dtype=float).reshape(-1, 2)
+        }
         
-    def _extract_kinematic_features(self, data: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Extrai características cinemáticas dos dados."""
-        features = []
-        for stroke in data['strokes']:
-            feat = {
-                'velocity': self._compute_velocity(stroke),
-                'acceleration': self._compute_acceleration(stroke),
-                'jerk': self._compute_jerk(stroke),
-                'pressure_profile': self._compute_pressure_profile(stroke)
-            }
-            features.append(feat)
-        return features
+    def _extract_kinematic_features(self, data: Dict[str, Any]) -> Dict[str, np.ndarray]:
+        """Extrai características cinemáticas dos dados (colunas de tamanho variável)."""
+        strokes = data['strokes']
+        return {
+            'velocity': ragged([self._compute_velocity(stroke) for stroke in strokes]),
+            'acceleration': ragged([self._compute_acceleration(stroke) for stroke in strokes]),
+            'jerk': ragged([self._compute_jerk(stroke) for stroke in strokes]),
+            'pressure_profile': ragged([self._compute_pressure_profile(stroke) for stroke in strokes])
+        }
         
-    def _extract_topological_features(self, data: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Extrai características topológicas dos dados."""
-        features = []
-        for stroke in data['strokes']:
-            feat = {
-                'intersections': self._find_intersections(stroke),
-                'loops': self._find_loops(stroke),
-                'branches': self._find_branches(stroke),
-                'endpoints': self._find_endpoints(stroke)
-            }
-            features.append(feat)
-        return features
+    def _extract_topological_features(self, data: Dict[str, Any]) -> Dict[str, np.ndarray]:
+        """Extrai características topológicas dos dados (colunas de tamanho variável)."""
+        strokes = data['strokes']
+        return {
+            'intersections': ragged([self._find_intersections(stroke) for stroke in strokes]),
+            'loops': ragged([self._find_loops(stroke) for stroke in strokes]),
+            'branches': ragged([self._find_branches(stroke) for stroke in strokes]),
+            'endpoints': ragged([self._find_endpoints(stroke) for stroke in strokes])
+        }
         
-    def _extract_statistical_features(self, data: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Extrai características estatísticas dos dados."""
-        features = []
-        for stroke in data['strokes']:
-            feat = {
-                'mean': self._compute_mean(stroke),
-                'std': self._compute_std(stroke),
-                'skewness': self._compute_skewness(stroke),
-                'kurtosis': self._compute_kurtosis(stroke)
-            }
-            features.append(feat)
-        return features
+    def _extract_statistical_features(self, data: Dict[str, Any]) -> Moments:
+        """
+        Calcula, numa única passada vetorizada, média, desvio padrão, assimetria
+        e curtose do canal 'statistical_channel' (padrão 'pressure') de cada traço.
+        
+        Args:
+            data: Dados pré-processados
+            
+        Returns:
+            Acumuladores combináveis, um grupo por traço (traços sem o canal
+            têm zero amostras)
+        """
+        channel = self.config.get('statistical_channel', 'pressure')
+        arrays = [np.asarray(stroke.get(channel, ()), dtype=float).ravel() for stroke in data['strokes']]
+        offsets = np.zeros(len(arrays) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(values) for values in arrays])
+        values = np.concatenate(arrays) if arrays else np.empty(0)
+        return Moments.from_segments(values, offsets)
         
     def _compute_global_features(self, features: Dict[str, Any]) -> Dict[str, Any]:
         """Computa características globais do conjunto de dados."""
-        return {
+        table = features.get('table')
+        global_features = {
             'total_strokes': len(features['geometric']),
-            'total_length': sum(f['length'] for f in features['geometric']),
+            'total_length': (float(table.column('geometric.length').sum()) if table is not None
+                             else sum(f['length'] for f in features['geometric'])),
             'complexity_index': self._compute_complexity_index(features),
             'symmetry_index': self._compute_symmetry_index(features)
         }
         
+        # Momentos do manuscrito inteiro combinados a partir dos de cada traço
+        if 'moments' in features:
+            global_features['statistical'] = features['moments'].total().to_dicts()[0]
+            
+        return global_features
+        
     # Métodos de computação de características (implementações simplificadas)
     def _compute_stroke_length(self, stroke: Dict[str, Any]) -> float:
         """Computa o comprimento do traço."""
@@ -306,22 +412,6 @@ class Layer1:
         """Encontra pontos finais no traço."""
         return []
         
-    def _compute_mean(self, stroke: Dict[str, Any]) -> float:
-        """Computa a média de características do traço."""
-        return 0.0
-        
-    def _compute_std(self, stroke: Dict[str, Any]) -> float:
-        """Computa o desvio padrão de características do traço."""
-        return 0.0
-        
-    def _compute_skewness(self, stroke: Dict[str, Any]) -> float:
-        """Computa a assimetria de características do traço."""
-        return 0.0
-        
-    def _compute_kurtosis(self, stroke: Dict[str, Any]) -> float:
-        """Computa a curtose de características do traço."""
-        return 0.0
-        
     def _compute_complexity_index(self, features: Dict[str, Any]) -> float:
         """Computa um índice de complexidade global."""
         return 0.0
@@ -1,7 +1,176 @@
 import numpy as np
+from collections.abc import Sequence
 from typing import Dict, Any, List, Optional
 import json
 
+from ..core.metrics import timed
+from ..core.tracing import traced
+from .feature_table import FeatureTable, ragged_lengths, ragged_values
+from .moments import Moments
+from .symbol_library import SymbolLibrary, table_vectors
+
+# Heurísticas por símbolo, compartilhadas pela conversão traço a traço e pelo
+# caminho em lote (colunar)
+_CURVED_SYMBOL_CURVATURE = 0.5
+_SYMBOL_CONFIDENCE = 0.85
+_SYMBOL_SYMMETRY = 0.7
+_SYMBOL_REGULARITY = 0.8
+_RELATIONSHIP_THRESHOLD = 0.3
+_SPATIAL_RELATIONSHIP = {
+    'type': 'spatial_proximity',
+    'strength': 0.6,
+    'properties': {'distance': 1.0, 'orientation': 'horizontal'}
+}
+
+# Métodos do caminho em lote e as heurísticas traço a traço que reproduzem:
+# se uma subclasse sobrescreve uma heurística sem o método em lote
+# correspondente, o caminho traço a traço é usado
+_BATCH_EQUIVALENTS = {
+    '_table_to_symbols': ('_stroke_to_symbol', '_classify_symbol_type', '_extract_symbolic_properties',
+                          '_compute_symbol_confidence', '_compute_symmetry', '_compute_regularity'),
+    '_extract_symbol_relationships_batch': ('_extract_symbol_relationships', '_compute_relationship')
+}
+
+
+class SymbolTable(Sequence):
+    """
+    Símbolos da Layer 2 em formato colunar.
+    
+    Tipo, confiança e propriedades ficam em arrays alinhados pelo índice do
+    traço; o dicionário de cada símbolo só é montado (e guardado) quando é
+    acessado.
+    """
+    
+    def __init__(self, ids: np.ndarray, types: np.ndarray, confidence: np.ndarray,
+                 properties: Dict[str, np.ndarray], prototypes: Optional[np.ndarray] = None,
+                 prototype_names: Optional[List[str]] = None):
+        """
+        Inicializa a tabela.
+        
+        Args:
+            ids: Identificador de cada símbolo (o do traço de origem)
+            types: Tipo de cada símbolo
+            confidence: Confiança de cada classificação
+            properties: Colunas de propriedades, por nome
+            prototypes: Protótipo da biblioteca associado a cada símbolo (-1 se nenhum)
+            prototype_names: Nomes dos protótipos da biblioteca
+        """
+        self.ids = ids
+        self.types = types
+        self.confidence = confidence
+        self.properties = properties
+        self.prototypes = prototypes
+        self.prototype_names = prototype_names
+        self._symbols: List[Optional[Dict[str, Any]]] = [None] * len(ids)
+        
+    def __len__(self) -> int:
+        return len(self.ids)
+        
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        symbol = self._symbols[index]
+        if symbol is None:
+            symbol = self._symbols[index] = self._build(index)
+        return symbol
+        
+    def _build(self, index: int) -> Dict[str, Any]:
+        """Monta o dicionário de um símbolo a partir das colunas."""
+        symbol_id = self.ids[index]
+        symbol_id = symbol_id.item() if isinstance(symbol_id, np.generic) else symbol_id
+        symbol = {
+            'id': symbol_id,
+            'type': str(self.types[index]),
+            'properties': {name: column[index].item() for name, column in self.properties.items()},
+            'confidence': self.confidence[index].item(),
+            'source_stroke': symbol_id
+        }
+        if self.prototypes is not None and self.prototypes[index] >= 0:
+            symbol['prototype'] = self.prototype_names[self.prototypes[index]]
+        return symbol
+
+
+def _column_list(column: np.ndarray) -> List[Any]:
+    """Coluna como lista; colunas constantes (``broadcast_to``) compartilham o valor."""
+    if len(column) and column.strides == (0,):
+        return [column[0].item()] * len(column)
+    return column.tolist()
+
+
+class RelationshipTable(Sequence):
+    """
+    Relacionamentos entre símbolos em formato colunar.
+    
+    Cada par é guardado como índices na tabela de símbolos, com tipo, força
+    e propriedades em arrays alinhados pelo par; o dicionário de cada
+    relacionamento só é montado (e guardado) quando é acessado.
+    """
+    
+    def __init__(self, ids: np.ndarray, sources: np.ndarray, targets: np.ndarray,
+                 types: np.ndarray, strength: np.ndarray, properties: Dict[str, np.ndarray]):
+        """
+        Inicializa a tabela.
+        
+        Args:
+            ids: Identificadores dos símbolos
+            sources: Índice do símbolo de origem de cada par
+            targets: Índice do símbolo de destino de cada par
+            types: Tipo de cada relacionamento
+            strength: Força de cada relacionamento
+            properties: Colunas de propriedades, por nome
+        """
+        self.ids = ids
+        self.sources = sources
+        self.targets = targets
+        self.types = types
+        self.strength = strength
+        self.properties = properties
+        self._relationships: List[Optional[Dict[str, Any]]] = [None] * len(sources)
+        
+    def __len__(self) -> int:
+        return len(self.sources)
+        
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        relationship = self._relationships[index]
+        if relationship is None:
+            relationship = self._relationships[index] = self._build(index)
+        return relationship
+        
+    def __iter__(self):
+        # Percurso completo: os dicionários são montados de uma vez a partir
+        # das colunas convertidas em listas (os já acessados são preservados)
+        if None in self._relationships:
+            ids = self.ids.tolist()
+            built = [
+                {'source': ids[source], 'target': ids[target], 'type': kind, 'strength': strength,
+                 'properties': {}}
+                for source, target, kind, strength in zip(
+                    self.sources.tolist(), self.targets.tolist(),
+                    _column_list(self.types), _column_list(self.strength))
+            ]
+            for name, column in self.properties.items():
+                for relationship, value in zip(built, _column_list(column)):
+                    relationship['properties'][name] = value
+            self._relationships = [
+                cached if cached is not None else fresh
+                for cached, fresh in zip(self._relationships, built)
+            ]
+        return iter(self._relationships)
+        
+    def _build(self, index: int) -> Dict[str, Any]:
+        """Monta o dicionário de um relacionamento a partir das colunas."""
+        source, target = self.ids[self.sources[index]], self.ids[self.targets[index]]
+        return {
+            'source': source.item() if isinstance(source, np.generic) else source,
+            'target': target.item() if isinstance(target, np.generic) else target,
+            'type': str(self.types[index]),
+            'strength': self.strength[index].item(),
+            'properties': {name: column[index].item() for name, column in self.properties.items()}
+        }
+
+
 class Layer2:
     """
     Layer 2 – Symbolic Abstraction: transformação de dados manuscritos 
@@ -13,12 +182,17 @@ class Layer2:
         Inicializa a Layer 2.
         
         Args:
-            config: Configurações opcionais
+            config: Configurações opcionais ('symbol_library' aceita uma
+                ``SymbolLibrary`` ou o diretório de uma biblioteca salva, carregada
+                por mapeamento em memória)
         """
         self.config = config or {}
-        self.symbol_library = {}
+        library = self.config.get('symbol_library')
+        self.symbol_library = SymbolLibrary.load(library) if isinstance(library, str) else (library or SymbolLibrary())
         self.abstraction_rules = []
         
+    @traced('layer2.abstract')
+    @timed('layer2.abstract')
     def abstract(self, layer1_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Realiza a abstração simbólica dos dados da Layer 1.
@@ -30,13 +204,26 @@ class Layer2:
             Representações simbólicas abstratas
         """
         strokes = layer1_data.get('strokes', [])
+        table = layer1_data.get('table')
         
-        symbols = []
-        for stroke in strokes:
-            symbol = self._stroke_to_symbol(stroke)
-            symbols.append(symbol)
+        # Com a tabela colunar da Layer 1, a classificação é feita em lote e os
+        # dicionários dos símbolos só são montados quando acessados
+        if table is not None and self.config.get('vectorized', True) and \
+                self._batch_is_equivalent('_table_to_symbols'):
+            symbols = self._table_to_symbols(table)
+        else:
+            symbols = []
+            for stroke in strokes:
+                symbol = self._stroke_to_symbol(stroke)
+                symbols.append(symbol)
             
-        relationships = self._extract_symbol_relationships(symbols)
+        # Sobre a tabela colunar, pares e hierarquia usam só os ids, sem montar
+        # os dicionários dos símbolos
+        if isinstance(symbols, SymbolTable) and \
+                self._batch_is_equivalent('_extract_symbol_relationships_batch'):
+            relationships = self._extract_symbol_relationships_batch(symbols)
+        else:
+            relationships = self._extract_symbol_relationships(symbols)
         hierarchies = self._build_symbol_hierarchies(symbols, relationships)
         
         return {
@@ -51,6 +238,23 @@ class Layer2:
             }
         }
         
+    def _batch_is_equivalent(self, batch_method: str) -> bool:
+        """
+        Verifica se um método em lote reproduz as heurísticas traço a traço
+        desta instância: falso quando uma subclasse sobrescreve alguma delas
+        sem sobrescrever também o método em lote.
+        
+        Args:
+            batch_method: Nome do método em lote (ver ``_BATCH_EQUIVALENTS``)
+            
+        Returns:
+            Se o caminho em lote pode ser usado
+        """
+        cls = type(self)
+        if getattr(cls, batch_method) is not getattr(Layer2, batch_method):
+            return True
+        return all(getattr(cls, name) is getattr(Layer2, name) for name in _BATCH_EQUIVALENTS[batch_method])
+        
     def _stroke_to_symbol(self, stroke: Dict[str, Any]) -> Dict[str, Any]:
         """
         Converte um traço em um símbolo abstrato.
@@ -78,6 +282,75 @@ class Layer2:
             'source_stroke': stroke.get('id')
         }
         
+    def _table_to_symbols(self, table: FeatureTable) -> SymbolTable:
+        """
+        Converte todos os traços da tabela em símbolos com operações sobre colunas.
+        
+        Equivale a aplicar ``_stroke_to_symbol`` a cada traço.
+        
+        Args:
+            table: Características colunares da Layer 1
+            
+        Returns:
+            Símbolos em formato colunar
+        """
+        count = len(table)
+        
+        def column(name: str, default: Any) -> np.ndarray:
+            return table.columns[name] if name in table.columns else np.full(count, default)
+            
+        def count_items(name: str) -> np.ndarray:
+            if name not in table.columns:
+                return np.zeros(count, dtype=np.int64)
+            return ragged_lengths(table.columns[name])
+            
+        def moments(name: str) -> Moments:
+            if name not in table.columns:
+                return Moments.from_segments(np.ones(count), np.arange(count + 1))
+            values, offsets = ragged_values(table.columns[name])
+            return Moments.from_segments(values, offsets)
+            
+        types = np.where(
+            count_items('topological.loops') > 0, 'closed_symbol',
+            np.where(column('geometric.curvature', 0.0) > _CURVED_SYMBOL_CURVATURE,
+                     'curved_symbol', 'linear_symbol')
+        )
+        
+        # Média e desvio de listas vazias são indefinidos, como em np.mean/np.std
+        velocity = moments('kinematic.velocity')
+        pressure = moments('kinematic.pressure_profile')
+        properties = {
+            'size': column('geometric.length', 0),
+            'complexity': count_items('geometric.intersections'),
+            'fluency': np.where(velocity.n > 0, velocity.mean, np.nan),
+            'pressure_variation': np.where(pressure.n > 0, pressure.std, np.nan),
+            'symmetry': self._compute_symmetry_batch(table),
+            'regularity': self._compute_regularity_batch(table)
+        }
+        confidence = self._compute_symbol_confidence_batch(table)
+        
+        # Traços próximos de um protótipo conhecido herdam sua classificação
+        prototypes = None
+        if len(self.symbol_library):
+            library = self.symbol_library
+            prototypes, _ = library.match(table_vectors(table, library.columns))
+            matched = prototypes >= 0
+            if matched.any():
+                source = prototypes[matched]
+                types = types.astype(object)
+                types[matched] = np.asarray(library.types, dtype=object)[source]
+                confidence[matched] = library.confidence[source]
+                for name, column in library.properties.items():
+                    if name in properties:
+                        known = np.zeros(count, dtype=bool)
+                        known[matched] = ~np.isnan(column[source])
+                        values = np.array(properties[name], dtype=float)
+                        values[known] = column[prototypes[known]]
+                        properties[name] = values.astype(properties[name].dtype, copy=False)
+                        
+        return SymbolTable(table.ids, types, confidence, properties, prototypes,
+                           self.symbol_library.names)
+        
     def _classify_symbol_type(self, geometric: Dict[str, Any], 
                              topological: Dict[str, Any]) -> str:
         """
@@ -96,7 +369,7 @@ class Layer2:
         
         if loops > 0:
             return 'closed_symbol'
-        elif curvature > 0.5:
+        elif curvature > _CURVED_SYMBOL_CURVATURE:
             return 'curved_symbol'
         else:
             return 'linear_symbol'
@@ -134,7 +407,11 @@ class Layer2:
             Valor de confiança (0-1)
         """
         # Implementação simplificada
-        return 0.85
+        return _SYMBOL_CONFIDENCE
+        
+    def _compute_symbol_confidence_batch(self, table: FeatureTable) -> np.ndarray:
+        """Confiança de todos os símbolos da tabela (mesma heurística de ``_compute_symbol_confidence``)."""
+        return np.full(len(table), _SYMBOL_CONFIDENCE)
         
     def _extract_symbol_relationships(self, symbols: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
@@ -151,11 +428,38 @@ class Layer2:
         for i, symbol1 in enumerate(symbols):
             for j, symbol2 in enumerate(symbols[i+1:], i+1):
                 relationship = self._compute_relationship(symbol1, symbol2)
-                if relationship['strength'] > 0.3:  # Threshold
+                if relationship['strength'] > _RELATIONSHIP_THRESHOLD:
                     relationships.append(relationship)
                     
         return relationships
         
+    def _extract_symbol_relationships_batch(self, symbols: SymbolTable) -> RelationshipTable:
+        """
+        Relacionamentos entre todos os pares de uma tabela de símbolos (mesma
+        heurística e limiar de ``_extract_symbol_relationships``).
+        
+        Args:
+            symbols: Tabela de símbolos
+            
+        Returns:
+            Tabela de relacionamentos, na ordem dos pares (i, j) com i < j
+        """
+        sources, targets = np.triu_indices(len(symbols), 1)
+        strength = np.broadcast_to(np.array(_SPATIAL_RELATIONSHIP['strength']), sources.shape)
+        keep = strength > _RELATIONSHIP_THRESHOLD
+        if not keep.all():
+            sources, targets, strength = sources[keep], targets[keep], strength[keep]
+        count = len(sources)
+        return RelationshipTable(
+            symbols.ids, sources, targets,
+            types=np.broadcast_to(np.array(_SPATIAL_RELATIONSHIP['type']), (count,)),
+            strength=strength,
+            properties={
+                name: np.broadcast_to(np.array(value), (count,))
+                for name, value in _SPATIAL_RELATIONSHIP['properties'].items()
+            }
+        )
+        
     def _compute_relationship(self, symbol1: Dict[str, Any], 
                              symbol2: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -172,12 +476,9 @@ class Layer2:
         return {
             'source': symbol1['id'],
             'target': symbol2['id'],
-            'type': 'spatial_proximity',
-            'strength': 0.6,
-            'properties': {
-                'distance': 1.0,
-                'orientation': 'horizontal'
-            }
+            'type': _SPATIAL_RELATIONSHIP['type'],
+            'strength': _SPATIAL_RELATIONSHIP['strength'],
+            'properties': dict(_SPATIAL_RELATIONSHIP['properties'])
         }
         
     def _build_symbol_hierarchies(self, symbols: List[Dict[str, Any]], 
@@ -196,7 +497,7 @@ class Layer2:
         hierarchy = {
             'root': {
                 'type': 'composition',
-                'children': [symbol['id'] for symbol in symbols],
+                'children': self._symbol_ids(symbols),
                 'properties': {
                     'complexity_level': len(symbols),
                     'coherence': self._compute_hierarchy_coherence(symbols, relationships)
@@ -206,15 +507,29 @@ class Layer2:
         
         return hierarchy
         
+    def _symbol_ids(self, symbols: List[Dict[str, Any]]) -> List[Any]:
+        """Ids dos símbolos (direto da coluna, numa ``SymbolTable``)."""
+        if isinstance(symbols, SymbolTable):
+            return symbols.ids.tolist()
+        return [symbol['id'] for symbol in symbols]
+        
     def _compute_symmetry(self, stroke: Dict[str, Any]) -> float:
         """Computa a simetria de um traço."""
         # Implementação simplificada
-        return 0.7
+        return _SYMBOL_SYMMETRY
         
     def _compute_regularity(self, stroke: Dict[str, Any]) -> float:
         """Computa a regularidade de um traço."""
         # Implementação simplificada
-        return 0.8
+        return _SYMBOL_REGULARITY
+        
+    def _compute_symmetry_batch(self, table: FeatureTable) -> np.ndarray:
+        """Simetria de todos os traços da tabela (mesma heurística de ``_compute_symmetry``)."""
+        return np.full(len(table), _SYMBOL_SYMMETRY)
+        
+    def _compute_regularity_batch(self, table: FeatureTable) -> np.ndarray:
+        """Regularidade de todos os traços da tabela (mesma heurística de ``_compute_regularity``)."""
+        return np.full(len(table), _SYMBOL_REGULARITY)
         
     def _compute_hierarchy_coherence(self, symbols: List[Dict[str, Any]], 
                                    relationships: List[Dict[str, Any]]) -> float:
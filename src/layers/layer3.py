@@ -2,6 +2,9 @@ import numpy as np
 from typing import Dict, Any, List, Optional
 import json
 
+from ..core.metrics import timed
+from ..core.tracing import traced
+
 class Layer3:
     """
     Layer 3 – Language Integration: interface entre diferentes sistemas linguísticos.
@@ -19,6 +22,8 @@ class Layer3:
         self.grammar_rules = []
         self.semantic_networks = {}
         
+    @traced('layer3.integrate')
+    @timed('layer3.integrate')
     def integrate(self, layer2_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Integra representações simbólicas em sistemas linguísticos.
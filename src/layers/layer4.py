@@ -1,12 +1,454 @@
 import numpy as np
-from typing import Dict, Any, List, Optional, Union
+from typing import Dict, Any, List, Optional, Union, Callable, Iterable, Iterator
+import copy
+import io
+import os
+from functools import lru_cache, partial
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
+import threading
+import time
 import json
 
+from ..core.metrics import default_registry, timed
+from ..core.tracing import default_tracer, traced
+from .artifacts import load_artifact, load_raw_package, pack_artifact
+
+
+class _FrozenDict(dict):
+    """Dicionário imutável, compartilhado entre chamadas sem risco de alteração."""
+    
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("Shared Layer4 documents are read-only; copy them before editing")
+        
+    __setitem__ = __delitem__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+    
+    def __reduce__(self):
+        return (_FrozenDict, (dict(self),))
+        
+    def __copy__(self):
+        # Cópias são editáveis: é assim que o chamador altera um documento
+        return dict(self)
+        
+    def __deepcopy__(self, memo):
+        result = memo[id(self)] = {}
+        for key, value in self.items():
+            result[copy.deepcopy(key, memo)] = copy.deepcopy(value, memo)
+        return result
+
+
+class _FrozenList(list):
+    """Lista imutável, compartilhada entre chamadas sem risco de alteração."""
+    
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("Shared Layer4 documents are read-only; copy them before editing")
+        
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _readonly
+    append = extend = insert = remove = pop = clear = sort = reverse = _readonly
+    
+    def __reduce__(self):
+        return (_FrozenList, (list(self),))
+        
+    def __copy__(self):
+        return list(self)
+        
+    def __deepcopy__(self, memo):
+        result = memo[id(self)] = []
+        result.extend(copy.deepcopy(value, memo) for value in self)
+        return result
+
+
+def _freeze(obj: Any) -> Any:
+    """Congela recursivamente dicionários e listas."""
+    if isinstance(obj, dict):
+        return _FrozenDict({key: _freeze(value) for key, value in obj.items()})
+    if isinstance(obj, list):
+        return _FrozenList(_freeze(value) for value in obj)
+    return obj
+
+
+# Documentos constantes: construídos uma única vez e compartilhados
+_API_DEFINITIONS = _freeze({
+    'openapi': '3.0.0',
+    'info': {
+        'title': 'JALS Linguistic Processing API',
+        'version': '1.0.0'
+    },
+    'paths': {
+        '/process': {
+            'post': {
+                'summary': 'Process linguistic units',
+                'requestBody': {
+                    'content': {
+                        'application/json': {
+                            'schema': {
+                                'type': 'object',
+                                'properties': {
+                                    'units': {
+                                        'type': 'array',
+                                        'items': {'type': 'string'}
+                                    }
+                                }
+                            }
+                        }
+                    }
+                },
+                'responses': {
+                    '200': {
+                        'description': 'Processing results',
+                        'content': {
+                            'application/json': {
+                                'schema': {
+                                    'type': 'object',
+                                    'properties': {
+                                        'results': {
+                                            'type': 'array',
+                                            'items': {'type': 'object'}
+                                        }
+                                    }
+                                }
+                            }
+                        }
+                    }
+                }
+            }
+        }
+    }
+})
+
+_DATA_SCHEMAS = _freeze({
+    'json_schema': {
+        'type': 'object',
+        'properties': {
+            'nodes': {
+                'type': 'array',
+                'items': {
+                    'type': 'object',
+                    'properties': {
+                        'id': {'type': 'string'},
+                        'concept': {'type': 'string'},
+                        'features': {'type': 'object'}
+                    }
+                }
+            },
+            'edges': {
+                'type': 'array',
+                'items': {
+                    'type': 'object',
+                    'properties': {
+                        'source': {'type': 'string'},
+                        'target': {'type': 'string'},
+                        'relation': {'type': 'string'}
+                    }
+                }
+            }
+        }
+    },
+    'graphql_schema': """
+                type Node {
+                    id: String!
+                    concept: String!
+                    features: JSON
+                }
+                
+                type Edge {
+                    source: String!
+                    target: String!
+                    relation: String!
+                }
+                
+                type SemanticNetwork {
+                    nodes: [Node!]!
+                    edges: [Edge!]!
+                }
+            """
+})
+
+_COMPILATION_METADATA = _freeze({
+    'compiler_version': '1.0',
+    'optimization_level': 'O2',
+    'target_architectures': ['x86_64', 'arm64']
+})
+
+# Templates pré-compilados: (prefixo, separador, sufixo) em torno dos fragmentos por unidade
+_PROCEDURAL_TEMPLATE = (
+    "def process_linguistic_units():\n    results = []",
+    "",
+    "\n    return results"
+)
+
+_FUNCTIONAL_TEMPLATE = ("""
+const processUnits = (units) => {
+    return units
+        .map(unit => processUnit(unit))
+        .filter(result => result !== null)
+        .reduce((acc, result) => [...acc, result], []);
+};
+
+const units = [""", ", ", """];
+const results = processUnits(units);
+""")
+
+_OO_TEMPLATE = ("""
+class LinguisticProcessor {
+    constructor() {
+        this.units = [""", ", ", """];
+    }
+    
+    processAll() {
+        return this.units.map(unit => this.processUnit(unit));
+    }
+    
+    processUnit(unitId) {
+        // Implementation for processing unit
+        return { id: unitId, processed: true };
+    }
+}
+
+const processor = new LinguisticProcessor();
+const results = processor.processAll();
+""")
+
+_DECLARATIVE_TEMPLATE = ("""
+-- Semantic Network Rules
+semantic_node(ID, Concept, Features) :-
+    node(ID, Concept),
+    features(ID, Features).
+
+""", "\n", """
+
+process_network :-
+    findall(Node, semantic_node(Node, _, _), Nodes),
+    process_nodes(Nodes).
+""")
+
+# Capacidade padrão de cada cache de fragmentos (config['fragment_cache_size'])
+_FRAGMENT_CACHE_SIZE = 65536
+
+
+def _procedural_fragment(unit_id: Any) -> str:
+    """Fragmento procedural de uma unidade."""
+    return f"\n    result = process_unit('{unit_id}')\n    results.append(result)"
+
+
+def _declarative_fragment(node_id: Any, concept: Any) -> str:
+    """Fato declarativo de um nó."""
+    return f"node('{node_id}', '{concept}')."
+
+
+# Arquivo de cada paradigma nos artefatos edge/iot e opções de minificação
+_ARTIFACT_SOURCES = {
+    'procedural': ('procedural.py', {'indent_width': 4}),
+    'functional': ('functional.js', {'comment': '//'}),
+    'object_oriented': ('object_oriented.js', {'comment': '//'}),
+    'declarative': ('declarative.pl', {'comment': '--'})
+}
+
+# Intervalo, em segundos, com que targets na fila são verificados quanto ao início
+_QUEUE_POLL_INTERVAL = 0.01
+
+
+def _timed_call(task: Callable[[], Any]) -> tuple:
+    """Executa uma tarefa e retorna (resultado, duração em segundos)."""
+    start = time.perf_counter()
+    result = task()
+    return result, time.perf_counter() - start
+
+
+def _minify_code(code: str, comment: Optional[str] = None, indent_width: int = 0) -> str:
+    """
+    Minifica código gerado: remove linhas vazias, espaços finais e linhas de
+    comentário; com ``indent_width`` a indentação é reduzida a um espaço por
+    nível (preservando a estrutura de blocos do Python).
+    """
+    lines = []
+    for line in code.splitlines():
+        stripped = line.strip()
+        if not stripped or (comment and stripped.startswith(comment)):
+            continue
+        if indent_width:
+            depth = (len(line) - len(line.lstrip(' '))) // indent_width
+            lines.append(' ' * depth + stripped)
+        else:
+            lines.append(stripped)
+    return "\n".join(lines)
+
+
+def _quantize_weights(weights: np.ndarray, dtype: str) -> tuple:
+    """Quantiza pesos para float16 ou int8 (escala simétrica); retorna (array, escala)."""
+    if dtype == 'float16':
+        return weights.astype(np.float16), 1.0
+    if dtype == 'int8':
+        peak = float(np.max(np.abs(weights))) if weights.size else 0.0
+        scale = peak / 127.0 if peak > 0 else 1.0
+        return np.round(weights / scale).astype(np.int8), scale
+    raise ValueError(f"Unsupported weight dtype: {dtype}")
+
+
+def _dequantize_weights(quantized: np.ndarray, scale: float) -> np.ndarray:
+    """Reconstrói pesos float64 a partir da forma quantizada."""
+    return quantized.astype(np.float64) * scale
+
+
+def _best_time(func: Callable[[], Any], repeat: int = 3) -> float:
+    """Menor tempo de execução, em segundos, entre algumas repetições."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def _render(template: tuple, fragments: Iterable[str]) -> str:
+    """Monta o código num único join sobre o buffer de fragmentos."""
+    prefix, separator, suffix = template
+    return "".join([prefix, separator.join(fragments), suffix])
+
+
+def _stream(template: tuple, fragments: Iterable[str], chunk_size: int) -> Iterator[str]:
+    """
+    Emite o mesmo texto de ``_render`` em blocos de aproximadamente
+    ``chunk_size`` caracteres, sem materializar o código completo.
+    """
+    prefix, separator, suffix = template
+    buffer = [prefix]
+    buffered = len(prefix)
+    
+    for index, fragment in enumerate(fragments):
+        if index:
+            buffer.append(separator)
+            buffered += len(separator)
+        buffer.append(fragment)
+        buffered += len(fragment)
+        if buffered >= chunk_size:
+            yield "".join(buffer)
+            buffer = []
+            buffered = 0
+            
+    buffer.append(suffix)
+    yield "".join(buffer)
+
+
+class LazySections(dict):
+    """
+    Dicionário de seções em que as seções não solicitadas são calculadas apenas
+    no primeiro acesso.
+    
+    Seções pendentes aparecem em ``in``, ``len`` e na iteração sobre as chaves;
+    ``items``, ``values``, comparação e serialização materializam todas.
+    """
+    
+    def __init__(self, computed: Optional[Dict[str, Any]] = None,
+                 factories: Optional[Dict[str, Callable[[], Any]]] = None):
+        super().__init__(computed or {})
+        self._factories = dict(factories or {})
+        # Cada seção é calculada uma única vez, mesmo com acessos concorrentes
+        self._lock = threading.Lock()
+        self._section_locks: Dict[str, threading.Lock] = {}
+        
+    @property
+    def pending(self) -> List[str]:
+        """Seções ainda não calculadas."""
+        return list(self._factories)
+        
+    def is_computed(self, key: str) -> bool:
+        """Verifica se uma seção já foi calculada."""
+        return dict.__contains__(self, key)
+        
+    def computed(self) -> Dict[str, Any]:
+        """Dicionário simples apenas com as seções já calculadas."""
+        return dict(dict.items(self))
+        
+    def materialize(self) -> 'LazySections':
+        """Calcula todas as seções pendentes."""
+        for key in list(self._factories):
+            self[key]
+        return self
+        
+    def __missing__(self, key):
+        with self._lock:
+            if key not in self._factories:
+                return self._computed(key)
+            section_lock = self._section_locks.setdefault(key, threading.Lock())
+        with section_lock:
+            # Outra thread pode ter calculado a seção enquanto esta esperava
+            if key not in self._factories:
+                return self._computed(key)
+            value = self._factories[key]()
+            with self._lock:
+                dict.__setitem__(self, key, value)
+                self._factories.pop(key, None)
+                self._section_locks.pop(key, None)
+        return value
+        
+    def _computed(self, key):
+        """Valor de uma seção já calculada (KeyError se não existir)."""
+        if not dict.__contains__(self, key):
+            raise KeyError(key)
+        return dict.get(self, key)
+        
+    def __setitem__(self, key, value):
+        self._factories.pop(key, None)
+        dict.__setitem__(self, key, value)
+        
+    def __delitem__(self, key):
+        if self._factories.pop(key, None) is None:
+            dict.__delitem__(self, key)
+            
+    def __contains__(self, key):
+        return dict.__contains__(self, key) or key in self._factories
+        
+    def __iter__(self):
+        yield from list(dict.keys(self))
+        yield from list(self._factories)
+        
+    def __len__(self):
+        return dict.__len__(self) + len(self._factories)
+        
+    def __eq__(self, other):
+        return dict.__eq__(self.materialize(), other)
+        
+    def __ne__(self, other):
+        return not self == other
+        
+    def __repr__(self):
+        pending = ', '.join(f"{key!r}: <lazy>" for key in self._factories)
+        computed = dict.__repr__(self)[1:-1]
+        return '{' + ', '.join(part for part in (computed, pending) if part) + '}'
+        
+    def __reduce__(self):
+        return (dict, (dict(self.items()),))
+        
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+        
+    def keys(self):
+        return list(self)
+        
+    def items(self):
+        return dict.items(self.materialize())
+        
+    def values(self):
+        return dict.values(self.materialize())
+        
+    def pop(self, key, *default):
+        if key in self._factories:
+            self[key]
+        return dict.pop(self, key, *default)
+        
+    def copy(self):
+        return dict(self.items())
+
+
 class Layer4:
     """
     Layer 4 – Computational Deployment: execução computacional das representações linguísticas.
     """
     
+    PARADIGMS = ('procedural', 'functional', 'object_oriented', 'declarative')
+    TARGETS = ('web', 'mobile', 'cloud', 'edge', 'iot')
+    
     def __init__(self, config: Optional[Dict[str, Any]] = None):
         """
         Inicializa a Layer 4.
@@ -18,33 +460,68 @@ class Layer4:
         self.execution_engines = {}
         self.deployment_targets = {}
         self.performance_metrics = {}
+        self._executor = None
+        self._metrics_server = None
+        self._fragment_caches = None
+        self._minify_cache = None
+        
+    def close(self) -> None:
+        """Encerra o pool de execução e o endpoint de métricas, se ativos."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        if self._metrics_server is not None:
+            self._metrics_server.shutdown()
+            self._metrics_server.server_close()
+            self._metrics_server = None
+            
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_executor'] = None
+        state['_metrics_server'] = None
+        state['_fragment_caches'] = None
+        state['_minify_cache'] = None
+        return state
         
-    def deploy(self, layer3_data: Dict[str, Any]) -> Dict[str, Any]:
+    @traced('layer4.deploy')
+    @timed('layer4.deploy')
+    def deploy(self, layer3_data: Dict[str, Any],
+               paradigms: Optional[Iterable[str]] = None,
+               targets: Optional[Iterable[str]] = None) -> Dict[str, Any]:
         """
         Realiza o deployment computacional das representações linguísticas.
         
+        Apenas os paradigmas e targets solicitados são gerados imediatamente;
+        os demais ficam disponíveis como seções preguiçosas (``LazySections``),
+        calculadas no primeiro acesso.
+        
         Args:
             layer3_data: Dados da Layer 3 (representações linguísticas)
+            paradigms: Paradigmas de código necessários (todos se None)
+            targets: Targets de deployment necessários (todos se None)
             
         Returns:
             Sistemas computacionais deployados
         """
+        paradigms = self._validate_selection(paradigms, self.PARADIGMS, 'paradigm')
+        targets = self._validate_selection(targets, self.TARGETS, 'target')
+        
         linguistic_units = layer3_data.get('linguistic_units', [])
         semantic_network = layer3_data.get('semantic_network', {})
         multimodal_representations = layer3_data.get('multimodal_representations', {})
         
         # Compilação para código executável
         executable_code = self._compile_to_executable(
-            linguistic_units, semantic_network
+            linguistic_units, semantic_network, paradigms
         )
         
         # Deployment em diferentes targets
         deployment_results = self._deploy_to_targets(
-            executable_code, multimodal_representations
+            executable_code, multimodal_representations, targets, semantic_network
         )
         
         # Otimização de performance
-        optimized_systems = self._optimize_performance(deployment_results)
+        optimized_systems = self._optimize_performance(deployment_results, targets)
         
         # Monitoramento e métricas
         monitoring_data = self._setup_monitoring(optimized_systems)
@@ -58,300 +535,398 @@ class Layer4:
                 'layer': 'computational_deployment',
                 'version': '1.0',
                 'timestamp': str(np.datetime64('now')),
-                'source_units': len(linguistic_units)
+                'source_units': len(linguistic_units),
+                'paradigms': list(paradigms),
+                'targets': list(targets),
+                'target_timings': {
+                    'deployment': self.performance_metrics.get('deployment_timings', {}),
+                    'optimization': self.performance_metrics.get('optimization_timings', {})
+                }
             }
         }
         
+    def _validate_selection(self, selection: Optional[Iterable[str]],
+                            available: tuple, kind: str) -> tuple:
+        """Valida uma seleção de paradigmas/targets (todos se None), na ordem canônica."""
+        if selection is None:
+            return available
+        selection = set(selection)
+        unknown = selection - set(available)
+        if unknown:
+            raise ValueError(f"Unsupported {kind}(s): {sorted(unknown)}")
+        return tuple(item for item in available if item in selection)
+        
     def _compile_to_executable(self, linguistic_units: List[Dict[str, Any]], 
-                              semantic_network: Dict[str, Any]) -> Dict[str, Any]:
+                              semantic_network: Dict[str, Any],
+                              paradigms: Iterable[str] = PARADIGMS) -> Dict[str, Any]:
         """
         Compila representações linguísticas para código executável.
         
+        O código é montado a partir de templates pré-compilados e de fragmentos
+        por unidade mantidos em cache; os documentos de API e de schema são
+        constantes compartilhadas (somente leitura).
+        
         Args:
             linguistic_units: Unidades linguísticas
             semantic_network: Rede semântica
+            paradigms: Paradigmas gerados imediatamente (os demais sob demanda)
             
         Returns:
             Código executável
         """
         # Geração de código para diferentes paradigmas
-        procedural_code = self._generate_procedural_code(linguistic_units)
-        functional_code = self._generate_functional_code(linguistic_units)
-        object_oriented_code = self._generate_oo_code(linguistic_units)
-        declarative_code = self._generate_declarative_code(semantic_network)
-        
-        # Geração de APIs
-        api_definitions = self._generate_api_definitions(linguistic_units)
-        
-        # Geração de schemas de dados
-        data_schemas = self._generate_data_schemas(semantic_network)
-        
-        return {
-            'procedural': procedural_code,
-            'functional': functional_code,
-            'object_oriented': object_oriented_code,
-            'declarative': declarative_code,
-            'api_definitions': api_definitions,
-            'data_schemas': data_schemas,
-            'compilation_metadata': {
-                'compiler_version': '1.0',
-                'optimization_level': 'O2',
-                'target_architectures': ['x86_64', 'arm64']
-            }
+        generators = {
+            'procedural': lambda: self._generate_procedural_code(linguistic_units),
+            'functional': lambda: self._generate_functional_code(linguistic_units),
+            'object_oriented': lambda: self._generate_oo_code(linguistic_units),
+            'declarative': lambda: self._generate_declarative_code(semantic_network)
         }
+        code = {paradigm: generators.pop(paradigm)() for paradigm in paradigms}
+            
+        # Geração de APIs e schemas de dados
+        code['api_definitions'] = self._generate_api_definitions(linguistic_units)
+        code['data_schemas'] = self._generate_data_schemas(semantic_network)
+        code['compilation_metadata'] = _COMPILATION_METADATA
+        
+        return LazySections(code, factories=generators)
         
     def _deploy_to_targets(self, executable_code: Dict[str, Any], 
-                          multimodal_representations: Dict[str, Any]) -> Dict[str, Any]:
+                          multimodal_representations: Dict[str, Any],
+                          targets: Iterable[str] = TARGETS,
+                          semantic_network: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Realiza deployment para diferentes targets computacionais.
         
+        Os targets solicitados são deployados concorrentemente (ver
+        ``_run_target_tasks``); os demais ficam disponíveis sob demanda.
+        
         Args:
             executable_code: Código executável
             multimodal_representations: Representações multimodais
+            targets: Targets deployados imediatamente (os demais sob demanda)
+            semantic_network: Rede semântica (pesos empacotados nos artefatos edge/iot)
             
         Returns:
             Resultados do deployment
         """
-        deployment_results = {}
+        # Pools de processos serializam o código, o que materializaria todas as
+        # seções pendentes: os workers recebem apenas as já calculadas
+        if self.config.get('deployment_executor', 'thread') == 'process' and \
+                isinstance(executable_code, LazySections):
+            executable_code = executable_code.computed()
+            
+        tasks = {
+            target: partial(self._deploy_target, target, executable_code,
+                            multimodal_representations, semantic_network)
+            for target in self.TARGETS
+        }
         
-        # Deployment para web
-        deployment_results['web'] = self._deploy_to_web(
-            executable_code, multimodal_representations
-        )
+        results, timings = self._run_target_tasks({target: tasks.pop(target) for target in targets})
+        self.performance_metrics['deployment_timings'] = timings
+            
+        return LazySections(results, factories=tasks)
         
-        # Deployment para mobile
-        deployment_results['mobile'] = self._deploy_to_mobile(
-            executable_code, multimodal_representations
-        )
+    def _optimize_performance(self, deployment_results: Dict[str, Any],
+                              targets: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """
+        Otimiza performance dos sistemas deployados.
         
-        # Deployment para cloud
-        deployment_results['cloud'] = self._deploy_to_cloud(
-            executable_code, multimodal_representations
-        )
+        Args:
+            deployment_results: Resultados do deployment
+            targets: Targets otimizados imediatamente (todos se None)
+            
+        Returns:
+            Sistemas otimizados
+        """
+        targets = list(deployment_results) if targets is None else targets
+        results, timings = self._run_target_tasks({
+            target: partial(self._optimize_target, target, deployment_results[target])
+            for target in targets
+        })
+        self.performance_metrics['optimization_timings'] = timings
         
-        # Deployment para edge computing
-        deployment_results['edge'] = self._deploy_to_edge(
-            executable_code, multimodal_representations
-        )
+        return LazySections(results, factories={
+            target: (lambda target=target: self._optimize_target(target, deployment_results[target]))
+            for target in deployment_results if target not in results
+        })
         
-        # Deployment para IoT
-        deployment_results['iot'] = self._deploy_to_iot(
-            executable_code, multimodal_representations
-        )
+    def _deploy_target(self, target: str, executable_code: Dict[str, Any],
+                       multimodal_representations: Dict[str, Any],
+                       semantic_network: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Realiza o deployment de um único target."""
+        deployer = getattr(self, f"_deploy_to_{target}")
+        return deployer(executable_code, multimodal_representations, semantic_network)
         
-        return deployment_results
+    def _optimize_target(self, target: str, deployment: Dict[str, Any]) -> Dict[str, Any]:
+        """Otimiza o deployment de um único target."""
+        return {
+            'original': deployment,
+            'optimizations': self._apply_optimizations(deployment, target),
+            'performance_improvements': self._measure_improvements(deployment, target)
+        }
         
-    def _optimize_performance(self, deployment_results: Dict[str, Any]) -> Dict[str, Any]:
+    def _run_target_tasks(self, tasks: Dict[str, Callable[[], Any]]) -> tuple:
         """
-        Otimiza performance dos sistemas deployados.
+        Executa tarefas independentes por target e coleta os resultados à medida
+        que terminam.
+        
+        Configuração (``self.config``):
+        
+        - 'deployment_executor': 'thread' (padrão), 'process' ou 'serial'
+        - 'max_workers': tamanho do pool (padrão: número de targets)
+        - 'target_timeout': tempo máximo, em segundos, de cada target, medido a
+          partir do início da sua execução; os que o excedem recebem status
+          'timeout'. Um target que aguarda na fila não perde tempo enquanto
+          outros targets da mesma chamada executam, mas expira se o pool
+          ficar ``target_timeout`` segundos sem iniciá-lo
+        
+        Falhas de um target não interrompem os demais: o resultado recebe
+        status 'failed' com a mensagem do erro.
         
         Args:
-            deployment_results: Resultados do deployment
+            tasks: Tarefas sem argumentos por target
             
         Returns:
-            Sistemas otimizados
+            (resultados por target, duração em segundos por target)
         """
-        optimized_systems = {}
+        mode = self.config.get('deployment_executor', 'thread')
+        timeout = self.config.get('target_timeout')
+        results = {}
+        timings = {}
         
-        for target, deployment in deployment_results.items():
-            optimized_systems[target] = {
-                'original': deployment,
-                'optimizations': self._apply_optimizations(deployment, target),
-                'performance_improvements': self._measure_improvements(deployment, target)
-            }
+        if mode == 'serial' or (len(tasks) <= 1 and timeout is None):
+            for target, task in tasks.items():
+                try:
+                    results[target], timings[target] = _timed_call(task)
+                except Exception as e:
+                    results[target], timings[target] = self._failed_target(target, 'failed', e), None
+            return results, timings
             
-        return optimized_systems
+        executor = self._get_executor(mode)
+        futures = {executor.submit(_timed_call, task): target for target, task in tasks.items()}
+        pending = set(futures)
+        started = {}
+        last_activity = time.perf_counter()
+        while pending:
+            wait_time = None
+            if timeout is not None:
+                now = time.perf_counter()
+                for future in pending:
+                    if future not in started and future.running():
+                        started[future] = now
+                if started.keys() & pending:
+                    last_activity = now
+                deadlines = [started.get(future, last_activity) + timeout for future in pending]
+                wait_time = max(min(deadlines) - now, 0.0)
+                if len(started.keys() & pending) < len(pending):
+                    # O início dos targets na fila é detectado por consulta periódica
+                    wait_time = min(wait_time, _QUEUE_POLL_INTERVAL)
+                    
+            done, pending = wait(pending, timeout=wait_time, return_when=FIRST_COMPLETED)
+            for future in done:
+                target = futures[future]
+                try:
+                    results[target], timings[target] = future.result()
+                except Exception as e:
+                    results[target], timings[target] = self._failed_target(target, 'failed', e), None
+            if done:
+                last_activity = time.perf_counter()
+                
+            if timeout is not None:
+                now = time.perf_counter()
+                expired = {future for future in pending
+                           if now - started.get(future, last_activity) >= timeout}
+                for future in expired:
+                    future.cancel()
+                    target = futures[future]
+                    results[target] = self._failed_target(target, 'timeout')
+                    timings[target] = timeout
+                pending -= expired
+                
+        ordered = [target for target in tasks]
+        return {t: results[t] for t in ordered}, {t: timings[t] for t in ordered}
+        
+    def _get_executor(self, mode: str):
+        """Retorna (criando sob demanda) o pool de execução reutilizável."""
+        executor_class = {'thread': ThreadPoolExecutor, 'process': ProcessPoolExecutor}.get(mode)
+        if executor_class is None:
+            raise ValueError(f"Unsupported deployment executor: {mode}")
+            
+        if not isinstance(self._executor, executor_class):
+            self.close()
+            self._executor = executor_class(
+                max_workers=self.config.get('max_workers', len(self.TARGETS))
+            )
+        return self._executor
+        
+    def _failed_target(self, target: str, status: str,
+                       error: Optional[Exception] = None) -> Dict[str, Any]:
+        """Resultado de um target que falhou ou excedeu o tempo limite."""
+        result = {'platform': target, 'status': status}
+        if error is not None:
+            result['error'] = f"{type(error).__name__}: {error}"
+        return result
         
     def _setup_monitoring(self, optimized_systems: Dict[str, Any]) -> Dict[str, Any]:
         """
         Configura monitoramento dos sistemas deployados.
         
+        As métricas vêm do registro em processo alimentado pelas quatro
+        camadas; 'live_metrics' e 'alert_status' são seções preguiçosas,
+        calculadas na primeira leitura, para que o deploy não pague pela
+        agregação. Com ``config['metrics_file']`` as métricas são exportadas
+        para arquivo (texto Prometheus) e com ``config['metrics_port']`` um
+        endpoint HTTP local é iniciado na primeira chamada.
+        
         Args:
             optimized_systems: Sistemas otimizados
             
         Returns:
             Dados de monitoramento
         """
-        monitoring_data = {
+        alerts = self._setup_alerts()
+        
+        monitoring_data = LazySections({
             'metrics': self._define_monitoring_metrics(),
-            'alerts': self._setup_alerts(),
+            'alerts': alerts,
+            'exporters': self._export_metrics(),
             'dashboards': self._create_dashboards(optimized_systems),
             'logging': self._configure_logging(),
             'tracing': self._setup_distributed_tracing()
-        }
+        }, factories={
+            'live_metrics': default_registry.snapshot,
+            'alert_status': lambda: default_registry.evaluate_alerts(
+                alerts, monitoring_data['live_metrics']
+            )
+        })
         
         return monitoring_data
         
-    def _generate_procedural_code(self, units: List[Dict[str, Any]]) -> str:
-        """Gera código procedural."""
-        code_lines = [
-            "def process_linguistic_units():",
-            "    results = []"
-        ]
+    def _export_metrics(self) -> Dict[str, Any]:
+        """Exporta as métricas conforme a configuração."""
+        exporters = {'file': None, 'http': None}
         
-        for unit in units:
-            code_lines.append(f"    result = process_unit('{unit['id']}')")
-            code_lines.append("    results.append(result)")
+        metrics_file = self.config.get('metrics_file')
+        if metrics_file:
+            default_registry.write_file(metrics_file)
+            exporters['file'] = metrics_file
+            
+        port = self.config.get('metrics_port')
+        if port is not None:
+            if self._metrics_server is None:
+                self._metrics_server = default_registry.serve_http(port)
+            host, bound_port = self._metrics_server.server_address[:2]
+            exporters['http'] = f"http://{host}:{bound_port}/metrics"
             
-        code_lines.append("    return results")
+        return exporters
         
-        return "\n".join(code_lines)
+    def emit_code(self, layer3_data: Dict[str, Any], paradigm: str, writer: Any,
+                  chunk_size: int = 65536, encoding: str = 'utf-8') -> int:
+        """
+        Emite o código de um paradigma diretamente para um destino, em blocos.
+        
+        O uso de memória depende de ``chunk_size`` e não do número de unidades;
+        o texto emitido é idêntico ao de ``executable_code[paradigm]``.
+        
+        Args:
+            layer3_data: Dados da Layer 3 (representações linguísticas)
+            paradigm: Paradigma de código ('procedural', 'functional', ...)
+            writer: Destino: arquivo texto ou binário, buffer, ou socket (``sendall``)
+            chunk_size: Tamanho aproximado de cada bloco, em caracteres
+            encoding: Codificação usada em destinos binários
+            
+        Returns:
+            Número de caracteres emitidos
+        """
+        if paradigm not in self.PARADIGMS:
+            raise ValueError(f"Unsupported paradigm: {paradigm}")
+            
+        template, fragments = self._code_fragments(
+            paradigm,
+            layer3_data.get('linguistic_units', []),
+            layer3_data.get('semantic_network', {})
+        )
+        
+        if hasattr(writer, 'sendall'):
+            write = lambda chunk: writer.sendall(chunk.encode(encoding))
+        elif isinstance(writer, (io.RawIOBase, io.BufferedIOBase)):
+            write = lambda chunk: writer.write(chunk.encode(encoding))
+        else:
+            write = writer.write
+            
+        written = 0
+        for chunk in _stream(template, fragments, chunk_size):
+            write(chunk)
+            written += len(chunk)
+        return written
+        
+    def _fragment_cache(self) -> tuple:
+        """
+        Caches de fragmentos (procedural, declarativo) desta instância.
+        
+        Os caches são limitados a config['fragment_cache_size'] entradas e
+        tipados, para que ids como ``True``, ``1`` e ``1.0`` não compartilhem
+        o mesmo fragmento.
+        """
+        if self._fragment_caches is None:
+            cache = lru_cache(maxsize=self.config.get('fragment_cache_size', _FRAGMENT_CACHE_SIZE),
+                              typed=True)
+            self._fragment_caches = (cache(_procedural_fragment), cache(_declarative_fragment))
+        return self._fragment_caches
+        
+    def _minified_source(self, paradigm: str, source: str) -> str:
+        """
+        Código minificado de um paradigma para os artefatos edge/iot.
+        
+        O resultado é reaproveitado entre os targets de um mesmo deploy (um
+        por paradigma, limitado ao último código de cada um).
+        """
+        if self._minify_cache is None:
+            self._minify_cache = lru_cache(maxsize=len(self.PARADIGMS))(_minify_code)
+        return self._minify_cache(source, **_ARTIFACT_SOURCES[paradigm][1])
+        
+    def _code_fragments(self, paradigm: str, units: List[Dict[str, Any]],
+                        semantic_network: Dict[str, Any]) -> tuple:
+        """Retorna o template e o iterador de fragmentos de um paradigma."""
+        procedural_fragment, declarative_fragment = self._fragment_cache()
+        if paradigm == 'procedural':
+            return _PROCEDURAL_TEMPLATE, (procedural_fragment(unit['id']) for unit in units)
+        if paradigm == 'functional':
+            return _FUNCTIONAL_TEMPLATE, (repr(unit['id']) for unit in units)
+        if paradigm == 'object_oriented':
+            return _OO_TEMPLATE, (repr(unit['id']) for unit in units)
+        nodes = semantic_network.get('nodes', [])
+        return _DECLARATIVE_TEMPLATE, (
+            declarative_fragment(node['id'], node['concept']) for node in nodes
+        )
+        
+    def _generate_procedural_code(self, units: List[Dict[str, Any]]) -> str:
+        """Gera código procedural."""
+        return _render(*self._code_fragments('procedural', units, {}))
         
     def _generate_functional_code(self, units: List[Dict[str, Any]]) -> str:
         """Gera código funcional."""
-        unit_ids = [unit['id'] for unit in units]
-        return f"""
-const processUnits = (units) => {{
-    return units
-        .map(unit => processUnit(unit))
-        .filter(result => result !== null)
-        .reduce((acc, result) => [...acc, result], []);
-}};
-
-const units = {unit_ids};
-const results = processUnits(units);
-"""
+        return _render(*self._code_fragments('functional', units, {}))
         
     def _generate_oo_code(self, units: List[Dict[str, Any]]) -> str:
         """Gera código orientado a objetos."""
-        return f"""
-class LinguisticProcessor {{
-    constructor() {{
-        this.units = {[unit['id'] for unit in units]};
-    }}
-    
-    processAll() {{
-        return this.units.map(unit => this.processUnit(unit));
-    }}
-    
-    processUnit(unitId) {{
-        // Implementation for processing unit
-        return {{ id: unitId, processed: true }};
-    }}
-}}
-
-const processor = new LinguisticProcessor();
-const results = processor.processAll();
-"""
+        return _render(*self._code_fragments('object_oriented', units, {}))
         
     def _generate_declarative_code(self, semantic_network: Dict[str, Any]) -> str:
         """Gera código declarativo."""
-        nodes = semantic_network.get('nodes', [])
-        return f"""
--- Semantic Network Rules
-semantic_node(ID, Concept, Features) :-
-    node(ID, Concept),
-    features(ID, Features).
-
-{chr(10).join([f"node('{node['id']}', '{node['concept']}')." for node in nodes])}
-
-process_network :-
-    findall(Node, semantic_node(Node, _, _), Nodes),
-    process_nodes(Nodes).
-"""
+        return _render(*self._code_fragments('declarative', [], semantic_network))
         
     def _generate_api_definitions(self, units: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Gera definições de API."""
-        return {
-            'openapi': '3.0.0',
-            'info': {
-                'title': 'JALS Linguistic Processing API',
-                'version': '1.0.0'
-            },
-            'paths': {
-                '/process': {
-                    'post': {
-                        'summary': 'Process linguistic units',
-                        'requestBody': {
-                            'content': {
-                                'application/json': {
-                                    'schema': {
-                                        'type': 'object',
-                                        'properties': {
-                                            'units': {
-                                                'type': 'array',
-                                                'items': {'type': 'string'}
-                                            }
-                                        }
-                                    }
-                                }
-                            }
-                        },
-                        'responses': {
-                            '200': {
-                                'description': 'Processing results',
-                                'content': {
-                                    'application/json': {
-                                        'schema': {
-                                            'type': 'object',
-                                            'properties': {
-                                                'results': {
-                                                    'type': 'array',
-                                                    'items': {'type': 'object'}
-                                                }
-                                            }
-                                        }
-                                    }
-                                }
-                            }
-                        }
-                    }
-                }
-            }
-        }
+        """Gera definições de API (documento constante compartilhado)."""
+        return _API_DEFINITIONS
         
     def _generate_data_schemas(self, semantic_network: Dict[str, Any]) -> Dict[str, Any]:
-        """Gera schemas de dados."""
-        return {
-            'json_schema': {
-                'type': 'object',
-                'properties': {
-                    'nodes': {
-                        'type': 'array',
-                        'items': {
-                            'type': 'object',
-                            'properties': {
-                                'id': {'type': 'string'},
-                                'concept': {'type': 'string'},
-                                'features': {'type': 'object'}
-                            }
-                        }
-                    },
-                    'edges': {
-                        'type': 'array',
-                        'items': {
-                            'type': 'object',
-                            'properties': {
-                                'source': {'type': 'string'},
-                                'target': {'type': 'string'},
-                                'relation': {'type': 'string'}
-                            }
-                        }
-                    }
-                }
-            },
-            'graphql_schema': """
-                type Node {
-                    id: String!
-                    concept: String!
-                    features: JSON
-                }
-                
-                type Edge {
-                    source: String!
-                    target: String!
-                    relation: String!
-                }
-                
-                type SemanticNetwork {
-                    nodes: [Node!]!
-                    edges: [Edge!]!
-                }
-            """
-        }
+        """Gera schemas de dados (documento constante compartilhado)."""
+        return _DATA_SCHEMAS
         
     def _deploy_to_web(self, code: Dict[str, Any], 
-                      multimodal: Dict[str, Any]) -> Dict[str, Any]:
+                      multimodal: Dict[str, Any],
+                       semantic_network: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Deploy para plataforma web."""
         return {
             'platform': 'web',
@@ -362,7 +937,8 @@ process_network :-
         }
         
     def _deploy_to_mobile(self, code: Dict[str, Any], 
-                         multimodal: Dict[str, Any]) -> Dict[str, Any]:
+                         multimodal: Dict[str, Any],
+                          semantic_network: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Deploy para plataforma mobile."""
         return {
             'platform': 'mobile',
@@ -373,7 +949,8 @@ process_network :-
         }
         
     def _deploy_to_cloud(self, code: Dict[str, Any], 
-                        multimodal: Dict[str, Any]) -> Dict[str, Any]:
+                        multimodal: Dict[str, Any],
+                         semantic_network: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Deploy para cloud."""
         return {
             'platform': 'cloud',
@@ -384,30 +961,126 @@ process_network :-
         }
         
     def _deploy_to_edge(self, code: Dict[str, Any], 
-                       multimodal: Dict[str, Any]) -> Dict[str, Any]:
-        """Deploy para edge computing."""
+                       multimodal: Dict[str, Any],
+                       semantic_network: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Deploy para edge computing (artefato zlib nível 1, pesos em float16)."""
         return {
             'platform': 'edge',
             'hardware': ['NVIDIA Jetson', 'Intel NUC'],
             'features': ['low_latency', 'local_processing'],
+            'artifact': self._package_artifact('edge', code, semantic_network, 'float16', level=1),
             'status': 'deployed'
         }
         
     def _deploy_to_iot(self, code: Dict[str, Any], 
-                      multimodal: Dict[str, Any]) -> Dict[str, Any]:
-        """Deploy para IoT."""
+                      multimodal: Dict[str, Any],
+                      semantic_network: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Deploy para IoT (artefato zlib nível 6, pesos em int8)."""
         return {
             'platform': 'iot',
             'protocols': ['MQTT', 'CoAP'],
             'devices': ['Raspberry Pi', 'Arduino'],
             'features': ['sensor_integration', 'mesh_networking'],
+            'artifact': self._package_artifact('iot', code, semantic_network, 'int8', level=6),
             'status': 'deployed'
         }
         
+    def _package_artifact(self, target: str, code: Dict[str, Any],
+                          semantic_network: Optional[Dict[str, Any]],
+                          weight_dtype: str, level: int = 6) -> Dict[str, Any]:
+        """
+        Empacota o código e os pesos da rede semântica num artefato compacto.
+        
+        Apenas os paradigmas já gerados em ``code`` (os solicitados a
+        ``deploy``) são empacotados; seções preguiçosas não são calculadas.
+        
+        O código é minificado e comprimido com zlib, os documentos JSON são
+        serializados sem espaços e os pesos (força das arestas) quantizados.
+        No artefato (ver ``artifacts``) os documentos e os pesos, lidos na
+        inicialização, ficam sem compressão; o código é descomprimido no
+        primeiro acesso. Com config['measure_artifact_load'] os tempos de
+        carga do pacote bruto e do artefato são medidos (fora do padrão, pois
+        a medição repete as cargas).
+        
+        Se config['artifact_dir'] estiver definido o artefato é gravado em disco
+        (chave 'path'); caso contrário os bytes ficam em 'data'.
+        
+        Args:
+            target: Target do artefato
+            code: Código executável
+            semantic_network: Rede semântica
+            weight_dtype: Tipo dos pesos quantizados ('float16' ou 'int8')
+            level: Nível de compressão do zlib
+            
+        Returns:
+            Descrição do artefato
+        """
+        if isinstance(code, LazySections):
+            paradigms = [paradigm for paradigm in self.PARADIGMS if code.is_computed(paradigm)]
+        else:
+            paradigms = [paradigm for paradigm in self.PARADIGMS if paradigm in code]
+            
+        raw_files = {}
+        members = {}
+        for paradigm in paradigms:
+            filename = _ARTIFACT_SOURCES[paradigm][0]
+            raw_files[filename] = code[paradigm].encode('utf-8')
+            members[filename] = (self._minified_source(paradigm, code[paradigm]).encode('utf-8'), 'zlib')
+        for filename, section in (('api.json', 'api_definitions'), ('schemas.json', 'data_schemas')):
+            raw_files[filename] = json.dumps(code[section], separators=(',', ':')).encode('utf-8')
+            members[filename] = (raw_files[filename], 'none')
+            
+        edges = (semantic_network or {}).get('edges', [])
+        weights = np.array([edge.get('strength', 0.0) for edge in edges], dtype=np.float64)
+        quantized, scale = _quantize_weights(weights, weight_dtype)
+        members['weights.bin'] = (quantized.tobytes(), 'none')
+        
+        data = pack_artifact(
+            members,
+            documents=['api.json', 'schemas.json'],
+            weights=('weights.bin', weight_dtype, scale),
+            metadata={'target': target, 'paradigms': paradigms, 'weights_count': int(weights.size)},
+            level=level
+        )
+        
+        dequantized = _dequantize_weights(quantized, scale)
+        artifact = {
+            'format': 'jalspkg',
+            'compression': 'zlib',
+            'optimizations': ['minification', 'compression', 'model_quantization'],
+            'raw_bytes': sum(len(content) for content in raw_files.values()) + weights.nbytes,
+            'packed_bytes': len(data),
+            'weights': {
+                'count': int(weights.size),
+                'dtype': weight_dtype,
+                'scale': scale,
+                'max_abs_error': float(np.max(np.abs(dequantized - weights))) if weights.size else 0.0
+            }
+        }
+        
+        if self.config.get('measure_artifact_load', False):
+            raw_weights = weights.tobytes()
+            artifact['raw_load_time'] = _best_time(lambda: load_raw_package(raw_files, raw_weights))
+            artifact['packed_load_time'] = _best_time(lambda: load_artifact(data))
+        
+        artifact_dir = self.config.get('artifact_dir')
+        if artifact_dir:
+            path = os.path.join(artifact_dir, f"jals-{target}.jalspkg")
+            with open(path, 'wb') as f:
+                f.write(data)
+            artifact['path'] = path
+        else:
+            artifact['data'] = data
+            
+        return artifact
+        
     def _apply_optimizations(self, deployment: Dict[str, Any], target: str) -> List[str]:
         """Aplica otimizações específicas do target."""
         optimizations = []
         
+        if 'artifact' in deployment:
+            return list(deployment['artifact']['optimizations'])
+        
         if target == 'web':
             optimizations.extend(['code_splitting', 'lazy_loading', 'caching'])
         elif target == 'mobile':
@@ -422,7 +1095,30 @@ process_network :-
         return optimizations
         
     def _measure_improvements(self, deployment: Dict[str, Any], target: str) -> Dict[str, float]:
-        """Mede melhorias de performance."""
+        """
+        Mede melhorias de performance.
+        
+        Para targets com artefato (edge/iot) os valores são medidos: redução de
+        bytes e, se config['measure_artifact_load'] estiver ativo, redução do
+        tempo de carga em relação ao pacote bruto.
+        """
+        artifact = deployment.get('artifact')
+        if artifact:
+            improvements = {
+                'memory_usage_reduction': 1.0 - artifact['packed_bytes'] / artifact['raw_bytes'],
+                'raw_bytes': artifact['raw_bytes'],
+                'packed_bytes': artifact['packed_bytes'],
+                'weight_quantization_error': artifact['weights']['max_abs_error']
+            }
+            if 'packed_load_time' in artifact:
+                raw_load, packed_load = artifact['raw_load_time'], artifact['packed_load_time']
+                improvements.update({
+                    'latency_reduction': 1.0 - packed_load / raw_load if raw_load > 0 else 0.0,
+                    'raw_load_time': raw_load,
+                    'packed_load_time': packed_load
+                })
+            return improvements
+            
         return {
             'latency_reduction': 0.3,
             'throughput_increase': 0.25,
@@ -476,9 +1172,9 @@ process_network :-
         }
         
     def _setup_distributed_tracing(self) -> Dict[str, Any]:
-        """Configura tracing distribuído."""
-        return {
-            'system': 'jaeger',
-            'sampling_rate': 0.1,
-            'trace_retention': '7_days'
-        }
\ No newline at end of file
+        """
+        Retorna a configuração efetiva do tracer local (spans Zipkin v2 em
+        NDJSON, amostragem head-based); ative-o com ``JALS_TRACE_FILE`` ou
+        ``src.core.tracing.configure``.
+        """
+        return default_tracer.get_config()
\ No newline at end of file
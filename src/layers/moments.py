@@ -0,0 +1,172 @@
+import numpy as np
+from typing import Dict, List, Optional
+
+# Variância relativa (var / média²) abaixo da qual um grupo é tratado como
+# constante: desvios dessa ordem são só arredondamento da média (soma de n
+# parcelas, combinações de blocos), e assimetria/curtose calculadas sobre eles
+# dariam valores arbitrários (p.ex. 1 e -2 para três amostras iguais)
+_RELATIVE_VARIANCE_FLOOR = 1e-20
+
+
+class Moments:
+    """
+    Acumuladores combináveis dos quatro primeiros momentos (Welford/Pébay),
+    vetorizados sobre grupos (um grupo por traço).
+
+    Cada grupo guarda ``n``, a média e as somas centrais ``M2``, ``M3`` e
+    ``M4``. Grupos calculados em blocos, em paralelo ou em momentos
+    diferentes são combinados exatamente por ``merge``/``total``, sem
+    revisitar as amostras.
+    """
+
+    def __init__(self, n: np.ndarray, mean: np.ndarray, m2: np.ndarray,
+                 m3: np.ndarray, m4: np.ndarray):
+        """
+        Inicializa os acumuladores.
+
+        Args:
+            n: Número de amostras de cada grupo
+            mean: Média de cada grupo
+            m2: Soma dos desvios ao quadrado
+            m3: Soma dos desvios ao cubo
+            m4: Soma dos desvios à quarta
+        """
+        self.n = np.asarray(n, dtype=float)
+        self.mean = np.asarray(mean, dtype=float)
+        self.m2 = np.asarray(m2, dtype=float)
+        self.m3 = np.asarray(m3, dtype=float)
+        self.m4 = np.asarray(m4, dtype=float)
+
+    def __len__(self) -> int:
+        return len(self.n)
+
+    @classmethod
+    def empty(cls, groups: int = 1) -> 'Moments':
+        """Acumuladores sem amostras."""
+        return cls(*(np.zeros(groups) for _ in range(5)))
+
+    @classmethod
+    def from_segments(cls, values: np.ndarray, offsets: np.ndarray) -> 'Moments':
+        """
+        Calcula os momentos de cada segmento de um array concatenado.
+
+        Args:
+            values: Amostras concatenadas
+            offsets: Limites dos segmentos (o grupo k é ``values[offsets[k]:offsets[k + 1]]``)
+
+        Returns:
+            Um grupo por segmento (segmentos vazios têm ``n == 0``)
+        """
+        values = np.asarray(values, dtype=float)
+        offsets = np.asarray(offsets, dtype=np.int64)
+        counts = np.diff(offsets)
+        result = cls.empty(len(counts))
+        nonempty = counts > 0
+        if not nonempty.any():
+            return result
+
+        starts, sizes = offsets[:-1][nonempty], counts[nonempty]
+        mean = np.add.reduceat(values, starts) / sizes
+        deviation = values - np.repeat(mean, sizes)
+        squared = deviation * deviation
+        result.n[nonempty] = sizes
+        result.mean[nonempty] = mean
+        result.m2[nonempty] = np.add.reduceat(squared, starts)
+        result.m3[nonempty] = np.add.reduceat(squared * deviation, starts)
+        result.m4[nonempty] = np.add.reduceat(squared * squared, starts)
+        return result
+
+    def update(self, values: np.ndarray) -> 'Moments':
+        """
+        Acrescenta um bloco de amostras a um acumulador de grupo único
+        (modo streaming).
+
+        Args:
+            values: Novas amostras
+
+        Returns:
+            O próprio acumulador
+        """
+        if len(self) != 1:
+            raise ValueError("update() requires a single-group accumulator")
+        values = np.asarray(values, dtype=float).ravel()
+        combined = self.merge(Moments.from_segments(values, np.array([0, len(values)])))
+        self.n, self.mean, self.m2, self.m3, self.m4 = (
+            combined.n, combined.mean, combined.m2, combined.m3, combined.m4
+        )
+        return self
+
+    def merge(self, other: 'Moments') -> 'Moments':
+        """
+        Combina, grupo a grupo, dois acumuladores do mesmo tamanho.
+
+        Args:
+            other: Acumuladores das demais amostras
+
+        Returns:
+            Novos acumuladores com as amostras de ambos
+        """
+        if len(other) != len(self):
+            raise ValueError(f"Cannot merge {len(other)} groups into {len(self)}")
+        stacked = Moments(*(np.stack([a, b]) for a, b in zip(self._fields(), other._fields())))
+        return stacked._combine(axis=0)
+
+    def total(self, groups: Optional[np.ndarray] = None) -> 'Moments':
+        """
+        Combina grupos num único acumulador, sem revisitar as amostras.
+
+        Args:
+            groups: Índices ou máscara dos grupos incluídos (todos se None)
+
+        Returns:
+            Acumulador de grupo único
+        """
+        selected = self if groups is None else Moments(*(field[groups] for field in self._fields()))
+        combined = selected._combine(axis=0)
+        return Moments(*(np.atleast_1d(field) for field in combined._fields()))
+
+    @property
+    def std(self) -> np.ndarray:
+        """Desvio padrão populacional de cada grupo."""
+        return np.sqrt(self.m2 / np.maximum(self.n, 1))
+
+    @property
+    def skewness(self) -> np.ndarray:
+        """Assimetria (g1) de cada grupo; 0 quando não definida."""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            value = np.sqrt(self.n) * self.m3 / self.m2 ** 1.5
+        return np.where(self._varies(), value, 0.0)
+
+    @property
+    def kurtosis(self) -> np.ndarray:
+        """Curtose em excesso (g2) de cada grupo; 0 quando não definida."""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            value = self.n * self.m4 / (self.m2 * self.m2) - 3.0
+        return np.where(self._varies(), value, 0.0)
+
+    def to_dicts(self) -> List[Dict[str, float]]:
+        """Converte cada grupo em {'mean', 'std', 'skewness', 'kurtosis'}."""
+        columns = zip(self.mean.tolist(), self.std.tolist(), self.skewness.tolist(), self.kurtosis.tolist())
+        return [
+            {'mean': mean, 'std': std, 'skewness': skewness, 'kurtosis': kurtosis}
+            for mean, std, skewness, kurtosis in columns
+        ]
+
+    def _varies(self) -> np.ndarray:
+        """Grupos cuja variância não é só erro de arredondamento (relativo à média)."""
+        return self.m2 > _RELATIVE_VARIANCE_FLOOR * self.n * self.mean * self.mean
+
+    def _fields(self):
+        """Campos na ordem do construtor."""
+        return self.n, self.mean, self.m2, self.m3, self.m4
+
+    def _combine(self, axis: int) -> 'Moments':
+        """Fórmulas de Pébay para a combinação de vários grupos ao longo de ``axis``."""
+        n = self.n.sum(axis=axis)
+        safe = np.where(n > 0, n, 1.0)
+        mean = (self.n * self.mean).sum(axis=axis) / safe
+        delta = np.where(self.n > 0, self.mean - np.expand_dims(mean, axis), 0.0)
+        m2 = (self.m2 + self.n * delta ** 2).sum(axis=axis)
+        m3 = (self.m3 + 3 * delta * self.m2 + self.n * delta ** 3).sum(axis=axis)
+        m4 = (self.m4 + 4 * delta * self.m3 + 6 * delta ** 2 * self.m2 + self.n * delta ** 4).sum(axis=axis)
+        return Moments(n, mean, m2, m3, m4)
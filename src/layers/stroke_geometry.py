@@ -0,0 +1,212 @@
+import numpy as np
+from typing import Dict, Any, List, Optional, Tuple
+
+# Canais amostrados por ponto que acompanham as coordenadas na simplificação e
+# na reamostragem (ignorados quando o tamanho não coincide com o de 'points').
+POINT_CHANNELS = ('pressure', 'timestamps')
+
+
+def pack_strokes(point_sets: List[Any]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Concatena os pontos de vários traços num único array.
+
+    Args:
+        point_sets: Pontos (n, 2) de cada traço
+
+    Returns:
+        (pontos (N, 2), offsets (num_traços + 1)); o traço k ocupa
+        ``pontos[offsets[k]:offsets[k + 1]]``
+    """
+    arrays = [np.asarray(points, dtype=float).reshape(-1, 2) for points in point_sets]
+    offsets = np.zeros(len(arrays) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(points) for points in arrays])
+    points = np.concatenate(arrays) if arrays else np.empty((0, 2))
+    return points, offsets
+
+
+def _segment_distances(points: np.ndarray, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Distância de cada ponto ao segmento [a, b] correspondente."""
+    ab = b - a
+    denominator = np.einsum('ij,ij->i', ab, ab)
+    t = np.einsum('ij,ij->i', points - a, ab) / np.where(denominator > 0, denominator, 1.0)
+    closest = a + np.clip(t, 0.0, 1.0)[:, None] * ab
+    return np.hypot(*(points - closest).T)
+
+
+def _ranges(starts: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """Concatena ``arange(start, start + count)`` de cada par, sem laço Python."""
+    total = int(counts.sum())
+    group_starts = np.cumsum(counts) - counts
+    return np.repeat(starts - group_starts, counts) + np.arange(total)
+
+
+def simplify(points: np.ndarray, offsets: np.ndarray, tolerance: float) -> Tuple[np.ndarray, float]:
+    """
+    Simplificação Ramer–Douglas–Peucker de todos os traços de uma vez.
+
+    Em vez de recursão por traço, cada iteração avalia todos os intervalos
+    abertos de todos os traços com operações vetorizadas e divide os que
+    excedem a tolerância no ponto mais distante.
+
+    Args:
+        points: Pontos concatenados (N, 2)
+        offsets: Limites dos traços (``pack_strokes``)
+        tolerance: Distância máxima permitida entre um ponto descartado e o
+            segmento simplificado que o substitui
+
+    Returns:
+        (máscara booleana dos pontos mantidos, maior distância de um ponto
+        descartado ao seu segmento, sempre <= ``tolerance``)
+    """
+    if tolerance < 0:
+        raise ValueError(f"tolerance must be non-negative, got {tolerance}")
+    keep = np.zeros(len(points), dtype=bool)
+    nonempty = offsets[1:] > offsets[:-1]
+    starts, ends = offsets[:-1][nonempty], offsets[1:][nonempty] - 1
+    keep[starts] = True
+    keep[ends] = True
+
+    max_error = 0.0
+    while True:
+        open_intervals = ends - starts > 1
+        starts, ends = starts[open_intervals], ends[open_intervals]
+        if not len(starts):
+            break
+        counts = ends - starts - 1
+        interior = _ranges(starts + 1, counts)
+        owner = np.repeat(np.arange(len(starts)), counts)
+        distances = _segment_distances(points[interior], points[starts][owner], points[ends][owner])
+
+        group_starts = np.cumsum(counts) - counts
+        farthest = np.maximum.reduceat(distances, group_starts)
+        split = farthest > tolerance
+        if (~split).any():
+            max_error = max(max_error, float(farthest[~split].max()))
+
+        # Primeira ocorrência do máximo de cada intervalo dividido
+        hits = np.flatnonzero((distances == farthest[owner]) & split[owner])
+        _, first = np.unique(owner[hits], return_index=True)
+        pivots = interior[hits[first]]
+        keep[pivots] = True
+        starts = np.concatenate([starts[split], pivots])
+        ends = np.concatenate([pivots, ends[split]])
+    return keep, max_error
+
+
+def resample(points: np.ndarray, offsets: np.ndarray, spacing: float,
+             channels: Optional[Dict[str, np.ndarray]] = None
+             ) -> Tuple[np.ndarray, np.ndarray, Dict[str, np.ndarray], float]:
+    """
+    Reamostra todos os traços por comprimento de arco com espaçamento máximo
+    ``spacing``, numa única interpolação sobre o lote concatenado.
+
+    Cada traço recebe ``ceil(comprimento / spacing) + 1`` pontos equidistantes
+    ao longo do arco, incluindo as extremidades; traços de comprimento nulo
+    ficam com um ponto. Os canais por ponto são interpolados na mesma posição.
+
+    Args:
+        points: Pontos concatenados (N, 2)
+        offsets: Limites dos traços (``pack_strokes``)
+        spacing: Distância máxima entre pontos consecutivos ao longo do arco
+        channels: Canais (N,) alinhados aos pontos
+
+    Returns:
+        (pontos, offsets, canais reamostrados, maior distância de um ponto
+        original à polilinha reamostrada)
+    """
+    if spacing <= 0:
+        raise ValueError(f"spacing must be positive, got {spacing}")
+    channels = channels or {}
+    num_strokes = len(offsets) - 1
+    if not len(points):
+        return points, offsets.copy(), dict(channels), 0.0
+
+    # Posição de cada ponto no arco; traços consecutivos separados por uma
+    # lacuna de 1 para que nenhuma interpolação atravesse a fronteira
+    steps = np.hypot(*np.diff(points, axis=0).T)
+    boundaries = offsets[1:-1]
+    steps[boundaries[(boundaries > 0) & (boundaries < len(points))] - 1] = 0.0
+    arc = np.concatenate([[0.0], np.cumsum(steps)])
+    nonempty = offsets[1:] > offsets[:-1]
+    first = np.minimum(offsets[:-1], len(points) - 1)
+    last = np.maximum(offsets[1:] - 1, 0)
+    lengths = np.where(nonempty, arc[last] - arc[first], 0.0)
+    gaps = np.cumsum(nonempty) - nonempty
+    position = arc + np.repeat(gaps, offsets[1:] - offsets[:-1])
+    base = np.where(nonempty, position[first], 0.0)
+
+    counts = np.where(nonempty, np.where(lengths > 0, np.ceil(lengths / spacing - 1e-9).astype(np.int64) + 1, 1), 0)
+    new_offsets = np.zeros(num_strokes + 1, dtype=np.int64)
+    new_offsets[1:] = np.cumsum(counts)
+    local = np.arange(new_offsets[-1]) - np.repeat(new_offsets[:-1], counts)
+    fraction = local / np.repeat(np.maximum(counts - 1, 1), counts)
+    targets = np.repeat(base, counts) + np.repeat(lengths, counts) * fraction
+
+    resampled = np.column_stack([np.interp(targets, position, points[:, 0]),
+                                 np.interp(targets, position, points[:, 1])])
+    new_channels = {name: np.interp(targets, position, np.asarray(values, dtype=float))
+                    for name, values in channels.items()}
+
+    # Desvio: cada ponto original contra o segmento reamostrado que cobre sua
+    # posição no arco
+    owner = np.repeat(np.arange(num_strokes), offsets[1:] - offsets[:-1])
+    low = new_offsets[:-1][owner]
+    high = np.maximum(new_offsets[1:][owner] - 1, low)
+    segment = np.clip(np.searchsorted(targets, position, side='right') - 1, low, np.maximum(high - 1, low))
+    distances = _segment_distances(points, resampled[segment], resampled[np.minimum(segment + 1, high)])
+    return resampled, new_offsets, new_channels, float(distances.max())
+
+
+def process_strokes(strokes: List[Dict[str, Any]], tolerance: Optional[float] = None,
+                    spacing: Optional[float] = None) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Reamostra (``spacing``) e depois simplifica (``tolerance``) um lote de
+    traços, levando junto os canais por ponto.
+
+    Args:
+        strokes: Traços com 'points' (e opcionalmente 'pressure'/'timestamps')
+        tolerance: Tolerância RDP (sem simplificação se None)
+        spacing: Espaçamento da reamostragem (sem reamostragem se None)
+
+    Returns:
+        (novos traços, relatório com contagens de pontos e desvios máximos)
+    """
+    indices = [i for i, stroke in enumerate(strokes) if 'points' in stroke]
+    points, offsets = pack_strokes([strokes[i]['points'] for i in indices])
+    counts = np.diff(offsets)
+    # Canais ausentes (ou desalinhados) num traço viram NaN e não são
+    # devolvidos a ele; a interpolação nunca mistura traços
+    channels, present = {}, {}
+    for name in POINT_CHANNELS:
+        aligned = [name in strokes[i] and len(strokes[i][name]) == count
+                   for i, count in zip(indices, counts)]
+        if any(aligned):
+            channels[name] = np.concatenate([
+                np.asarray(strokes[i][name], dtype=float) if ok else np.full(count, np.nan)
+                for i, count, ok in zip(indices, counts, aligned)
+            ])
+            present[name] = aligned
+
+    report = {'points_in': int(len(points))}
+    if spacing is not None:
+        points, offsets, channels, deviation = resample(points, offsets, spacing, channels)
+        report['resample'] = {'spacing': spacing, 'max_deviation': deviation}
+    if tolerance is not None:
+        keep, deviation = simplify(points, offsets, tolerance)
+        points = points[keep]
+        channels = {name: values[keep] for name, values in channels.items()}
+        offsets = np.concatenate([[0], np.cumsum(keep)])[offsets]
+        report['simplify'] = {'tolerance': tolerance, 'max_deviation': deviation}
+    report['points_out'] = int(len(points))
+    report['reduction'] = 1.0 - report['points_out'] / report['points_in'] if report['points_in'] else 0.0
+
+    result = list(strokes)
+    for k, i in enumerate(indices):
+        stroke = dict(strokes[i])
+        start, end = offsets[k], offsets[k + 1]
+        stroke['points'] = points[start:end].tolist()
+        for name, values in channels.items():
+            if present[name][k]:
+                stroke[name] = values[start:end].tolist()
+        result[i] = stroke
+    return result, report
@@ -0,0 +1,316 @@
+import numpy as np
+from typing import Dict, Any, List, Optional, Tuple
+import json
+import os
+
+from .feature_table import FeatureTable
+
+# Colunas da tabela da Layer 1 que formam o vetor de características de um traço
+LIBRARY_FEATURES = (
+    'geometric.length', 'geometric.curvature', 'geometric.area',
+    'statistical.mean', 'statistical.std', 'statistical.skewness', 'statistical.kurtosis'
+)
+
+# Pontos de cada nuvem normalizada do reconhecedor $P
+CLOUD_POINTS = 32
+
+_ARRAYS = ('vectors', 'confidence', 'clouds')
+
+
+def table_vectors(table: FeatureTable, columns=LIBRARY_FEATURES) -> np.ndarray:
+    """
+    Monta os vetores de características de todos os traços de uma tabela.
+
+    Args:
+        table: Características colunares da Layer 1
+        columns: Colunas usadas (ausentes valem 0)
+
+    Returns:
+        Matriz float32 (traços, colunas)
+    """
+    vectors = np.zeros((len(table), len(columns)), dtype=np.float32)
+    for position, name in enumerate(columns):
+        if name in table.columns:
+            vectors[:, position] = table.columns[name]
+    return vectors
+
+
+def normalize_cloud(points: Any, size: int = CLOUD_POINTS) -> np.ndarray:
+    """
+    Normaliza um traço em nuvem de pontos do $P: reamostragem uniforme no
+    arco, escala pela maior dimensão e centróide na origem.
+
+    Args:
+        points: Pontos (n, 2) do traço
+        size: Número de pontos da nuvem
+
+    Returns:
+        Nuvem (size, 2)
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 2)
+    if not len(points):
+        raise ValueError("Cannot normalize an empty stroke")
+    arc = np.concatenate([[0.0], np.cumsum(np.hypot(*np.diff(points, axis=0).T))])
+    targets = np.linspace(0.0, arc[-1], size)
+    cloud = np.column_stack([np.interp(targets, arc, points[:, 0]), np.interp(targets, arc, points[:, 1])])
+    extent = (cloud.max(axis=0) - cloud.min(axis=0)).max()
+    cloud = cloud / (extent if extent > 0 else 1.0)
+    return cloud - cloud.mean(axis=0)
+
+
+def _greedy_cloud_distance(distances: np.ndarray, start: int, bound: float) -> float:
+    """
+    Custo do emparelhamento guloso do $P a partir de ``start``, abandonado
+    assim que ultrapassa ``bound``.
+    """
+    size = len(distances)
+    available = np.ones(size, dtype=bool)
+    total = 0.0
+    for step in range(size):
+        row = np.where(available, distances[(start + step) % size], np.inf)
+        match = int(np.argmin(row))
+        available[match] = False
+        total += (1.0 - step / size) * row[match]
+        if total >= bound:
+            break
+    return total
+
+
+class SymbolLibrary:
+    """
+    Biblioteca persistente de símbolos protótipo.
+
+    Cada protótipo guarda um vetor de características, a classificação e as
+    propriedades já conhecidas e, opcionalmente, a nuvem de pontos normalizada
+    do traço. ``match`` encontra o protótipo mais próximo de cada vetor por
+    uma KD-tree (``scipy.spatial.cKDTree``, com busca exaustiva em NumPy como
+    alternativa); ``recognize`` compara nuvens de pontos pelo $P, descartando
+    protótipos por limites inferiores antes do emparelhamento.
+    """
+
+    def __init__(self, columns=LIBRARY_FEATURES, max_distance: float = 0.25):
+        """
+        Inicializa uma biblioteca vazia.
+
+        Args:
+            columns: Colunas da tabela da Layer 1 que formam o vetor de características
+            max_distance: Distância máxima (em desvios padrão de cada coluna)
+                para que um traço seja associado a um protótipo
+        """
+        self.columns = list(columns)
+        self.max_distance = max_distance
+        self.vectors = np.empty((0, len(self.columns)), dtype=np.float32)
+        self.confidence = np.empty(0)
+        self.clouds = np.empty((0, CLOUD_POINTS, 2), dtype=np.float32)
+        self.types: List[str] = []
+        self.names: List[str] = []
+        self.properties: Dict[str, np.ndarray] = {}
+        self._index = None
+        self._scale = None
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def add(self, vector: Any, symbol_type: str, properties: Optional[Dict[str, float]] = None,
+            confidence: float = 1.0, points: Optional[Any] = None, name: Optional[str] = None) -> int:
+        """
+        Acrescenta um protótipo.
+
+        Args:
+            vector: Vetor de características (na ordem de ``columns``)
+            symbol_type: Tipo de símbolo reutilizado nas correspondências
+            properties: Propriedades simbólicas reutilizadas
+            confidence: Confiança atribuída às correspondências
+            points: Pontos do traço, para o reconhecedor $P
+            name: Nome do protótipo (sequencial se None)
+
+        Returns:
+            Índice do protótipo
+        """
+        vector = np.asarray(vector, dtype=np.float32).reshape(1, -1)
+        if vector.shape[1] != len(self.columns):
+            raise ValueError(f"Expected {len(self.columns)} features, got {vector.shape[1]}")
+        cloud = normalize_cloud(points) if points is not None else np.full((CLOUD_POINTS, 2), np.nan)
+
+        return int(self._extend(
+            vector, [symbol_type], np.array([confidence], dtype=float),
+            {key: np.array([value], dtype=float) for key, value in (properties or {}).items()},
+            cloud[None], [name]
+        )[0])
+
+    def learn(self, table: FeatureTable, symbols: Any, rows: Optional[Any] = None) -> np.ndarray:
+        """
+        Acrescenta, em lote, protótipos a partir de símbolos já classificados.
+
+        Args:
+            table: Características colunares da Layer 1
+            symbols: ``SymbolTable`` da Layer 2 para a mesma tabela
+            rows: Índices dos traços aprendidos (todos se None)
+
+        Returns:
+            Índices dos novos protótipos
+        """
+        rows = np.arange(len(table)) if rows is None else np.asarray(rows, dtype=np.int64)
+        return self._extend(
+            table_vectors(table, self.columns)[rows],
+            [str(symbols.types[row]) for row in rows],
+            np.asarray(symbols.confidence, dtype=float)[rows],
+            {key: np.asarray(column, dtype=float)[rows] for key, column in symbols.properties.items()},
+            np.full((len(rows), CLOUD_POINTS, 2), np.nan),
+            [None] * len(rows)
+        )
+
+    def match(self, vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Associa cada vetor ao protótipo mais próximo dentro de ``max_distance``.
+
+        Args:
+            vectors: Vetores de características (m, colunas)
+
+        Returns:
+            (índices dos protótipos, -1 sem correspondência; distâncias)
+        """
+        vectors = np.asarray(vectors, dtype=float).reshape(-1, len(self.columns))
+        indices = np.full(len(vectors), -1, dtype=np.int64)
+        distances = np.full(len(vectors), np.inf)
+        if not len(self) or not len(vectors):
+            return indices, distances
+
+        index, scale = self._build_index()
+        queries = vectors / scale
+        if index is not None:
+            found, nearest = index.query(queries, k=1, distance_upper_bound=self.max_distance)
+            hit = nearest < len(self)
+        else:
+            scaled = np.asarray(self.vectors, dtype=float) / scale
+            nearest = np.empty(len(queries), dtype=np.int64)
+            found = np.empty(len(queries))
+            for start in range(0, len(queries), 1024):
+                block = queries[start:start + 1024]
+                squared = ((block[:, None, :] - scaled[None, :, :]) ** 2).sum(axis=2)
+                nearest[start:start + 1024] = squared.argmin(axis=1)
+                found[start:start + 1024] = np.sqrt(squared.min(axis=1))
+            hit = found <= self.max_distance
+        indices[hit] = nearest[hit]
+        distances[hit] = found[hit]
+        return indices, distances
+
+    def recognize(self, points: Any, max_score: float = np.inf) -> Tuple[int, float]:
+        """
+        Reconhece um traço pelo $P (nuvem de pontos) entre os protótipos com pontos.
+
+        Protótipos são visitados em ordem crescente de limite inferior (soma
+        ponderada das menores distâncias de cada ponto) e descartados quando o
+        limite já supera o melhor custo; o emparelhamento guloso é abandonado
+        assim que o custo parcial o ultrapassa.
+
+        Args:
+            points: Pontos (n, 2) do traço
+            max_score: Custo máximo aceito
+
+        Returns:
+            (índice do protótipo, custo) ou (-1, inf)
+        """
+        candidates = np.flatnonzero(~np.isnan(self.clouds[:, 0, 0]))
+        if not len(candidates):
+            return -1, np.inf
+        cloud = normalize_cloud(points)
+        templates = np.asarray(self.clouds[candidates], dtype=float)
+        forward = np.sqrt(((cloud[None, :, None, :] - templates[:, None, :, :]) ** 2).sum(axis=3))
+        backward = forward.transpose(0, 2, 1)
+
+        size = CLOUD_POINTS
+        starts = np.arange(0, size, max(int(size ** 0.5), 1))
+        weights = 1.0 - np.arange(size) / size
+        order_index = (starts[:, None] + np.arange(size)[None, :]) % size
+        bounds = np.minimum(
+            (forward.min(axis=2)[:, order_index] @ weights).min(axis=1),
+            (backward.min(axis=2)[:, order_index] @ weights).min(axis=1)
+        )
+
+        best_index, best_score = -1, max_score
+        for position in np.argsort(bounds, kind='stable'):
+            if bounds[position] >= best_score:
+                break
+            for distances in (forward[position], backward[position]):
+                for start in starts:
+                    score = _greedy_cloud_distance(distances, int(start), best_score)
+                    if score < best_score:
+                        best_index, best_score = int(candidates[position]), score
+        return best_index, (best_score if best_index >= 0 else np.inf)
+
+    def save(self, directory: str) -> None:
+        """
+        Grava a biblioteca como arquivos ``.npy`` (mapeáveis em memória).
+
+        Args:
+            directory: Diretório de destino (criado se necessário)
+        """
+        os.makedirs(directory, exist_ok=True)
+        for name in _ARRAYS:
+            np.save(os.path.join(directory, f'{name}.npy'), np.asarray(getattr(self, name)))
+        for key, column in self.properties.items():
+            np.save(os.path.join(directory, f'property.{key}.npy'), column)
+        with open(os.path.join(directory, 'library.json'), 'w') as f:
+            json.dump({'type': 'symbol_library', 'version': 1, 'columns': self.columns,
+                       'max_distance': self.max_distance, 'types': self.types,
+                       'names': self.names, 'properties': list(self.properties)}, f)
+
+    @classmethod
+    def load(cls, directory: str, mmap: bool = True) -> 'SymbolLibrary':
+        """
+        Carrega uma biblioteca salva.
+
+        Args:
+            directory: Diretório da biblioteca
+            mmap: Se os arrays são mapeados em memória (somente leitura)
+
+        Returns:
+            Biblioteca carregada
+        """
+        with open(os.path.join(directory, 'library.json')) as f:
+            meta = json.load(f)
+        if meta.get('type') != 'symbol_library':
+            raise ValueError(f"{directory} is not a symbol library")
+        mode = 'r' if mmap else None
+        library = cls(meta['columns'], meta['max_distance'])
+        for name in _ARRAYS:
+            setattr(library, name, np.load(os.path.join(directory, f'{name}.npy'), mmap_mode=mode))
+        library.properties = {
+            key: np.load(os.path.join(directory, f'property.{key}.npy'), mmap_mode=mode)
+            for key in meta['properties']
+        }
+        library.types = meta['types']
+        library.names = meta['names']
+        return library
+
+    def _extend(self, vectors: np.ndarray, types: List[str], confidence: np.ndarray,
+                properties: Dict[str, np.ndarray], clouds: np.ndarray,
+                names: List[Optional[str]]) -> np.ndarray:
+        """Acrescenta protótipos (colunas alinhadas) e invalida o índice."""
+        start, count = len(self), len(types)
+        for key in list(self.properties) + [key for key in properties if key not in self.properties]:
+            current = self.properties.get(key, np.full(start, np.nan))
+            self.properties[key] = np.concatenate([current, properties.get(key, np.full(count, np.nan))])
+        self.vectors = np.concatenate([self.vectors, np.asarray(vectors, dtype=np.float32)])
+        self.confidence = np.concatenate([self.confidence, confidence])
+        self.clouds = np.concatenate([self.clouds, np.asarray(clouds, dtype=np.float32)])
+        self.types.extend(types)
+        self.names.extend(name if name is not None else f"prototype-{start + offset}"
+                          for offset, name in enumerate(names))
+        self._index = self._scale = None
+        return np.arange(start, start + count)
+
+    def _build_index(self):
+        """Constrói (uma vez) a KD-tree sobre os vetores escalados por coluna."""
+        if self._scale is None:
+            vectors = np.asarray(self.vectors, dtype=float)
+            spread = vectors.std(axis=0) if len(vectors) > 1 else np.zeros(vectors.shape[1])
+            self._scale = np.where(spread > 0, spread, 1.0)
+            try:
+                from scipy.spatial import cKDTree
+            except ImportError:
+                self._index = None
+            else:
+                self._index = cKDTree(vectors / self._scale)
+        return self._index, self._scale
@@ -0,0 +1,52 @@
+from benchmarks.synthetic import generate_manuscript
+from benchmarks.run_benchmarks import run_suite, compare_to_baseline, main
+
+
+class TestSyntheticManuscript:
+    """Testes para o gerador de manuscritos sintéticos."""
+    
+    def test_deterministic(self):
+        """Testa que a mesma semente gera o mesmo manuscrito."""
+        assert generate_manuscript(5, 16, seed=3) == generate_manuscript(5, 16, seed=3)
+        assert generate_manuscript(5, 16, seed=3) != generate_manuscript(5, 16, seed=4)
+        
+    def test_channels(self):
+        """Testa a configuração de canais e tamanhos."""
+        manuscript = generate_manuscript(4, 10, pressure=False)
+        assert len(manuscript['strokes']) == 4
+        stroke = manuscript['strokes'][0]
+        assert len(stroke['points']) == 10
+        assert len(stroke['timestamps']) == 10
+        assert 'pressure' not in stroke
+
+
+class TestBenchmarkSuite:
+    """Testes para a suíte de benchmarks."""
+    
+    def test_run_and_compare(self):
+        """Testa a execução da suíte e a detecção de regressões."""
+        results = run_suite(sizes=[(3, 8)], repeat=1)
+        assert {entry['benchmark'] for entry in results['results']} >= {
+            'layer1.encode', 'layer4.deploy', 'engine.multi_layer_amplify', 'ideogram.load_json'
+        }
+        assert compare_to_baseline(results, results) == []
+        
+        faster = {'results': [dict(entry, median_s=entry['median_s'] / 10) for entry in results['results']]}
+        regressions = compare_to_baseline(results, faster)
+        assert regressions and all(r['metric'] == 'median_s' for r in regressions)
+        
+    def test_missing_baseline(self, tmp_path, capsys):
+        """Testa o aviso e a falha quando a linha de base não existe."""
+        argv = ['--sizes', '2x8', '--repeat', '1', '--benchmarks', 'layer1.encode',
+                '--output', str(tmp_path / 'results.json'),
+                '--baseline', str(tmp_path / 'missing.json')]
+        assert main(argv) == 0
+        assert 'baseline' in capsys.readouterr().err
+        assert main(argv + ['--fail-on-regression']) == 2
+        
+    def test_binary_state_load_ratio(self):
+        """Testa que o snapshot binário carrega ao menos 10x mais rápido que o JSON."""
+        results = run_suite(sizes=[(3, 8)], repeat=5,
+                            benchmarks=['engine.load_state_binary', 'engine.load_state_json'])
+        timings = {entry['benchmark']: entry['min_s'] for entry in results['results']}
+        assert timings['engine.load_state_json'] >= 10 * timings['engine.load_state_binary']
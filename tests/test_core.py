@@ -38,6 +38,276 @@ class TestCoreIdeogram:
         assert ideogram.data['symbolic_representation'] is not None
         assert 'symbols' in ideogram.data['symbolic_representation']
 
+        
+    def test_incremental_update_matches_full_rebuild(self):
+        """Testa que o reprocessamento incremental equivale ao completo."""
+        import numpy as np
+        
+        def process(strokes):
+            ideogram = CoreIdeogram()
+            ideogram.data['strokes'] = [dict(stroke) for stroke in strokes]
+            features = ideogram.extract_features()
+            ideogram.generate_symbolic_representation(features)
+            ideogram.to_computational_representation()
+            return ideogram, features
+            
+        strokes = [
+            {'id': 1, 'points': [[0, 0], [5, 5], [10, 0]], 'timestamps': [0.0, 0.1, 0.2]},
+            {'id': 2, 'points': [[8, 0], [12, 4]]},
+            {'id': 3, 'points': [[50, 50], [60, 60]]},
+            {'id': 4, 'points': [[100, 100], [101, 101]]}
+        ]
+        ideogram, _ = process(strokes)
+        assert ideogram.data['symbolic_representation']['symbols'][0]['relations'] == [2]
+        
+        ideogram.update_strokes(
+            added=[{'id': 5, 'points': [[55, 55], [100, 100]]}],
+            changed=[{'id': 2, 'points': [[40, 40], [52, 52]]}],
+            removed=[4]
+        )
+        expected, expected_features = process(ideogram.data['strokes'])
+        
+        assert [stroke['id'] for stroke in ideogram.data['strokes']] == [1, 2, 3, 5]
+        assert ideogram.data['symbolic_representation'] == expected.data['symbolic_representation']
+        assert ideogram.render_tokens() == expected.render_tokens()
+        assert ideogram._features == expected_features
+        assert ideogram.data['symbolic_representation']['symbols'][2]['relations'] == [2, 5]
+        
+        # Remoção antes de uma alteração e várias adições na mesma chamada
+        ideogram.update_strokes(
+            added=[{'id': 6 + i, 'points': [[10 * i, 0], [10 * i + 12, 3]]} for i in range(20)],
+            changed=[{'id': 3, 'points': [[2, 2], [9, 1]]}],
+            removed=[1]
+        )
+        expected, _ = process(ideogram.data['strokes'])
+        comp_rep = ideogram.data['computational_representation']
+        assert ideogram.data['symbolic_representation'] == expected.data['symbolic_representation']
+        assert ideogram.render_tokens() == expected.render_tokens()
+        assert np.array_equal(comp_rep['embeddings'], expected.data['computational_representation']['embeddings'])
+        
+        # Os arrays crescem no próprio buffer, sem realocar a cada traço
+        tokens = comp_rep['tokens']
+        ideogram.update_strokes(added=[{'id': 100, 'points': [[0, 0], [1, 1]]}])
+        assert np.shares_memory(ideogram.data['computational_representation']['tokens'], tokens)
+        
+        # Várias remoções espalhadas compactam o buffer no lugar
+        ideogram.update_strokes(removed=[2, 7, 12, 13, 25, 100])
+        expected, _ = process(ideogram.data['strokes'])
+        comp_rep = ideogram.data['computational_representation']
+        assert [stroke['id'] for stroke in ideogram.data['strokes']][:6] == [3, 5, 6, 8, 9, 10]
+        assert ideogram.data['symbolic_representation'] == expected.data['symbolic_representation']
+        assert ideogram.render_tokens() == expected.render_tokens()
+        assert np.array_equal(comp_rep['embeddings'], expected.data['computational_representation']['embeddings'])
+        assert np.shares_memory(comp_rep['tokens'], tokens)
+        
+        with pytest.raises(ValueError):
+            ideogram.update_strokes(removed=[42])
+        with pytest.raises(ValueError):
+            ideogram.update_strokes(added=[{'id': 200, 'points': []}, {'id': 200, 'points': []}])
+        with pytest.raises(ValueError):
+            ideogram.update_strokes(changed=[{'id': 3, 'points': [[0, 0]]}], removed=[3])
+        with pytest.raises(ValueError):
+            CoreIdeogram().update_strokes(added=[{'id': 1, 'points': []}])
+        
+    def test_memoized_representations(self):
+        """Testa a memorização das representações derivadas."""
+        ideogram = CoreIdeogram()
+        ideogram.data['strokes'] = [{'id': 1, 'points': [[0, 0], [1, 1]]}]
+        
+        features = ideogram.extract_features()
+        ideogram.generate_symbolic_representation(features)
+        comp_rep = ideogram.to_computational_representation()
+        history_length = len(ideogram.history)
+        
+        assert ideogram.extract_features() is features
+        ideogram.generate_symbolic_representation(features)
+        assert ideogram.to_computational_representation() is comp_rep
+        assert len(ideogram.history) == history_length
+        assert not ideogram.is_dirty('computational_representation')
+        
+        ideogram.data['strokes'].append({'id': 2, 'points': [[5, 5], [6, 6]]})
+        ideogram.mark_dirty('strokes')
+        assert ideogram.is_dirty('features') and ideogram.is_dirty('computational_representation')
+        
+        features = ideogram.extract_features()
+        ideogram.generate_symbolic_representation(features)
+        ideogram.to_computational_representation()
+        assert ideogram.render_tokens() == ['TOKEN_1', 'TOKEN_2']
+        
+        ideogram.data['symbolic_representation'] = {'symbols': [{'id': 7}]}
+        ideogram.to_computational_representation()
+        assert ideogram.render_tokens() == ['TOKEN_7']
+        
+    def test_token_vocabulary(self, tmp_path):
+        """Testa os tokens inteiros e o vocabulário persistente."""
+        import numpy as np
+        from src.core import TokenVocabulary
+        
+        ideogram = CoreIdeogram()
+        ideogram.data['strokes'] = [{'id': i, 'points': [[i, i], [i + 1, i]]} for i in (3, 1, 3)]
+        ideogram.generate_symbolic_representation(ideogram.extract_features())
+        tokens = ideogram.to_computational_representation()['tokens']
+        
+        assert isinstance(tokens, np.ndarray) and tokens.dtype == np.int32
+        assert tokens.tolist() == [0, 1, 0]
+        
+        path = str(tmp_path / 'vocabulary.bin')
+        ideogram.vocabulary.save(path)
+        ideogram.save(str(tmp_path / 'ideogram.json'))
+        
+        shared = TokenVocabulary.load(path)
+        assert isinstance(shared._hashes, np.memmap)
+        assert shared.encode(['TOKEN_1', 'TOKEN_9', 'TOKEN_3'], add=False).tolist() == [1, -1, 0]
+        assert shared.encode(['TOKEN_9']).tolist() == [2] and len(shared) == 3
+        
+        other = CoreIdeogram(vocabulary=shared)
+        other.data['strokes'] = [{'id': 9, 'points': []}, {'id': 1, 'points': []}]
+        other.generate_symbolic_representation(other.extract_features())
+        assert other.to_computational_representation()['tokens'].tolist() == [2, 1]
+        assert other.render_tokens() == ['TOKEN_9', 'TOKEN_1']
+
+
+class TestEmbeddings:
+    """Testes para os embeddings e o índice aproximado."""
+    
+    def _ideogram(self, strokes):
+        ideogram = CoreIdeogram()
+        ideogram.data['strokes'] = strokes
+        ideogram.generate_symbolic_representation(ideogram.extract_features())
+        ideogram.to_computational_representation()
+        return ideogram
+        
+    def test_batched_embeddings(self):
+        """Testa os embeddings por traço e o cálculo em lote de um corpus."""
+        import numpy as np
+        from src.core.embeddings import embed_corpus, STROKE_EMBEDDING_DIM
+        
+        first = self._ideogram([
+            {'id': 1, 'points': [[0, 0], [4, 0], [4, 4], [0, 0]], 'pressure': [0.5] * 4},
+            {'id': 2, 'points': [[3, 3], [9, 8]]}
+        ])
+        second = self._ideogram([{'id': 1, 'points': [[0, 0], [1, 5]]}])
+        
+        embeddings = first.data['computational_representation']['embeddings']
+        assert embeddings.dtype == np.float32 and embeddings.shape == (2, STROKE_EMBEDDING_DIM)
+        assert np.allclose(np.linalg.norm(embeddings, axis=1), 1.0)
+        
+        corpus = embed_corpus([first._features, second._features, CoreIdeogram().extract_features()],
+                              [[1, 1], [0], []])
+        assert np.allclose(corpus[0], first.embedding(), atol=1e-6)
+        assert np.allclose(corpus[1], second.embedding(), atol=1e-6)
+        assert not corpus[2].any()
+        
+    def test_ivf_index(self, tmp_path, monkeypatch):
+        """Testa a busca aproximada e a persistência mapeada em memória."""
+        import numpy as np
+        from src.core import IVFIndex
+        
+        rng = np.random.default_rng(0)
+        vectors = rng.normal(size=(2000, 8)).astype(np.float32)
+        index = IVFIndex.build(vectors, ids=np.arange(2000) + 100, nlist=16, nprobe=16)
+        
+        ids, distances = index.search(vectors[:5], k=3)
+        assert ids[:, 0].tolist() == [100, 101, 102, 103, 104]
+        assert np.allclose(distances[:, 0], 0.0, atol=1e-4)
+        
+        # Busca em lote (agrupada por lista) igual à busca consulta a consulta
+        queries = rng.normal(size=(64, 8)).astype(np.float32)
+        batch_ids, batch_distances = index.search(queries, k=5, nprobe=4)
+        for row, query in enumerate(queries):
+            single_ids, single_distances = index.search(query, k=5, nprobe=4)
+            assert single_ids[0].tolist() == batch_ids[row].tolist()
+            assert np.allclose(single_distances[0], batch_distances[row], atol=1e-3)
+        
+        # Blocos e partes pequenos (memória limitada) não mudam o resultado
+        from src.core import embeddings
+        monkeypatch.setattr(embeddings, '_SEARCH_BLOCK_SIZE', 64)
+        assert index.search(queries, k=5, nprobe=4)[0].tolist() == batch_ids.tolist()
+        assert index.search(queries[0], k=5, nprobe=4)[0].tolist() == batch_ids[:1].tolist()
+        
+        index.save(str(tmp_path / 'index'))
+        loaded = IVFIndex.load(str(tmp_path / 'index'))
+        assert isinstance(loaded.vectors, np.memmap) and len(loaded) == 2000
+        assert loaded.search(vectors[7], k=1)[0][0, 0] == 107
+
+
+class TestCorpusIndex:
+    """Testes para o índice invertido do corpus."""
+    
+    def _manuscript(self, types):
+        categories = {'closed_symbol': 'noun', 'curved_symbol': 'verb', 'linear_symbol': 'adjective'}
+        layer2_data = {'symbols': [{'type': symbol_type} for symbol_type in types]}
+        layer3_data = {'linguistic_units': [{'category': categories[t]} for t in types]}
+        return layer2_data, layer3_data
+        
+    def test_varint_postings_roundtrip(self):
+        """Testa a compressão das listas de postings."""
+        import numpy as np
+        from src.core.corpus_index import decode_postings, decode_varints, encode_postings, encode_varints
+        
+        values = np.array([0, 1, 127, 128, 300, 2 ** 40, 2 ** 63], dtype=np.uint64)
+        assert decode_varints(encode_varints(values)).tolist() == values.tolist()
+        
+        documents, positions = np.array([0, 0, 3, 3, 3, 9]), np.array([1, 5, 0, 2, 7, 4])
+        decoded = decode_postings(encode_postings(documents, positions))
+        assert decoded[0].tolist() == documents.tolist() and decoded[1].tolist() == positions.tolist()
+        
+    def test_boolean_and_phrase_queries(self, tmp_path):
+        """Testa consultas booleanas, de frase e appends incrementais."""
+        from src.core import CorpusIndex
+        
+        index = CorpusIndex(str(tmp_path / 'index'))
+        index.add('a', *self._manuscript(['closed_symbol', 'curved_symbol', 'linear_symbol']), tokens=[0, 1, 2])
+        index.add('b', *self._manuscript(['curved_symbol', 'closed_symbol']), tokens=[1, 0])
+        index.commit()
+        index.add('c', *self._manuscript(['linear_symbol', 'closed_symbol', 'curved_symbol']), tokens=[2, 0, 1])
+        index.commit()
+        
+        reopened = CorpusIndex(str(tmp_path / 'index'))
+        assert len(reopened) == 3 and len(reopened.segment_names) == 2
+        assert reopened.names(reopened.query(all_of=['type:closed_symbol', 'category:adjective'])) == ['a', 'c']
+        assert reopened.names(reopened.query(any_of=['token:2'], none_of=['type:linear_symbol'])) == []
+        assert reopened.names(reopened.query(none_of=['category:adjective'])) == ['b']
+        
+        documents, starts = reopened.phrase(['category:noun', 'category:verb'])
+        assert reopened.names(documents) == ['a', 'c'] and starts.tolist() == [0, 1]
+        
+        reopened.compact()
+        assert len(reopened.segment_names) == 1
+        assert reopened.phrase(['token:1', 'type:closed_symbol'])[0].tolist() == [1]
+        
+    def test_manifest_lists_only_segments(self, tmp_path):
+        """Testa que os nomes ficam nos segmentos e que índices da versão 1 ainda abrem."""
+        import json
+        import numpy as np
+        from src.core import CorpusIndex
+        from src.core.corpus_index import SEGMENT_MAGIC, _SEGMENT_HEADER, encode_postings
+        
+        directory = tmp_path / 'index'
+        directory.mkdir()
+        # Índice da versão 1: segmento só com termos, nomes no manifesto
+        blob = encode_postings(np.array([0, 1]), np.array([0, 0]))
+        terms = json.dumps({'token:0': [0, len(blob), 2]}).encode('utf-8')
+        (directory / 'segment-000001.seg').write_bytes(
+            _SEGMENT_HEADER.pack(SEGMENT_MAGIC, 1, len(terms)) + terms + blob)
+        (directory / 'index.json').write_text(json.dumps(
+            {'version': 1, 'segments': ['segment-000001.seg'], 'manuscripts': ['old-a', 'old-b']}))
+        
+        index = CorpusIndex(str(directory))
+        index.add('new', tokens=[0])
+        index.commit()
+        manifest = json.loads((directory / 'index.json').read_text())
+        assert manifest['manuscripts'] == ['old-a', 'old-b']
+        index.add('newer', tokens=[1])
+        index.commit()
+        assert json.loads((directory / 'index.json').read_text())['manuscripts'] == ['old-a', 'old-b']
+        
+        reopened = CorpusIndex(str(directory))
+        assert reopened.names(reopened.query(all_of=['token:0'])) == ['old-a', 'old-b', 'new']
+        reopened.compact()
+        assert json.loads((directory / 'index.json').read_text()) == {
+            'version': 2, 'segments': ['segment-000004.seg']}
+        assert CorpusIndex(str(directory)).manuscripts == ['old-a', 'old-b', 'new', 'newer']
 
 class TestAmplificationEngine:
     """Testes para a Amplification Engine."""
@@ -74,4 +344,444 @@ class TestAmplificationEngine:
         
         result = engine.amplify(input_data, 'layer1', 'layer2')
         assert 'symbols' in result
-        assert 'transformation_info' in result
\ No newline at end of file
+        assert 'transformation_info' in result
+        
+    def test_efficiency_from_measurements(self):
+        """Testa a eficiência calculada a partir das medições reais."""
+        from src.core.amplification_engine import Layer1ToLayer2Transformer
+        
+        engine = AmplificationEngine({'track_memory': True})
+        engine.register_transformer('layer1_to_layer2', Layer1ToLayer2Transformer())
+        
+        input_data = {'strokes': [{'id': i, 'points': [[0, 0], [1, i]]} for i in range(5)]}
+        for _ in range(3):
+            engine.amplify(input_data, 'layer1', 'layer2')
+            
+        measurement = engine.last_measurement
+        assert measurement['input_items'] == 5
+        assert measurement['time_per_item'] > 0
+        assert measurement['memory_per_item'] is not None
+        
+        efficiency = engine.get_transformation_quality()['efficiency']
+        assert 0.0 < efficiency <= 1.0
+        
+        stats = engine.get_performance_stats()['layer1_to_layer2']
+        assert stats['time_per_item']['count'] == 3
+        assert engine.history[-1]['params']['input_items'] == 5
+
+    def test_optimize_transformations_tunes_settings(self, tmp_path):
+        """Testa o ajuste adaptativo dos parâmetros dos transformadores."""
+        from src.core.amplification_engine import Layer1ToLayer2Transformer
+        
+        engine = AmplificationEngine()
+        transformer = Layer1ToLayer2Transformer({'tuning_min_samples': 1})
+        engine.register_transformer('layer1_to_layer2', transformer)
+        
+        input_data = {'strokes': [{'id': i, 'points': [[0, 0], [1, i], [0, 0]]} for i in range(20)]}
+        reference = engine.amplify(input_data, 'layer1', 'layer2')
+        
+        explored = set()
+        for _ in range(12):
+            engine.optimize_transformations()
+            explored.add(tuple(sorted(transformer.get_tuned_settings().items())))
+            result = engine.amplify(input_data, 'layer1', 'layer2')
+            assert result['symbols'] == reference['symbols']
+            assert result['relationships'] == reference['relationships']
+            
+        assert len(explored) > 1
+        for name, candidates in transformer.tunable_parameters.items():
+            assert transformer.get_config()[name] in candidates
+            
+        filepath = tmp_path / 'state.json'
+        engine.save_state(str(filepath), format='json')
+        saved = json.loads(filepath.read_text())
+        assert saved['transformer_configs']['layer1_to_layer2']['relationship_strategy'] == \
+            transformer.config['relationship_strategy']
+        
+    def test_optimize_skips_inert_parameters(self):
+        """Testa que parâmetros sem efeito na configuração atual não são explorados."""
+        from src.core.amplification_engine import Layer1ToLayer2Transformer
+        
+        class ScalarTransformer(Layer1ToLayer2Transformer):
+            tunable_parameters = dict(Layer1ToLayer2Transformer.tunable_parameters, vectorized=[False])
+            
+        engine = AmplificationEngine()
+        transformer = ScalarTransformer({'tuning_min_samples': 1})
+        engine.register_transformer('layer1_to_layer2', transformer)
+        input_data = {'strokes': [{'id': i, 'points': [[0, 0], [1, i]]} for i in range(10)]}
+        
+        for _ in range(12):
+            engine.amplify(input_data, 'layer1', 'layer2')
+            engine.optimize_transformations()
+            assert transformer.config['batch_size'] == 0
+            
+        assert 'batch_size' not in transformer.active_parameters()
+        assert 'batch_size' in transformer.active_parameters({'vectorized': True})
+        recorded = [entry['params']['settings'] for entry in engine.history if entry['operation'] == 'amplify']
+        assert all('batch_size' not in settings for settings in recorded)
+        assert {settings['cache_size'] for settings in recorded} == {0, 64}
+
+    def test_transformer_config_is_copied(self):
+        """Testa que transformadores não compartilham a configuração recebida."""
+        from src.core.amplification_engine import Layer1ToLayer2Transformer
+
+        shared = {'tuning_min_samples': 1}
+        first = Layer1ToLayer2Transformer(shared)
+        second = Layer1ToLayer2Transformer(shared)
+        first.config['relationship_strategy'] = 'other'
+
+        assert shared == {'tuning_min_samples': 1}
+        assert second.config['relationship_strategy'] != 'other'
+
+    def test_binary_state_roundtrip(self, tmp_path):
+        """Testa o snapshot binário (ida e volta sem perdas)."""
+        import numpy as np
+        from src.core import snapshot
+        from src.core.amplification_engine import Layer1ToLayer2Transformer
+        
+        engine = AmplificationEngine({'snapshot_compression': 'zlib', 'state_retention': 'full'})
+        engine.register_transformer('layer1_to_layer2', Layer1ToLayer2Transformer({'cache_size': 64}))
+        input_data = {'strokes': [{'id': i, 'points': [[0, 0], [1, i]]} for i in range(4)]}
+        engine.amplify(input_data, 'layer1', 'layer2')
+        
+        filepath = str(tmp_path / 'state.snap')
+        engine.save_state(filepath)
+        
+        restored = AmplificationEngine()
+        restored.load_state(filepath)
+        
+        assert restored.config == engine.config
+        assert restored.current_state == engine.current_state
+        # O histórico fica colunar: nenhum registro é montado na carga
+        assert isinstance(restored.history, snapshot.HistoryTable)
+        assert restored.history._entries[:2] == [None, None]
+        # O snapshot contém o histórico anterior ao próprio 'save_state'
+        assert [e['operation'] for e in restored.history] == ['register_transformer', 'amplify', 'load_state']
+        for original, loaded in zip(engine.history[:-1], restored.history[:-1]):
+            assert loaded['operation'] == original['operation']
+            assert isinstance(loaded['timestamp'], np.datetime64)
+            assert loaded['timestamp'] == original['timestamp']
+            assert loaded['params'] == original['params']
+            
+        transformer = restored.transformers['layer1_to_layer2']
+        assert isinstance(transformer, Layer1ToLayer2Transformer)
+        assert transformer.get_config()['cache_size'] == 64
+        
+        del restored.history[0]
+        restored.history.insert(0, engine.history[0])
+        assert restored.history[:2] == engine.history[:2]
+        restored.save_state(str(tmp_path / 'state.json'), format='json')
+        reloaded = AmplificationEngine()
+        reloaded.load_state(str(tmp_path / 'state.json'))
+        assert [e['operation'] for e in reloaded.history] == \
+            ['register_transformer', 'amplify', 'load_state', 'load_state']
+        
+    def test_columnar_history(self):
+        """Testa a codificação colunar do histórico com tipos misturados."""
+        import numpy as np
+        from src.core import snapshot
+
+        history = [
+            {'operation': 'op', 'timestamp': np.datetime64('2024-01-01T00:00:00'),
+             'params': {'id': value, 'settings': {'mode': 'a', 'n': value}}}
+            for value in (True, 1, 1.0, 1)
+        ] + [
+            {'operation': 'raw', 'timestamp': np.datetime64('2024-01-02T00:00:00'),
+             'params': {'array': np.arange(3), 'nested': {'a': [1, 2]}}},
+            {'operation': 'raw', 'timestamp': np.datetime64('2024-01-03T00:00:00'),
+             'params': ['not', 'a', 'dict']},
+            {'operation': 'op', 'timestamp': np.datetime64('2024-01-04T00:00:00'), 'params': {}}
+        ]
+        decoded = snapshot.decode_history(snapshot.encode_history(history))
+
+        assert [entry['operation'] for entry in decoded] == [entry['operation'] for entry in history]
+        assert [entry['timestamp'] for entry in decoded] == [entry['timestamp'] for entry in history]
+        assert [type(entry['params']['id']) for entry in decoded[:4]] == [bool, int, float, int]
+        assert [entry['params']['settings'] for entry in decoded[:4]] == \
+            [entry['params']['settings'] for entry in history[:4]]
+        assert type(decoded[2]['params']['settings']['n']) is float
+        assert decoded[1]['params']['settings'] is not decoded[3]['params']['settings']
+        assert np.array_equal(decoded[4]['params']['array'], np.arange(3))
+        assert decoded[4]['params']['nested'] == {'a': [1, 2]}
+        assert decoded[5]['params'] == ['not', 'a', 'dict']
+        assert decoded[6]['params'] == {}
+
+    def test_snapshot_rejects_unknown_files(self, tmp_path):
+        """Testa a validação do cabeçalho do snapshot."""
+        from src.core import snapshot
+        
+        filepath = tmp_path / 'bogus.snap'
+        filepath.write_bytes(b'NOTASNAPSHOT')
+        with pytest.raises(ValueError):
+            snapshot.read_snapshot(str(filepath))
+
+    def test_snapshot_values_and_class_allowlist(self, tmp_path):
+        """Testa a codificação JSON das seções e a lista de classes permitidas."""
+        import numpy as np
+        from src.core import snapshot
+
+        value = {'t': (1, 'a'), 1: np.float32(2.5), 'a': np.arange(6).reshape(2, 3),
+                 'when': np.datetime64('2024-01-01T00:00:00'), 'nan': float('nan')}
+        decoded = snapshot.decode_value(snapshot.encode_value(value))
+        assert decoded['t'] == (1, 'a')
+        assert decoded[1] == np.float32(2.5) and isinstance(decoded[1], np.float32)
+        assert np.array_equal(decoded['a'], value['a'])
+        assert decoded['when'] == value['when']
+        assert np.isnan(decoded['nan'])
+
+        filepath = str(tmp_path / 'hostile.snap')
+        sections = snapshot.encode_history([])
+        sections['engine'] = snapshot.encode_value({
+            'config': {}, 'transformers': {'evil': {'class': 'os:system', 'config': None}}
+        })
+        sections['current_state'] = snapshot.encode_value(None)
+        snapshot.write_snapshot(filepath, sections)
+        with pytest.raises(ValueError, match='not registered'):
+            AmplificationEngine().load_state(filepath)
+
+    def test_state_retention_modes(self):
+        """Testa os modos de retenção de estado."""
+        from src.core.amplification_engine import Layer1ToLayer2Transformer
+        
+        input_data = {'strokes': [{'id': i, 'points': [[0, 0], [1, i]]} for i in range(3)]}
+        # None: configuração padrão, que mantém apenas o resumo
+        for mode in (None, 'full', 'weak', 'summary', 'none'):
+            engine = AmplificationEngine({} if mode is None else {'state_retention': mode})
+            engine.register_transformer('layer1_to_layer2', Layer1ToLayer2Transformer())
+            engine.amplify(input_data, 'layer1', 'layer2')
+            
+            state = engine.current_state
+            if mode == 'none':
+                assert state is None
+            else:
+                assert state['summary']['input_items'] == 3
+                assert ('input_data' in state) == (mode == 'full')
+            assert engine.history[-1]['params']['input_items'] == 3
+                
+            quality = engine.get_transformation_quality()
+            assert quality['completeness'] == 1.0
+            assert 'overall_quality' in quality
+
+    def test_weak_retention_references_live_payloads(self):
+        """Testa que o modo 'weak' alcança a saída enquanto ela estiver viva."""
+        import gc
+        from src.core.amplification_engine import Layer1ToLayer2Transformer, StatePayload
+
+        engine = AmplificationEngine({'state_retention': 'weak'})
+        engine.register_transformer('layer1_to_layer2', Layer1ToLayer2Transformer())
+        input_data = StatePayload({'strokes': [{'id': 0, 'points': [[0, 0], [1, 1]]}]})
+        result = engine.amplify(input_data, 'layer1', 'layer2')
+
+        assert isinstance(result, StatePayload)
+        assert engine.current_state['output_ref']() is result
+        assert engine.current_state['input_ref']() is input_data
+
+        del result
+        gc.collect()
+        assert engine.current_state['output_ref']() is None
+
+
+class TestRollingHistogram:
+    """Testes para o histograma de janela deslizante."""
+    
+    def test_quantiles(self):
+        """Testa a estimativa de quantis."""
+        from src.core.metrics import RollingHistogram
+        
+        histogram = RollingHistogram()
+        for value in [1e-3] * 90 + [1.0] * 10:
+            histogram.record(value)
+            
+        assert histogram.count == 100
+        assert histogram.quantile(0.5) == pytest.approx(1e-3, rel=0.2)
+        assert histogram.quantile(0.99) == pytest.approx(1.0, rel=0.2)
+        
+    def test_window_rolls(self):
+        """Testa o descarte das amostras antigas."""
+        from src.core.metrics import RollingHistogram
+        
+        histogram = RollingHistogram(window=10)
+        for _ in range(10):
+            histogram.record(1.0)
+        for _ in range(20):
+            histogram.record(1e-3)
+            
+        assert histogram.count == 10
+        assert histogram.quantile(0.99) == pytest.approx(1e-3, rel=0.2)
+
+
+class TestMetricsRegistry:
+    """Testes para o registro de métricas em processo."""
+    
+    def test_timed_records_latency_and_errors(self):
+        """Testa a instrumentação de chamadas bem-sucedidas e com erro."""
+        from src.core.metrics import MetricsRegistry
+        
+        registry = MetricsRegistry()
+        
+        @registry.timed('op')
+        def operation(fail=False):
+            if fail:
+                raise RuntimeError("boom")
+            return 42
+            
+        assert operation() == 42
+        with pytest.raises(RuntimeError):
+            operation(fail=True)
+            
+        snapshot = registry.snapshot()
+        assert snapshot['operations']['op']['calls'] == 2
+        assert snapshot['operations']['op']['errors'] == 1
+        assert snapshot['error_rate'] == pytest.approx(0.5)
+        assert snapshot['throughput'] > 0
+        assert snapshot['memory_usage'] > 0
+        
+    def test_latency_histogram_precision(self):
+        """Testa o erro relativo dos quantis do histograma."""
+        from src.core.metrics import LatencyHistogram
+        
+        histogram = LatencyHistogram()
+        for value in [2e-3] * 95 + [1.5] * 5:
+            histogram.record(value)
+            
+        assert histogram.quantile(0.5) == pytest.approx(2e-3, rel=1 / 16)
+        assert histogram.quantile(0.99) == pytest.approx(1.5, rel=1 / 16)
+        
+    def test_windowed_counter_and_quantiles(self):
+        """Testa a janela deslizante de contagens e os quantis em lote."""
+        from src.core.metrics import LatencyHistogram, WindowedCounter
+        
+        counter = WindowedCounter(window=10.0, slots=10)
+        counter.add(100.0, 5)
+        counter.add(105.5)
+        assert counter.total(106.0) == 6
+        assert counter.total(112.0) == 1
+        assert counter.total(120.0) == 0
+        
+        histogram = LatencyHistogram()
+        assert histogram.quantiles((0.0, 0.5)) == [None, None]
+        histogram.record(0.25)
+        assert histogram.quantiles((0.0, 1.0)) == [0.25, 0.25]
+        
+    def test_alert_evaluation(self):
+        """Testa a avaliação das condições de alerta."""
+        from src.core.metrics import MetricsRegistry
+        
+        registry = MetricsRegistry()
+        registry.observe('op', 1.5)
+        registry.observe('op', 0.1, error=True)
+        alerts = [
+            {'name': 'high_error_rate', 'condition': 'error_rate > 5%', 'action': 'notify'},
+            {'name': 'high_latency', 'condition': 'response_time > 1000ms', 'action': 'scale'},
+            {'name': 'huge_latency', 'condition': 'response_time > 10s', 'action': 'scale'}
+        ]
+        
+        status = {alert['name']: alert['firing'] for alert in registry.evaluate_alerts(alerts)}
+        assert status == {'high_error_rate': True, 'high_latency': True, 'huge_latency': False}
+        
+        with pytest.raises(ValueError):
+            registry.evaluate_alerts([{'name': 'bad', 'condition': 'cpu is high', 'action': 'x'}])
+            
+    def test_exporters(self, tmp_path):
+        """Testa a exportação para arquivo e via HTTP."""
+        import urllib.request
+        from src.core.metrics import MetricsRegistry
+        
+        registry = MetricsRegistry()
+        registry.observe('layer1.preprocess', 0.01)
+        
+        filepath = tmp_path / "metrics.prom"
+        registry.write_file(str(filepath))
+        content = filepath.read_text()
+        assert 'jals_layer1_preprocess_response_time_seconds_count 1' in content
+        
+        server = registry.serve_http(0)
+        try:
+            url = f"http://127.0.0.1:{server.server_address[1]}/metrics.json"
+            with urllib.request.urlopen(url) as response:
+                data = json.loads(response.read())
+        finally:
+            server.shutdown()
+            server.server_close()
+        assert data['operations']['layer1.preprocess']['calls'] == 1
+
+
+class TestTracing:
+    """Testes para o tracer local."""
+    
+    def test_spans_have_parent_links(self, tmp_path):
+        """Testa a criação de spans aninhados em formato Zipkin."""
+        from src.core import tracing
+        from src.core.amplification_engine import (
+            Layer1ToLayer2Transformer, Layer2ToLayer3Transformer
+        )
+        
+        engine = AmplificationEngine()
+        engine.register_transformer('layer1_to_layer2', Layer1ToLayer2Transformer())
+        engine.register_transformer('layer2_to_layer3', Layer2ToLayer3Transformer())
+        
+        trace_file = tmp_path / "trace.ndjson"
+        tracing.configure(str(trace_file), sample_rate=1.0)
+        try:
+            engine.multi_layer_amplify({'strokes': [{'id': 1}]}, ['layer1', 'layer2', 'layer3'])
+        finally:
+            tracing.configure(None)
+            
+        spans = [json.loads(line) for line in trace_file.read_text().splitlines()]
+        root = next(span for span in spans if span['name'] == 'engine.multi_layer_amplify')
+        hops = [span for span in spans if span['name'] == 'engine.amplify']
+        
+        assert 'parentId' not in root and len(hops) == 2
+        assert all(hop['parentId'] == root['id'] and hop['traceId'] == root['traceId'] for hop in hops)
+        assert {hop['tags']['transformer'] for hop in hops} == {'layer1_to_layer2', 'layer2_to_layer3'}
+        
+    def test_head_based_sampling(self, tmp_path):
+        """Testa que requisições não amostradas não geram spans."""
+        from src.core.tracing import Tracer
+        
+        trace_file = tmp_path / "trace.ndjson"
+        tracer = Tracer(str(trace_file), sample_rate=1e-12)
+        
+        @tracer.traced('child')
+        def child():
+            return 1
+            
+        @tracer.traced('root')
+        def root():
+            return child() + child()
+            
+        assert root() == 2
+        assert not trace_file.exists() and tracer.spans_recorded == 0
+        
+        tracer.configure(str(trace_file), sample_rate=1.0)
+        root()
+        assert tracer.spans_recorded == 3
+        
+        with pytest.raises(ValueError):
+            tracer.configure(str(trace_file), sample_rate=2.0)
+
+class TestLazyImports:
+    """Testes para a importação sob demanda dos componentes."""
+    
+    def test_engine_import_skips_heavy_dependencies(self):
+        """Testa que importar a engine não carrega camadas, OpenCV ou SciPy."""
+        import subprocess
+        import sys
+        
+        code = (
+            "import sys\n"
+            "from src import AmplificationEngine\n"
+            "print(','.join(m for m in ('cv2', 'scipy', 'src.layers') if m in sys.modules))\n"
+        )
+        output = subprocess.run([sys.executable, '-c', code], check=True,
+                                stdout=subprocess.PIPE, universal_newlines=True).stdout
+        assert output.strip() == ''
+        
+    def test_lazy_attributes(self):
+        """Testa o acesso aos componentes exportados."""
+        import src
+        
+        assert src.Layer1.__name__ == 'Layer1'
+        assert 'Layer4' in dir(src)
+        with pytest.raises(AttributeError):
+            src.MissingComponent
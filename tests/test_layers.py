@@ -0,0 +1,647 @@
+import pytest
+from src.layers import Layer1, Layer2, Layer4, ManuscriptDeduplicator
+
+
+class TestLayer1:
+    """Testes para a Layer 1."""
+    
+    def _strokes(self, seed, num_strokes=40, jitter=0.0):
+        import numpy as np
+        rng = np.random.default_rng(seed)
+        strokes = []
+        for i in range(num_strokes):
+            start = rng.uniform(0, 500, 2)
+            steps = rng.normal(0, 6, (rng.integers(4, 20), 2))
+            points = start + np.cumsum(steps, axis=0)
+            points += np.random.default_rng(1000 + i).normal(0, jitter, points.shape)
+            strokes.append({'points': points.tolist()})
+        return strokes
+        
+    def test_near_duplicate_detection(self, tmp_path):
+        """Testa a detecção de quase duplicatas antes do pré-processamento."""
+        path = tmp_path / 'signatures.bin'
+        layer1 = Layer1(deduplicator=ManuscriptDeduplicator(str(path), threshold=0.7))
+        
+        first = layer1.preprocess({'strokes': self._strokes(1), 'metadata': {'id': 'a'}})
+        assert 'duplicate' not in first['preprocessing_info'] and len(first['strokes']) == 40
+        other = layer1.preprocess({'strokes': self._strokes(2), 'metadata': {'id': 'b'}})
+        assert 'duplicate' not in other['preprocessing_info']
+        
+        copy = layer1.preprocess({'strokes': self._strokes(1, jitter=0.01), 'metadata': {'id': 'c'}})
+        assert copy['preprocessing_info']['duplicate']['duplicate_of'] == 'a'
+        assert copy['preprocessing_info']['duplicate']['similarity'] >= 0.7
+        assert len(copy['strokes']) == 40
+        
+        # As assinaturas persistem entre instâncias
+        reopened = ManuscriptDeduplicator(str(path), threshold=0.7, action='skip')
+        assert reopened.names == ['a', 'b']
+        skipped = Layer1(deduplicator=reopened).preprocess({'strokes': self._strokes(2), 'metadata': {}})
+        assert skipped['preprocessing_info']['skipped'] and skipped['strokes'] == []
+        
+        with pytest.raises(ValueError):
+            ManuscriptDeduplicator(str(path), num_perm=64)
+            
+        # Registro final cortado (na assinatura, no nome ou no prefixo de
+        # tamanho): é descartado e os próximos acréscimos seguem íntegros
+        full_size = path.stat().st_size
+        for cut in (1, 512, 514, 516):
+            with open(path, 'r+b') as f:
+                f.truncate(full_size)
+            writer = ManuscriptDeduplicator(str(path), threshold=0.7)
+            writer.add('dé', writer.signature({'strokes': self._strokes(3)}))
+            with open(path, 'r+b') as f:
+                f.truncate(path.stat().st_size - cut)
+            recovered = ManuscriptDeduplicator(str(path), threshold=0.7)
+            assert recovered.names == ['a', 'b'] and path.stat().st_size == full_size
+            recovered.add('e', recovered.signature({'strokes': self._strokes(4)}))
+            assert ManuscriptDeduplicator(str(path), threshold=0.7).names == ['a', 'b', 'e']
+            
+        # Cabeçalho incompleto: o arquivo é recriado no próximo acréscimo
+        with open(path, 'r+b') as f:
+            f.truncate(5)
+        recreated = ManuscriptDeduplicator(str(path))
+        assert len(recreated) == 0
+        recreated.add('f', recreated.signature({'strokes': self._strokes(5)}))
+        assert ManuscriptDeduplicator(str(path)).names == ['f']
+
+
+    def test_stroke_simplification_and_resampling(self):
+        """Testa a reamostragem e a simplificação em lote com limites de erro."""
+        import numpy as np
+        from benchmarks.synthetic import generate_manuscript
+        from src.layers.stroke_geometry import pack_strokes, simplify
+        
+        manuscript = generate_manuscript(20, 200, seed=5)
+        layer1 = Layer1()
+        assert 'geometry' not in layer1.preprocess(manuscript)['preprocessing_info']
+        
+        layer1.config.update({'simplify_tolerance': 0.5})
+        processed = layer1.preprocess(manuscript)
+        report = processed['preprocessing_info']['geometry']
+        assert report['points_in'] == 4000 and report['points_out'] < 2000
+        assert report['simplify']['max_deviation'] <= 0.5
+        for original, stroke in zip(manuscript['strokes'], processed['strokes']):
+            assert stroke['points'][0] == original['points'][0]
+            assert stroke['points'][-1] == original['points'][-1]
+            assert len(stroke['pressure']) == len(stroke['timestamps']) == len(stroke['points'])
+            
+        layer1.config.update({'simplify_tolerance': None, 'resample_spacing': 2.0})
+        processed = layer1.preprocess(manuscript)
+        assert processed['preprocessing_info']['geometry']['resample']['max_deviation'] < 2.0
+        for stroke in processed['strokes']:
+            steps = np.hypot(*np.diff(np.array(stroke['points']), axis=0).T)
+            assert steps.max() <= 2.0 + 1e-9
+            assert np.all(np.diff(stroke['timestamps']) > 0)
+            
+        # Traço vazio não ganha canais e não quebra o lote
+        processed = layer1.preprocess({'strokes': [{'points': [[0, 0], [3, 4]]}, {'points': []}]})
+        assert len(processed['strokes'][0]['points']) == 4
+        assert processed['strokes'][1] == {'points': []}
+        
+        # Traço em zigue-zague: só os vértices sobrevivem
+        points, offsets = pack_strokes([[[0, 0], [1, 0.1], [2, 0], [3, 3], [4, 0]], [[0, 0]], []])
+        keep, error = simplify(points, offsets, 0.2)
+        assert keep.tolist() == [True, False, True, True, True, True] and error == pytest.approx(0.1)
+
+
+    def test_noise_filtering(self):
+        """Testa a filtragem em lote por traço e o filtro com estado por blocos."""
+        import numpy as np
+        from scipy import signal
+        from benchmarks.synthetic import generate_manuscript
+        from src.layers.filters import filter_batch
+        
+        manuscript = generate_manuscript(12, 50, seed=2)
+        manuscript['strokes'][4]['points'] = manuscript['strokes'][4]['points'][:3]
+        del manuscript['strokes'][4]['pressure']
+        layer1 = Layer1()
+        
+        for method in ('savgol', 'lowpass'):
+            layer1.config['noise_filter'] = method
+            processed = layer1.preprocess(manuscript)
+            for original, stroke in zip(manuscript['strokes'], processed['strokes']):
+                points = np.array(original['points'])
+                alone = filter_batch(points, np.array([0, len(points)]), method)
+                assert np.allclose(stroke['points'], alone)
+                assert np.median(np.abs(alone - points)) < 0.5
+            assert 'pressure' not in processed['strokes'][4]
+            
+        chunks = np.random.default_rng(0).normal(size=(200, 3))
+        stream = layer1.stream_filter()
+        streamed = np.concatenate([stream.process(chunk) for chunk in np.array_split(chunks, 9)])
+        b, a = signal.butter(2, 0.25)
+        expected, _ = signal.lfilter(b, a, chunks, axis=0, zi=signal.lfilter_zi(b, a)[:, None] * chunks[0])
+        assert np.allclose(streamed, expected)
+        
+        with pytest.raises(ValueError):
+            filter_batch(chunks, np.array([0, 200]), 'savgol', window=4)
+
+
+    def test_statistical_moments(self):
+        """Testa os momentos por traço e a combinação em globais, blocos e partes."""
+        import numpy as np
+        from scipy import stats
+        from benchmarks.synthetic import generate_manuscript
+        from src.layers.moments import Moments
+        
+        manuscript = generate_manuscript(6, 40, seed=9)
+        del manuscript['strokes'][2]['pressure']
+        layer1 = Layer1()
+        features = layer1.extract_features(layer1.preprocess(manuscript))
+        encoded = layer1.encode(features)
+        
+        for original, statistical in zip(manuscript['strokes'], features['statistical']):
+            pressure = np.array(original.get('pressure', []))
+            if not len(pressure):
+                assert statistical == {'mean': 0.0, 'std': 0.0, 'skewness': 0.0, 'kurtosis': 0.0}
+                continue
+            assert statistical['mean'] == pytest.approx(pressure.mean())
+            assert statistical['std'] == pytest.approx(pressure.std())
+            assert statistical['skewness'] == pytest.approx(stats.skew(pressure))
+            assert statistical['kurtosis'] == pytest.approx(stats.kurtosis(pressure))
+            
+        everything = np.concatenate([stroke['pressure'] for stroke in manuscript['strokes'] if 'pressure' in stroke])
+        expected = {'mean': everything.mean(), 'std': everything.std(),
+                    'skewness': stats.skew(everything), 'kurtosis': stats.kurtosis(everything)}
+        assert encoded['global_features']['statistical'] == pytest.approx(expected)
+        
+        streamed = Moments.empty()
+        for chunk in np.array_split(everything, 7):
+            streamed.update(chunk)
+        left = Moments.from_segments(everything[:90], [0, 30, 90])
+        right = Moments.from_segments(everything[90:], [0, 50, len(everything) - 90])
+        for combined in (streamed, left.merge(right).total()):
+            assert combined.to_dicts()[0] == pytest.approx(expected)
+        
+        # Canal constante: o arredondamento da média não vira assimetria/curtose
+        flat = Moments.from_segments(np.full(6, 0.1), [0, 3, 6])
+        streamed = Moments.empty()
+        for chunk in np.array_split(np.full(100, 0.1), 7):
+            streamed.update(chunk)
+        for constant in (flat, streamed):
+            assert constant.skewness.tolist() == constant.kurtosis.tolist() == [0.0] * len(constant)
+
+
+    def test_columnar_encoding(self):
+        """Testa a codificação colunar e as visões por traço sem cópia."""
+        import json
+        import numpy as np
+        from benchmarks.synthetic import generate_manuscript
+        from src.layers.feature_table import FeatureTable
+        
+        manuscript = generate_manuscript(8, 20, seed=4)
+        manuscript['strokes'][3]['id'] = 'extra'
+        layer1 = Layer1()
+        features = layer1.extract_features(layer1.preprocess(manuscript))
+        encoded = layer1.encode(features)
+        table = encoded['table']
+        
+        assert len(table) == len(encoded['strokes']) == 8
+        assert table.column('geometric.centroid').shape == (8, 2)
+        assert table.column('statistical.mean') is features['moments'].mean
+        assert [stroke['id'] for stroke in encoded['strokes']] == [0, 1, 2, 'extra', 4, 5, 6, 7]
+        
+        stroke = encoded['strokes'][5]
+        assert stroke['statistical']['std'] == features['statistical'][5]['std'] == table.column('statistical.std')[5]
+        assert np.shares_memory(stroke['geometric']['centroid'], table.column('geometric.centroid'))
+        assert stroke['kinematic']['velocity'] is table.column('kinematic.velocity')[5]
+        assert set(stroke) == {'id', 'geometric', 'kinematic', 'topological', 'statistical'}
+        
+        records = table.to_records()
+        json.dumps(records)
+        legacy = FeatureTable.from_features({family: [record[family] for record in records]
+                                             for family in table.families})
+        assert legacy.to_records()[2] == dict(records[2], id=2)
+        assert encoded['global_features']['total_strokes'] == 8
+        
+        # A saída codificada tem um caminho para JSON e conta os traços como itens
+        from src.core import AmplificationEngine
+        plain = json.loads(json.dumps(layer1.to_records(encoded)))
+        assert plain['strokes'] == records and 'table' not in plain
+        assert encoded['strokes'].to_records() == records
+        assert encoded['table'].family_rows('geometric').to_records()[5] == records[5]['geometric']
+        assert AmplificationEngine()._count_items(encoded) == 8
+        from src.core import snapshot
+        assert snapshot.decode_value(snapshot.encode_value(encoded['strokes'])) == records
+
+
+class TestLayer2:
+    """Testes para a Layer 2."""
+    
+    def _encoded(self):
+        import numpy as np
+        from src.layers.feature_table import FeatureTable, ragged
+        
+        table = FeatureTable.from_columns(['a', 'b', 'c', 'd'], {
+            'geometric': {'length': np.array([3.0, 1.0, 2.5, 0.0]), 'curvature': np.array([0.1, 0.9, 0.2, 0.0])},
+            'kinematic': {
+                'velocity': ragged([[1.0, 2.0, 4.0], [0.5], [], [2.0, 2.0]]),
+                'pressure_profile': ragged([[0.2, 0.4], [], [0.1, 0.1, 0.7], [1.0]])
+            },
+            'topological': {'loops': ragged([[], [], [[0, 3]], []])}
+        })
+        return {'strokes': table.rows(), 'table': table}
+        
+    def _assert_paths_match(self, layer_class=Layer2):
+        """Compara a abstração em lote com a conversão traço a traço."""
+        import warnings
+        import numpy as np
+        
+        encoded = self._encoded()
+        with warnings.catch_warnings():
+            # Médias de listas vazias no caminho traço a traço
+            warnings.simplefilter('ignore', RuntimeWarning)
+            result = layer_class().abstract(encoded)
+            expected = layer_class({'vectorized': False}).abstract(encoded)
+            
+        assert len(result['symbols']) == len(expected['symbols'])
+        for symbol, reference in zip(result['symbols'], expected['symbols']):
+            assert {key: symbol[key] for key in ('id', 'type', 'confidence', 'source_stroke')} == \
+                {key: reference[key] for key in ('id', 'type', 'confidence', 'source_stroke')}
+            assert symbol['properties'].keys() == reference['properties'].keys()
+            for name, value in reference['properties'].items():
+                assert np.isclose(symbol['properties'][name], value, equal_nan=True)
+        assert list(result['relationships']) == expected['relationships']
+        assert result['hierarchies'] == expected['hierarchies']
+        return result
+        
+    def test_vectorized_abstraction_matches_per_stroke(self, monkeypatch):
+        """Testa que a abstração em lote equivale à conversão traço a traço."""
+        from src.layers import layer2
+        
+        symbols = self._assert_paths_match()['symbols']
+        assert [symbol['type'] for symbol in symbols] == ['linear_symbol', 'curved_symbol', 'closed_symbol', 'linear_symbol']
+        
+        # As duas implementações partem das mesmas constantes
+        monkeypatch.setattr(layer2, '_CURVED_SYMBOL_CURVATURE', 0.05)
+        monkeypatch.setattr(layer2, '_SYMBOL_SYMMETRY', 0.25)
+        monkeypatch.setitem(layer2._SPATIAL_RELATIONSHIP, 'properties', {'distance': 2.0, 'orientation': 'vertical'})
+        result = self._assert_paths_match()
+        assert [symbol['type'] for symbol in result['symbols']][:2] == ['curved_symbol', 'curved_symbol']
+        assert result['symbols'][0]['properties']['symmetry'] == 0.25
+        assert result['relationships'][0]['properties'] == {'distance': 2.0, 'orientation': 'vertical'}
+        monkeypatch.setitem(layer2._SPATIAL_RELATIONSHIP, 'strength', 0.1)
+        assert len(self._assert_paths_match()['relationships']) == 0
+        
+        # Heurísticas sobrescritas sem o método em lote usam o caminho traço a traço
+        class CustomLayer2(Layer2):
+            def _compute_symmetry(self, stroke):
+                return stroke['geometric']['length'] / 10
+                
+            def _compute_relationship(self, symbol1, symbol2):
+                return dict(super()._compute_relationship(symbol1, symbol2), strength=0.9)
+                
+        result = self._assert_paths_match(CustomLayer2)
+        assert [symbol['properties']['symmetry'] for symbol in result['symbols']] == [0.3, 0.1, 0.25, 0.0]
+        assert {relationship['strength'] for relationship in result['relationships']} == {0.9}
+        
+    def test_symbols_are_built_on_demand(self):
+        """Testa que os dicionários dos símbolos só são montados quando acessados."""
+        import warnings
+        
+        layer2 = Layer2()
+        symbols = layer2._table_to_symbols(self._encoded()['table'])
+        assert len(symbols) == 4 and symbols.properties['size'].tolist() == [3.0, 1.0, 2.5, 0.0]
+        assert symbols._symbols == [None] * 4
+        assert symbols[2] is symbols[2] and symbols[2]['properties']['pressure_variation'] > 0
+        assert symbols._symbols.count(None) == 3
+        
+        # Relacionamentos e hierarquia saem das colunas, sem montar os símbolos
+        result = layer2.abstract(self._encoded())
+        relationships = result['relationships']
+        assert result['symbols']._symbols == [None] * 4
+        assert len(relationships) == 6 and relationships._relationships == [None] * 6
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            expected = Layer2({'vectorized': False}).abstract(self._encoded())
+        assert list(relationships) == expected['relationships']
+        assert relationships[-1] is relationships[5] and relationships[5]['target'] == 'd'
+        assert result['hierarchies'] == expected['hierarchies']
+
+
+    def test_symbol_library_matching(self, tmp_path, monkeypatch):
+        """Testa a reutilização de protótipos da biblioteca, a persistência e o $P."""
+        import sys
+        import numpy as np
+        from benchmarks.synthetic import generate_manuscript
+        from src.layers.symbol_library import SymbolLibrary
+        
+        layer1 = Layer1()
+        encoded = layer1.encode(layer1.extract_features(layer1.preprocess(generate_manuscript(12, 40, seed=1))))
+        symbols = Layer2().abstract(encoded)['symbols']
+        
+        library = SymbolLibrary()
+        library.learn(encoded['table'], symbols, rows=[0, 3, 7])
+        library.types = ['alpha', 'beta', 'gamma']
+        library.properties['symmetry'][:] = [0.1, 0.2, 0.3]
+        library.save(str(tmp_path / 'library'))
+        
+        layer2 = Layer2({'symbol_library': str(tmp_path / 'library')})
+        assert isinstance(layer2.symbol_library.vectors, np.memmap)
+        matched = layer2.abstract(encoded)['symbols']
+        assert [matched[i]['type'] for i in (0, 3, 7)] == ['alpha', 'beta', 'gamma']
+        assert [matched[i]['prototype'] for i in (0, 3, 7)] == ['prototype-0', 'prototype-1', 'prototype-2']
+        assert matched[3]['properties']['symmetry'] == 0.2
+        assert matched[3]['properties']['complexity'] == symbols[3]['properties']['complexity']
+        assert 'prototype' not in matched[1] and matched[1]['type'] == symbols[1]['type']
+        assert matched[1]['properties']['symmetry'] == symbols[1]['properties']['symmetry']
+        
+        monkeypatch.setitem(sys.modules, 'scipy.spatial', None)
+        fallback = SymbolLibrary.load(str(tmp_path / 'library'))
+        vectors = np.asarray(library.vectors)
+        assert fallback.match(vectors)[0].tolist() == [0, 1, 2]
+        assert fallback.match(vectors + 1000.0)[0].tolist() == [-1, -1, -1]
+        
+        t = np.linspace(0, 2 * np.pi, 60)
+        shapes = {
+            'circle': np.column_stack([np.cos(t), np.sin(t)]),
+            'line': np.column_stack([t, 0 * t]),
+            'zigzag': np.column_stack([t, np.abs((3 * t) % 2 - 1)])
+        }
+        recognizer = SymbolLibrary(columns=['x'])
+        for name, points in shapes.items():
+            recognizer.add([0.0], name, points=points, name=name)
+        recognizer.add([0.0], 'no_points')
+        rng = np.random.default_rng(0)
+        for name, points in shapes.items():
+            index, score = recognizer.recognize(points * 4 + 10 + rng.normal(0, 0.02, points.shape))
+            assert recognizer.names[index] == name and score < 0.5
+        assert recognizer.recognize(shapes['circle'], max_score=1e-9) == (-1, np.inf)
+
+
+class TestLayer4:
+    """Testes para a Layer 4."""
+    
+    def _layer3_data(self, num_units=3):
+        units = [{'id': i} for i in range(num_units)]
+        return {
+            'linguistic_units': units,
+            'semantic_network': {
+                'nodes': [{'id': i, 'concept': f"concept_{i}"} for i in range(num_units)]
+            },
+            'multimodal_representations': {}
+        }
+        
+    def test_compile_to_executable(self):
+        """Testa a geração de código a partir dos templates."""
+        data = self._layer3_data()
+        code = Layer4()._compile_to_executable(data['linguistic_units'], data['semantic_network'])
+        
+        assert code['procedural'] == "\n".join([
+            "def process_linguistic_units():",
+            "    results = []",
+            "    result = process_unit('0')", "    results.append(result)",
+            "    result = process_unit('1')", "    results.append(result)",
+            "    result = process_unit('2')", "    results.append(result)",
+            "    return results"
+        ])
+        assert "const units = [0, 1, 2];" in code['functional']
+        assert "this.units = [0, 1, 2];" in code['object_oriented']
+        assert "node('2', 'concept_2')." in code['declarative']
+        
+    def test_fragment_cache_is_typed_and_per_instance(self):
+        """Testa que ids iguais em valor mas de tipos diferentes não compartilham fragmentos."""
+        layer4 = Layer4({'fragment_cache_size': 2})
+        code = layer4._generate_procedural_code([{'id': True}, {'id': 1}, {'id': 1.0}])
+        assert "process_unit('True')" in code
+        assert "process_unit('1')" in code
+        assert "process_unit('1.0')" in code
+        
+        procedural_fragment, _ = layer4._fragment_cache()
+        assert procedural_fragment.cache_info().maxsize == 2
+        assert Layer4()._fragment_cache()[0] is not procedural_fragment
+        
+    def test_shared_documents_are_read_only(self):
+        """Testa que os documentos constantes são compartilhados e imutáveis."""
+        layer4 = Layer4()
+        first = layer4._generate_api_definitions([])
+        assert first is layer4._generate_api_definitions([{'id': 1}])
+        with pytest.raises(TypeError):
+            first['info']['title'] = 'changed'
+        with pytest.raises(TypeError):
+            layer4._generate_data_schemas({})['json_schema'].pop('type')
+            
+        import copy
+        edited = copy.deepcopy(first)
+        edited['info']['title'] = 'changed'
+        edited['paths'].clear()
+        assert first['info']['title'] != 'changed' and first['paths']
+        shallow = copy.copy(first)
+        shallow['openapi'] = '3.1.0'
+        assert type(shallow) is dict and first['openapi'] == '3.0.0'
+        
+    def test_selective_deploy(self):
+        """Testa a geração sob demanda de paradigmas e targets não solicitados."""
+        import json
+        import pickle
+        
+        layer4 = Layer4()
+        data = self._layer3_data()
+        full = layer4.deploy(data)
+        result = layer4.deploy(data, paradigms=['procedural'], targets=['web'])
+        
+        code = result['executable_code']
+        assert code.is_computed('procedural')
+        assert sorted(code.pending) == ['declarative', 'functional', 'object_oriented']
+        assert 'functional' in code and len(code) == len(full['executable_code'])
+        assert code['functional'] == full['executable_code']['functional']
+        assert code.is_computed('functional')
+        
+        assert result['deployment_results'].pending == ['mobile', 'cloud', 'edge', 'iot']
+        assert result['optimized_systems']['iot']['optimizations'] == \
+            full['optimized_systems']['iot']['optimizations']
+        assert json.loads(json.dumps(result['executable_code'])) == json.loads(json.dumps(full['executable_code']))
+        assert type(pickle.loads(pickle.dumps(result['deployment_results']))) is dict
+        
+        with pytest.raises(ValueError):
+            layer4.deploy(data, targets=['mainframe'])
+
+    def test_lazy_sections_concurrent_access(self):
+        """Testa que acessos concorrentes calculam cada seção uma única vez."""
+        import threading
+        import time
+        from concurrent.futures import ThreadPoolExecutor
+        from src.layers.layer4 import LazySections
+
+        calls = []
+        lock = threading.Lock()
+
+        def slow_section():
+            with lock:
+                calls.append(1)
+            time.sleep(0.05)
+            return 'value'
+
+        sections = LazySections(factories={'slow': slow_section})
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            values = list(executor.map(lambda _: sections['slow'], range(8)))
+        assert values == ['value'] * 8
+        assert len(calls) == 1 and sections.pending == []
+        with pytest.raises(KeyError):
+            sections['missing']
+
+        # Targets em paralelo empacotam apenas os paradigmas solicitados
+        layer4 = Layer4()
+        try:
+            result = layer4.deploy(self._layer3_data(), paradigms=['procedural'], targets=['edge', 'iot'])
+        finally:
+            layer4.close()
+        assert result['deployment_results']['iot'].get('status') != 'failed'
+        assert result['deployment_results']['edge'].get('status') != 'failed'
+        assert sorted(result['executable_code'].pending) == ['declarative', 'functional', 'object_oriented']
+
+    def test_emit_code_matches_string_output(self):
+        """Testa que a emissão em blocos produz o mesmo código das strings."""
+        import io
+        import socket
+        
+        layer4 = Layer4()
+        data = self._layer3_data(50)
+        code = layer4.deploy(data)['executable_code']
+        
+        for paradigm in Layer4.PARADIGMS:
+            buffer = io.StringIO()
+            written = layer4.emit_code(data, paradigm, buffer, chunk_size=64)
+            assert buffer.getvalue() == code[paradigm]
+            assert written == len(code[paradigm])
+            
+        binary = io.BytesIO()
+        layer4.emit_code(data, 'declarative', binary, chunk_size=16)
+        assert binary.getvalue().decode('utf-8') == code['declarative']
+        
+        sender, receiver = socket.socketpair()
+        with sender, receiver:
+            layer4.emit_code(data, 'procedural', sender, chunk_size=32)
+            sender.shutdown(socket.SHUT_WR)
+            received = b''.join(iter(lambda: receiver.recv(4096), b''))
+        assert received.decode('utf-8') == code['procedural']
+        
+    def test_parallel_deployment(self):
+        """Testa o deployment concorrente com tempo limite por target."""
+        import time
+        
+        class SlowLayer4(Layer4):
+            def _deploy_to_cloud(self, code, multimodal, semantic_network=None):
+                time.sleep(0.5)
+                return super()._deploy_to_cloud(code, multimodal, semantic_network)
+                
+        layer4 = SlowLayer4({'target_timeout': 0.1})
+        try:
+            result = layer4.deploy(self._layer3_data())
+        finally:
+            layer4.close()
+            
+        deployments = result['deployment_results']
+        assert deployments['cloud']['status'] == 'timeout'
+        assert deployments['web']['status'] == 'deployed'
+        assert list(deployments) == list(Layer4.TARGETS)
+        
+        timings = result['deployment_metadata']['target_timings']['deployment']
+        assert set(timings) == set(Layer4.TARGETS)
+        assert timings['web'] < 0.1
+
+        # O limite vale por target: targets na fila não consomem o prazo
+        class QueuedLayer4(Layer4):
+            def _deploy_to_web(self, code, multimodal, semantic_network=None):
+                time.sleep(0.15)
+                return super()._deploy_to_web(code, multimodal, semantic_network)
+
+            def _deploy_to_mobile(self, code, multimodal, semantic_network=None):
+                time.sleep(0.15)
+                return super()._deploy_to_mobile(code, multimodal, semantic_network)
+
+        layer4 = QueuedLayer4({'target_timeout': 0.25, 'max_workers': 1})
+        try:
+            result = layer4.deploy(self._layer3_data(), targets=['web', 'mobile'])
+        finally:
+            layer4.close()
+        assert result['deployment_results']['web']['status'] == 'deployed'
+        assert result['deployment_results']['mobile']['status'] == 'deployed'
+
+    def test_process_pool_deployment(self):
+        """Testa o deployment num pool de processos."""
+        from src.layers.artifacts import ArtifactReader
+        
+        layer4 = Layer4({'deployment_executor': 'process', 'max_workers': 2})
+        try:
+            result = layer4.deploy(self._layer3_data(), targets=['web', 'iot'])
+        finally:
+            layer4.close()
+        assert result['deployment_results']['iot']['artifact']['packed_bytes'] > 0
+        assert result['optimized_systems']['web']['original']['platform'] == 'web'
+        
+        # Os workers recebem só os paradigmas calculados, sem gerar os pendentes
+        layer4 = Layer4({'deployment_executor': 'process', 'max_workers': 2})
+        try:
+            narrow = layer4.deploy(self._layer3_data(), paradigms=['procedural'], targets=['edge', 'iot'])
+        finally:
+            layer4.close()
+        assert sorted(narrow['executable_code'].pending) == ['declarative', 'functional', 'object_oriented']
+        for target in ('edge', 'iot'):
+            artifact = narrow['deployment_results'][target]['artifact']
+            assert ArtifactReader(artifact['data']).names == [
+                'procedural.py', 'api.json', 'schemas.json', 'weights.bin']
+        
+    def test_edge_and_iot_artifacts(self, tmp_path):
+        """Testa o empacotamento real dos artefatos edge/iot."""
+        import numpy as np
+        from src.layers.artifacts import ArtifactReader, load_artifact
+        
+        data = self._layer3_data(40)
+        data['semantic_network']['edges'] = [
+            {'source': i, 'target': i + 1, 'strength': 0.01 * i} for i in range(39)
+        ]
+        layer4 = Layer4({'deployment_executor': 'serial'})
+        result = layer4.deploy(data, targets=['edge', 'iot'])
+        
+        for target, dtype in (('edge', 'float16'), ('iot', 'int8')):
+            artifact = result['deployment_results'][target]['artifact']
+            assert artifact['packed_bytes'] < artifact['raw_bytes']
+            assert artifact['weights']['max_abs_error'] < 0.01
+            # A medição de carga é opcional e fica fora do caminho do deploy
+            assert 'packed_load_time' not in artifact
+            
+            reader = ArtifactReader(artifact['data'])
+            assert reader.metadata['target'] == target
+            assert reader.weights[:2] == ('weights.bin', dtype)
+            assert reader.read_json('api.json')['openapi'] == '3.0.0'
+            assert '//' not in reader.read_text('object_oriented.js')
+            loaded = load_artifact(artifact['data'])
+            assert loaded['weights'].size == 39
+            assert np.allclose(loaded['weights'], 0.01 * np.arange(39), atol=0.01)
+            
+            improvements = result['optimized_systems'][target]['performance_improvements']
+            assert improvements['packed_bytes'] == artifact['packed_bytes']
+            assert 'latency_reduction' not in improvements
+            assert 0 < improvements['memory_usage_reduction'] < 1
+            assert result['optimized_systems'][target]['optimizations'] == artifact['optimizations']
+            
+        # Apenas os paradigmas solicitados são empacotados
+        narrow = Layer4({'deployment_executor': 'serial', 'measure_artifact_load': True}).deploy(
+            data, targets=['iot'], paradigms=['procedural'])
+        artifact = narrow['deployment_results']['iot']['artifact']
+        assert ArtifactReader(artifact['data']).names == [
+            'procedural.py', 'api.json', 'schemas.json', 'weights.bin']
+        assert artifact['raw_load_time'] > 0 and artifact['packed_load_time'] > 0
+        assert 'latency_reduction' in narrow['optimized_systems']['iot']['performance_improvements']
+            
+        on_disk = Layer4({'artifact_dir': str(tmp_path)}).deploy(data, targets=['edge'])
+        assert (tmp_path / 'jals-edge.jalspkg').exists()
+        assert 'data' not in on_disk['deployment_results']['edge']['artifact']
+        
+    def test_live_monitoring(self, tmp_path):
+        """Testa o monitoramento com métricas reais e alertas avaliados."""
+        from src.core.metrics import default_registry
+        
+        metrics_file = tmp_path / 'metrics.prom'
+        layer4 = Layer4({'deployment_executor': 'serial', 'metrics_file': str(metrics_file)})
+        layer4.deploy(self._layer3_data(5), targets=['web'])
+        monitoring = layer4.deploy(self._layer3_data(5), targets=['web'])['monitoring_data']
+        
+        assert set(monitoring.pending) == {'live_metrics', 'alert_status'}
+        assert monitoring['live_metrics']['operations']['layer4.deploy']['calls'] >= 1
+        assert {alert['name'] for alert in monitoring['alert_status']} == {'high_error_rate', 'high_latency'}
+        assert all(isinstance(alert['firing'], bool) for alert in monitoring['alert_status'])
+        assert monitoring['exporters']['file'] == str(metrics_file)
+        assert 'jals_layer4_deploy_response_time_seconds_count' in metrics_file.read_text()
+        assert default_registry.snapshot()['operations']['layer4.deploy']['calls'] >= 2